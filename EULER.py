@@ -1,8 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from expresiones import compilar_expresion
+import motor_edo
+import cache_edo
+import nucleos_edo
+from tabla_virtual import TablaVirtual
+from tarea_fondo import PanelProgreso
+from calculo_edo import CalculoEnVivo
+from instrumentacion import BarraEstado
 
 class EulerApp:
     def __init__(self, root):
@@ -18,9 +26,15 @@ class EulerApp:
         # Ecuación por defecto cambiada a términos de t y x
         self.func_str = tk.StringVar(value="t - x + 2")
         self.t0_val = tk.DoubleVar(value=0.0)  # Antes x0
-        self.x0_val = tk.DoubleVar(value=2.0)  # Antes y0
+        self.x0_val = tk.StringVar(value="2.0")  # Antes y0 (para sistemas: "1, 0")
         self.h_val = tk.DoubleVar(value=0.1)
         self.tf_val = tk.DoubleVar(value=1.0)  # Antes xf
+        # Sistemas de EDO: variables de estado ("x, v") y parámetros opcionales ("a=1, b=0.5")
+        self.estados_str = tk.StringVar(value="x")
+        self.params_str = tk.StringVar(value="")
+        # Euler explícito o implícito (para ecuaciones rígidas, con Newton)
+        self.metodo_val = tk.StringVar(value="Euler explícito")
+        self.info_val = tk.StringVar(value="")
 
         # Grid de inputs
         ttk.Label(input_frame, text="Función dx/dt = f(t,x):").grid(row=0, column=0, sticky="e")
@@ -42,11 +56,30 @@ class EulerApp:
         # Botón Calcular
         ttk.Button(input_frame, text="CALCULAR", command=self.calcular_euler).grid(row=0, column=6, rowspan=2, padx=20)
 
-        # Nota de ayuda
-        help_lbl = ttk.Label(input_frame,
+        # Avance y cancelación del cálculo (corre en segundo plano)
+        self.progreso = PanelProgreso(input_frame)
+        self.progreso.barra.grid(row=2, column=6, padx=20)
+        self.progreso.boton.grid(row=3, column=6, padx=20)
+
+        ttk.Label(input_frame, text="Variables de estado:").grid(row=2, column=0, sticky="e")
+        ttk.Entry(input_frame, textvariable=self.estados_str, width=10).grid(row=2, column=1, sticky="w", padx=5, pady=5)
+
+        ttk.Label(input_frame, text="Parámetros:").grid(row=2, column=2, sticky="e")
+        ttk.Entry(input_frame, textvariable=self.params_str, width=25).grid(row=2, column=3, columnspan=3, sticky="w", padx=5, pady=5)
+
+        ttk.Label(input_frame, text="Método:").grid(row=3, column=0, sticky="e")
+        ttk.Combobox(input_frame, textvariable=self.metodo_val, state="readonly", width=18,
+                     values=("Euler explícito", "Euler implícito")).grid(row=3, column=1, sticky="w", padx=5, pady=5)
+
+        # Nota de ayuda (muestra las iteraciones de Newton del método implícito)
+        help_lbl = ttk.Label(input_frame, textvariable=self.info_val,
                             # text="Nota: Usa 't' para tiempo y 'x' para la variable dependiente (ej: 2*t - x).",
                              font=("Arial", 8, "italic"), foreground="gray")
-        help_lbl.grid(row=2, column=0, columnspan=7, pady=5)
+        help_lbl.grid(row=4, column=0, columnspan=7, pady=5)
+
+        # Barra de estado: evaluaciones de f y tiempo de cálculo, tabla y gráfica del último cálculo
+        self.barra_estado = BarraEstado(root, "Euler")
+        self.barra_estado.pack(side="bottom", fill="x", padx=10)
 
         # --- Frame de Resultados (Gráfica y Tabla) ---
         results_frame = ttk.Frame(root)
@@ -56,49 +89,39 @@ class EulerApp:
         table_frame = ttk.LabelFrame(results_frame, text="Tabla de Iteraciones")
         table_frame.pack(side="left", fill="y", padx=5)
 
-        columns = ("n", "t", "x")
-        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=20)
-        self.tree.heading("n", text="Iter")
-        self.tree.heading("t", text="t (tiempo)")
-        self.tree.heading("x", text="x (aprox)")
-        self.tree.column("n", width=50, anchor="center")
-        self.tree.column("t", width=80, anchor="center")
-        self.tree.column("x", width=100, anchor="center")
-
-        # Scrollbar para la tabla
-        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Tabla virtual con scrollbar: solo formatea las filas visibles
+        self.tabla = TablaVirtual(table_frame, [("n", "Iter", 50, "{}"),
+                                                ("t", "t (tiempo)", 80, "{:.4f}"),
+                                                ("x", "x (aprox)", 100, "{:.6f}")])
 
         # -- Sección Gráfica --
         graph_frame = ttk.LabelFrame(results_frame, text="Gráfica de la Solución")
         graph_frame.pack(side="right", fill="both", expand=True, padx=5)
 
         # Inicializar figura de matplotlib
-        self.fig, self.ax = plt.subplots(figsize=(5, 4), dpi=100)
+        # (Figure y no plt.subplots: así plt.show() de otra herramienta del lanzador no la abre aparte)
+        self.fig = Figure(figsize=(5, 4), dpi=100)
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
+        self.calculo = CalculoEnVivo(root, self.ax, self.canvas, self.tabla, self.progreso, self.info_val,
+                                     al_fallar=lambda e: messagebox.showerror("Error de Sintaxis",
+                                                                              f"Error en la función: {e}"),
+                                     barra=self.barra_estado)
+
     def evaluar_funcion(self, expr, t, x):
         """Evalúa la función f(t,x) ingresada como texto."""
-        # Diccionario seguro de funciones matemáticas permitidas
-        allowed_locals = {
-            "sin": np.sin, "cos": np.cos, "tan": np.tan,
-            "exp": np.exp, "sqrt": np.sqrt, "log": np.log,
-            "pi": np.pi, "e": np.e
-        }
         try:
-            # CAMBIO CLAVE: El contexto ahora define 't' y 'x'
-            return eval(expr, {"__builtins__": None}, {**allowed_locals, 't': t, 'x': x})
+            # La expresión se valida y compila una sola vez (queda en caché)
+            return compilar_expresion(expr, ("t", "x"))(t, x)
         except Exception as e:
             raise ValueError(f"Error en la función: {e}")
 
     def calcular_euler(self):
-        # 1. Limpiar datos anteriores
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.ax.clear()
+        # Un cálculo a la vez: mientras corre, se usa Cancelar
+        if self.calculo.ocupado():
+            return
 
         try:
             # 2. Obtener valores de la GUI
@@ -107,6 +130,7 @@ class EulerApp:
             x0 = self.x0_val.get() # Variable dependiente
             h = self.h_val.get()
             tf = self.tf_val.get() # Tiempo final
+            self.info_val.set("")
 
             # Validaciones básicas
             if h <= 0:
@@ -119,52 +143,31 @@ class EulerApp:
                 # Para este ejemplo, si tf <= t0, sumaremos 10 pasos automáticamente o pedimos corrección
                 tf = t0 + (h * 10)
 
-            # 3. Algoritmo de Euler (Adaptado a t y x)
-            ts = [t0]
-            xs = [x0]
-
-            t_actual = t0
-            x_actual = x0
-            n = 0
-
-            # Insertar condición inicial en tabla
-            self.tree.insert("", "end", values=(n, f"{t_actual:.4f}", f"{x_actual:.6f}"))
-
-            # Iterar mientras el tiempo actual sea menor al tiempo final
-            while t_actual < tf - 1e-9:
-                try:
-                    # Pendiente depende ahora de t y x
-                    pendiente = self.evaluar_funcion(f_str, t_actual, x_actual)
-                except ValueError as ve:
-                    messagebox.showerror("Error de Sintaxis", str(ve))
-                    return
-
-                # Fórmula de Euler: x_new = x_old + h * f(t, x)
-                x_siguiente = x_actual + h * pendiente
-                t_siguiente = t_actual + h
-
-                # Actualizar variables
-                t_actual = t_siguiente
-                x_actual = x_siguiente
-                n += 1
-
-                # Guardar datos
-                ts.append(t_actual)
-                xs.append(x_actual)
-
-                # Insertar en tabla
-                self.tree.insert("", "end", values=(n, f"{t_actual:.4f}", f"{x_actual:.6f}"))
-
-            # 4. Graficar Resultados
-            self.ax.plot(ts, xs, 'r-o', label='Euler Aprox (x vs t)', markersize=4) # Color rojo para diferenciar
-            self.ax.set_title(f"Solución de dx/dt = {f_str}")
-            self.ax.set_xlabel("Tiempo (t)")
-            self.ax.set_ylabel("Estado (x)")
-            self.ax.grid(True, linestyle='--', alpha=0.7)
-            self.ax.legend()
-
-            # Refrescar el canvas de matplotlib
-            self.canvas.draw()
+            # Compilar f(t,x) una sola vez antes del bucle (escalar o sistema)
+            try:
+                f, x0, estados = motor_edo.preparar(f_str, self.estados_str.get(), x0, self.params_str.get())
+            except ValueError as ve:
+                messagebox.showerror("Error de Sintaxis", str(ve))
+                return
+
+            # 3. Algoritmo de Euler (Adaptado a t y x), calculado por el núcleo sin GUI en
+            #    segundo plano; la tabla y la gráfica (roja) se llenan a medida que avanza
+            titulo = f"Solución de dx/dt = {f_str}"
+            if self.metodo_val.get() == "Euler implícito":
+                # x_new = x_old + h * f(t_new, x_new), resuelto con Newton y jacobiano simbólico
+                parametros = motor_edo.leer_parametros(self.params_str.get())
+                self.calculo.completo(
+                    lambda progreso: motor_edo.resolver_implicito(f_str, "euler_implicito", t0, x0, h, tf, estados,
+                                                                  parametros, progreso=progreso),
+                    t0, tf, estados, 'r', 'Euler implícito (x vs t)', titulo,
+                    lambda est: f"Euler implícito: {est['iteraciones_newton']} iteraciones de Newton, "
+                                f"{est['jacobianos']} evaluaciones del jacobiano")
+            else:
+                parametros = motor_edo.leer_parametros(self.params_str.get())
+                self.calculo.paso_fijo(f, motor_edo.paso_euler, t0, x0, h, tf, estados,
+                                       'r', 'Euler Aprox (x vs t)', titulo,
+                                       clave=cache_edo.clave(f_str, "euler", t0, x0, h, estados, parametros),
+                                       nucleo=nucleos_edo.nucleo(f_str, "euler", estados, parametros))
 
         except Exception as e:
             messagebox.showerror("Error", f"Ocurrió un error inesperado: {e}")
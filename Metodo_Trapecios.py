@@ -1,31 +1,73 @@
 import numpy as np 
-import matplotlib.pyplot as plt
 import tkinter as tk
-from tkinter import messagebox
-from sympy import sympify, lambdify, symbols
+from tkinter import messagebox, filedialog
+from expresiones import compilar_expresion
+from graficos import dibujar_trapecios
+from tarea_fondo import TareaEnFondo, PanelProgreso
+from instrumentacion import BarraEstado
+import cuadratura
+
+MAX_PUNTOS_GRAFICA = 100_000 # Con más trapecios, la gráfica usa solo esta cantidad (ya miden menos de un píxel).
+
+# Métodos del menú: el trapecio usa el n dado; los demás ajustan los puntos a la tolerancia.
+METODOS = {
+    "Trapecio (n fijo)": None,
+    "Romberg": "romberg",
+    "Simpson adaptativo": "simpson",
+    "Gauss-Kronrod adaptativo": "gauss_kronrod",
+}
 
 # FUNCIÓN: Aproxima una integral usando el método del trapecio.
-def integral_trapecios(f, a, b, n):
+# 'avanzar(fraccion)' es opcional: se llama después de cada bloque (la usa el cálculo en segundo plano).
+# Con n grande la suma se hace por bloques (memoria constante) y solo se devuelven
+# MAX_PUNTOS_GRAFICA puntos para la gráfica. Con hilos > 1 los tramos se evalúan en paralelo.
+# También devuelve cuántas veces se evaluó f (con n grande, la suma más los puntos de la gráfica).
+def integral_trapecios(f, a, b, n, avanzar=None, hilos=1):
+    if n > MAX_PUNTOS_GRAFICA or hilos > 1:
+        if hilos > 1:
+            area, est = cuadratura.integrar_paralelo(f, a, b, "trapecio", n=n, trabajadores=hilos, avanzar=avanzar)
+        else:
+            area, est = cuadratura.trapecio_por_bloques(f, a, b, n, avanzar=avanzar) # Suma compensada por bloques.
+        # Los valores de la suma no se guardan (memoria constante): f se vuelve a evaluar en la malla de la gráfica
+        x_vals = np.linspace(a, b, min(n, MAX_PUNTOS_GRAFICA) + 1)
+        return area, x_vals, np.broadcast_to(f(x_vals), x_vals.shape), est["evaluaciones"] + len(x_vals)
     x_vals = np.linspace(a, b, n + 1) # Genera n+1 puntos equidistantes entre a y b.
-    y_vals = f(x_vals) # Evalúa la función en todos esos puntos.
+    y_vals = np.broadcast_to(f(x_vals), x_vals.shape) # Evalúa la función en todos esos puntos.
     h = (b - a) / n # Distancia entre cada punto.
-    area = (h / 2) * (y_vals[0] + 2 * sum(y_vals[1:-1]) + y_vals[-1]) # Fórmula del método del trapecio.
-    return area, x_vals, y_vals # Regresa: área calculada + los puntos evaluados.
+    area = (h / 2) * (y_vals[0] + 2 * np.sum(y_vals[1:-1]) + y_vals[-1]) # Fórmula del método del trapecio.
+    return area, x_vals, y_vals, n + 1 # Regresa: área calculada + los puntos evaluados (se reusan en la gráfica).
+
+# FUNCIÓN: Grafica datos medidos (t, y). Con muchos puntos se toma uno de cada 'paso'
+# (en un .npy mapeado solo se leen esos puntos). La figura se muestra con plt.show() al final
+# (así se puede medir cuánto tarda en armarse).
+def graficar_muestras(ts, ys, area, ruta):
+    import matplotlib.pyplot as plt  # Se carga recién con la primera gráfica (abre antes la ventana)
+    paso = max(1, len(ts) // MAX_PUNTOS_GRAFICA)
+    t, y = np.asarray(ts[::paso]), np.asarray(ys[::paso])
+    plt.figure(figsize=(9, 6))
+    plt.plot(t, y, label='datos', color='blue', linewidth=1)
+    plt.fill_between(t, 0, y, color='red', alpha=0.4)
+    plt.text(0.05, 0.95, f"Área aproximada = {area:.6f}", transform=plt.gca().transAxes, fontsize=12,
+             verticalalignment='top', bbox=dict(boxstyle="round", fc="white", ec="black"))
+    plt.title(f'Integral de los datos de {ruta}')
+    plt.xlabel('t')
+    plt.ylabel('y')
+    plt.grid(True)
+    plt.legend()
 
-# FUNCIÓN: Grafica la función y los trapecios utilizados.
-def graficar(f, a, b, x_vals, y_vals, area):
+# FUNCIÓN: Grafica la función y los trapecios utilizados (se muestra con plt.show()).
+# Devuelve cuántas veces evaluó f para la curva suave.
+def graficar(f, a, b, x_vals, y_vals, area, titulo='Integral aproximada con método del trapecio'):
+    import matplotlib.pyplot as plt
 
     plt.figure(figsize=(9, 6))  # Tamaño de la figura.
 
     x_smooth = np.linspace(a, b, 400) # Curva suave de la función para una mejor visualización.
     plt.plot(x_smooth, f(x_smooth), label='f(x)', color='blue', linewidth=2)
 
-    for i in range(len(x_vals)-1): # Dibuja cada trapecio en color rojo.
-        # Coordenadas x y y del trapecio.
-        xs = [x_vals[i], x_vals[i], x_vals[i+1], x_vals[i+1]]
-        ys = [0, y_vals[i], y_vals[i+1], 0]
-
-        plt.fill(xs, ys, color='red', alpha=0.4) # Rellena la figura.
+    # Dibuja todos los trapecios en color rojo como una sola colección de polígonos
+    # (con muchísimos trapecios se rellena el área bajo la poligonal reducida por píxel).
+    dibujar_trapecios(plt.gca(), x_vals, y_vals, color='red', alpha=0.4)
 
     # Muestra el valor del área dentro de un cuadro en la gráfica.
     plt.text(
@@ -38,64 +80,199 @@ def graficar(f, a, b, x_vals, y_vals, area):
     )
 
     # Estética general de la gráfica.
-    plt.title('Integral aproximada con método del trapecio')
+    plt.title(titulo)
     plt.xlabel('x')
     plt.ylabel('f(x)')
     plt.grid(True)
     plt.legend()
-    plt.show()
-
-# FUNCIÓN: Se ejecuta al presionar el botón "Calcular integral".
-def ejecutar():
-    try:   
-        x = symbols('x') # Prepara un símbolo de SymPy para representar x.
-        f_expr = sympify(entry_funcion.get()) # Convierte el texto ingresado por el usuario a una expresión matemática.
-        f = lambdify(x, f_expr, 'numpy') # Convierte la expresión simbólica en una función evaluable por numpy.
-
-        # Obtiene los valores ingresados por el usuario
-        a = float(entry_a.get())
-        b = float(entry_b.get())
-        n = int(entry_n.get())
-
-        
-        area, x_vals, y_vals = integral_trapecios(f, a, b, n) # Calcula el área y los puntos evaluados.
-        
-        text_output.delete("1.0", tk.END) # Limpia el cuadro de texto y escribe el resultado.
-        text_output.insert(tk.END, f"Área aproximada: {area:.6f}\n")
-        graficar(f, a, b, x_vals, y_vals, area) # Muestra la gráfica.
-
-    except Exception as e:
-        messagebox.showerror("Error", f"Ocurrió un error: {str(e)}") # Muestra un mensaje de error si algo sale mal.
-
-# INTERFAZ GRÁFICA (TKINTER)
-ventana = tk.Tk() # Crea la ventana principal.
-ventana.title("Integral por método del trapecio")
-ventana.geometry("600x550")
-
-tk.Label(ventana, text="Función f(x):").pack() # Campo para ingresar la función f(x).
-entry_funcion = tk.Entry(ventana, width=40)
-entry_funcion.insert(0, "sin(x)")  # Valor por defecto.
-entry_funcion.pack()
-
-tk.Label(ventana, text="Límite inferior a:").pack() # Campo para el límite inferior.
-entry_a = tk.Entry(ventana)
-entry_a.insert(0, "0")
-entry_a.pack()
-
-tk.Label(ventana, text="Límite superior b:").pack() # Campo para el límite superior.
-entry_b = tk.Entry(ventana)
-entry_b.insert(0, "3.1416")
-entry_b.pack()
-
-tk.Label(ventana, text="Número de trapecios:").pack() # Campo para la cantidad de trapecios.
-entry_n = tk.Entry(ventana)
-entry_n.insert(0, "10")
-entry_n.pack()
-
-tk.Button(ventana, text="Calcular integral", command=ejecutar, bg="lightgreen").pack(pady=10) # Botón que ejecuta el cálculo.
-
-tk.Label(ventana, text="Resultados:").pack() # Área donde se muestran los resultados numéricos.
-text_output = tk.Text(ventana, height=10, width=70)
-text_output.pack()
-
-ventana.mainloop() # Inicia la aplicación.
\ No newline at end of file
+    return len(x_smooth)
+
+# INTERFAZ GRÁFICA (TKINTER): la ventana puede ser una tk.Tk propia o una tk.Toplevel del lanzador (main.py).
+class TrapeciosApp:
+    def __init__(self, ventana):
+        self.ventana = ventana
+        self.ventana.title("Integral por método del trapecio")
+        self.ventana.geometry("600x800")
+
+        tk.Label(self.ventana, text="Función f(x):").pack() # Campo para ingresar la función f(x).
+        self.entry_funcion = tk.Entry(self.ventana, width=40)
+        self.entry_funcion.insert(0, "sin(x)")  # Valor por defecto.
+        self.entry_funcion.pack()
+
+        tk.Label(self.ventana, text="Límite inferior a:").pack() # Campo para el límite inferior.
+        self.entry_a = tk.Entry(self.ventana)
+        self.entry_a.insert(0, "0")
+        self.entry_a.pack()
+
+        tk.Label(self.ventana, text="Límite superior b:").pack() # Campo para el límite superior.
+        self.entry_b = tk.Entry(self.ventana)
+        self.entry_b.insert(0, "3.1416")
+        self.entry_b.pack()
+
+        tk.Label(self.ventana, text="Número de trapecios:").pack() # Campo para la cantidad de trapecios.
+        self.entry_n = tk.Entry(self.ventana)
+        self.entry_n.insert(0, "10")
+        self.entry_n.pack()
+
+        tk.Label(self.ventana, text="Método:").pack() # Trapecio con n fijo o un método guiado por tolerancia.
+        self.metodo_var = tk.StringVar(value="Trapecio (n fijo)")
+        tk.OptionMenu(self.ventana, self.metodo_var, *METODOS).pack()
+
+        tk.Label(self.ventana, text="Tolerancia (Romberg / adaptativos):").pack() # Error máximo deseado.
+        self.entry_tol = tk.Entry(self.ventana)
+        self.entry_tol.insert(0, "1e-10")
+        self.entry_tol.pack()
+
+        tk.Label(self.ventana, text="Hilos en paralelo:").pack() # Para funciones costosas: reparte [a, b] en tramos.
+        self.entry_hilos = tk.Entry(self.ventana)
+        self.entry_hilos.insert(0, "1")
+        self.entry_hilos.pack()
+
+        tk.Button(self.ventana, text="Calcular integral", command=self.ejecutar, bg="lightgreen").pack(pady=10) # Botón que ejecuta el cálculo.
+        tk.Button(self.ventana, text="Integrar datos (.npy / .csv)...", command=self.integrar_archivo).pack() # Muestras (t, y) medidas.
+
+        self.progreso = PanelProgreso(self.ventana, largo=300) # Barra de avance y botón para cancelar el cálculo.
+        self.progreso.barra.pack()
+        self.progreso.boton.pack(pady=5)
+
+        tk.Label(self.ventana, text="Resultados:").pack() # Área donde se muestran los resultados numéricos.
+        self.text_output = tk.Text(self.ventana, height=10, width=70)
+        self.text_output.pack()
+
+        self.barra_estado = BarraEstado(self.ventana, "Trapecios") # Evaluaciones de f y tiempo de cálculo y gráfica del último cálculo.
+        self.barra_estado.pack(side="bottom", fill="x")
+
+    # FUNCIÓN: Se ejecuta al presionar el botón "Calcular integral".
+    def ejecutar(self):
+        if self.progreso.ocupado(): # Un cálculo a la vez (mientras corre, se usa Cancelar).
+            return
+        try:   
+            f = compilar_expresion(self.entry_funcion.get(), ("x",)) # Valida y compila f(x) una sola vez (funciona con arreglos de numpy).
+
+            # Obtiene los valores ingresados por el usuario
+            a = float(self.entry_a.get())
+            b = float(self.entry_b.get())
+            metodo = METODOS[self.metodo_var.get()]
+            if metodo is None:
+                n = int(self.entry_n.get())
+                if n < 1:
+                    raise ValueError("El número de trapecios debe ser al menos 1.")
+            else:
+                tol = float(self.entry_tol.get())
+                if tol <= 0:
+                    raise ValueError("La tolerancia debe ser positiva.")
+            hilos = int(self.entry_hilos.get())
+            if hilos < 1:
+                raise ValueError("La cantidad de hilos debe ser al menos 1.")
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Ocurrió un error: {str(e)}") # Muestra un mensaje de error si algo sale mal.
+            return
+
+        # El área se calcula en segundo plano; la ventana sigue respondiendo y se puede cancelar.
+        resultado = []
+        medicion = self.barra_estado.medicion.iniciar(metodo=self.metodo_var.get(), a=a, b=b, hilos=hilos,
+                                                      **({"n": n} if metodo is None else {"tol": tol}))
+
+        def trabajo(tarea):
+            with medicion.fase("cálculo"):
+                if metodo is None:
+                    calculado = integral_trapecios(f, a, b, n, avanzar=tarea.avanzar, hilos=hilos) # Calcula el área y los puntos evaluados.
+                elif hilos > 1:
+                    # Los tramos de [a, b] se refinan en paralelo (el resultado no depende de la cantidad de hilos)
+                    calculado = cuadratura.integrar_paralelo(f, a, b, metodo, tol, trabajadores=hilos, avanzar=tarea.avanzar)
+                else:
+                    calculado = cuadratura.integrar(f, a, b, metodo, tol, avanzar=tarea.avanzar)
+            yield calculado
+
+        def al_terminar(cancelada):
+            import matplotlib.pyplot as plt
+            self.text_output.delete("1.0", tk.END) # Limpia el cuadro de texto y escribe el resultado.
+            if cancelada:
+                self.text_output.insert(tk.END, "Cálculo cancelado.\n")
+                self.informar(medicion, "cancelado")
+                return
+            if metodo is None:
+                area, x_vals, y_vals, evaluaciones = resultado[0]
+                medicion.contar("evaluaciones", evaluaciones)
+                self.text_output.insert(tk.END, f"Área aproximada: {area:.6f}\n")
+                with medicion.fase("gráfica"):
+                    medicion.contar("evaluaciones_gráfica", graficar(f, a, b, x_vals, y_vals, area))
+                self.informar(medicion)
+                plt.show(block=False) # Muestra la gráfica (sin detener la ventana).
+                return
+            # Modos con tolerancia: se informa el error estimado y cuántas veces se evaluó f;
+            # la gráfica muestra los tramos que se usaron (más finos donde f es más difícil).
+            area, est = resultado[0]
+            medicion.agregar(est)
+            self.text_output.insert(tk.END, f"Área aproximada: {area:.12g}\n")
+            self.text_output.insert(tk.END, f"Error estimado: {est['error']:.2e}\n")
+            self.text_output.insert(tk.END, f"Evaluaciones de f: {est['evaluaciones']}\n")
+            self.text_output.insert(tk.END, f"Tramos: {len(est['subintervalos']) - 1}\n")
+            x_vals = est['subintervalos']
+            with medicion.fase("gráfica"):
+                suave = graficar(f, a, b, x_vals, np.broadcast_to(f(x_vals), x_vals.shape), area,
+                                 titulo=f"Integral aproximada con {self.metodo_var.get()}")
+            medicion.contar("evaluaciones_gráfica", len(x_vals) + suave)
+            self.informar(medicion)
+            plt.show(block=False)
+
+        self.text_output.delete("1.0", tk.END)
+        self.text_output.insert(tk.END, "Calculando...\n")
+        tarea = TareaEnFondo(self.ventana, trabajo, al_recibir=resultado.append, al_terminar=al_terminar,
+                             al_fallar=lambda e: self.fallar(medicion, e))
+        self.progreso.vincular(tarea).iniciar()
+
+    # FUNCIÓN: Cierra la medición del cálculo y la muestra en la barra de estado.
+    def informar(self, medicion, estado="completo"):
+        medicion.terminar(estado)
+        self.barra_estado.actualizar()
+
+    def fallar(self, medicion, e):
+        self.informar(medicion, "error")
+        messagebox.showerror("Error", f"Ocurrió un error: {str(e)}")
+
+    # FUNCIÓN: Integra datos medidos (t, y) con paso no uniforme desde un .npy o .csv.
+    # El .npy se lee mapeado en memoria y el .csv por bloques, así la memoria no depende del tamaño.
+    def integrar_archivo(self):
+        if self.progreso.ocupado():
+            return
+        ruta = filedialog.askopenfilename(title="Datos (columna 0 = t, columna 1 = y)",
+                                          filetypes=[("Datos", "*.npy *.csv"), ("Todos", "*.*")])
+        if not ruta:
+            return
+        resultado = []
+        medicion = self.barra_estado.medicion.iniciar(archivo=ruta)
+
+        def trabajo(tarea):
+            with medicion.fase("cálculo"):
+                calculado = cuadratura.integrar_muestras(ruta, avanzar=tarea.avanzar)
+            yield calculado
+
+        def al_terminar(cancelada):
+            import matplotlib.pyplot as plt
+            self.text_output.delete("1.0", tk.END)
+            if cancelada:
+                self.text_output.insert(tk.END, "Cálculo cancelado.\n")
+                self.informar(medicion, "cancelado")
+                return
+            area, est = resultado[0]
+            medicion.agregar(est)
+            self.text_output.insert(tk.END, f"Área aproximada: {area:.12g}\n")
+            self.text_output.insert(tk.END, f"Muestras: {est['muestras']}\n")
+            if ruta.lower().endswith(".npy"):
+                with medicion.fase("gráfica"):
+                    graficar_muestras(*cuadratura.leer_muestras(ruta), area, ruta)
+            self.informar(medicion)
+            plt.show(block=False)
+
+        self.text_output.delete("1.0", tk.END)
+        self.text_output.insert(tk.END, f"Integrando {ruta}...\n")
+        tarea = TareaEnFondo(self.ventana, trabajo, al_recibir=resultado.append, al_terminar=al_terminar,
+                             al_fallar=lambda e: self.fallar(medicion, e))
+        self.progreso.vincular(tarea).iniciar()
+
+if __name__ == "__main__":
+    root = tk.Tk() # Crea la ventana principal.
+    app = TrapeciosApp(root)
+    root.mainloop() # Inicia la aplicación.
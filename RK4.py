@@ -1,8 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from expresiones import compilar_expresion
+import motor_edo
+import cache_edo
+import nucleos_edo
+from tabla_virtual import TablaVirtual
+from tarea_fondo import PanelProgreso
+from calculo_edo import CalculoEnVivo
+from instrumentacion import BarraEstado
 
 
 class RK4App:
@@ -18,9 +26,17 @@ class RK4App:
         # Variables (Adaptadas a t y x)
         self.func_str = tk.StringVar(value="t - x + 2") # Ejemplo con t y x
         self.t0_val = tk.DoubleVar(value=0.0) # Antes x0
-        self.x0_val = tk.DoubleVar(value=2.0) # Antes y0
+        self.x0_val = tk.StringVar(value="2.0") # Antes y0 (para sistemas: "1, 0")
         self.h_val = tk.DoubleVar(value=0.1)
         self.tf_val = tk.DoubleVar(value=1.0) # Antes xf
+        # Sistemas de EDO: variables de estado ("x, v") y parámetros opcionales ("a=1, b=0.5")
+        self.estados_str = tk.StringVar(value="x")
+        self.params_str = tk.StringVar(value="")
+        # Método: RK4 de paso fijo, RK45 (Dormand-Prince) con paso adaptativo o BDF2 implícito (rígidas)
+        self.metodo_val = tk.StringVar(value="RK4 (paso fijo)")
+        self.rtol_val = tk.DoubleVar(value=1e-6)
+        self.atol_val = tk.DoubleVar(value=1e-9)
+        self.info_val = tk.StringVar(value="")
 
         # Inputs Grid
         ttk.Label(input_frame, text="dx/dt = f(t,x):").grid(row=0, column=0, sticky="e")
@@ -41,9 +57,38 @@ class RK4App:
         ttk.Button(input_frame, text="CALCULAR RK4", command=self.calcular_rk4).grid(row=0, column=6, rowspan=2,
                                                                                      padx=20)
 
+        # Avance y cancelación del cálculo (corre en segundo plano)
+        self.progreso = PanelProgreso(input_frame)
+        self.progreso.barra.grid(row=2, column=6, padx=20)
+        self.progreso.boton.grid(row=3, column=6, padx=20)
+
+        ttk.Label(input_frame, text="Variables de estado:").grid(row=2, column=0, sticky="e")
+        ttk.Entry(input_frame, textvariable=self.estados_str, width=8).grid(row=2, column=1, sticky="w", padx=5, pady=5)
+
+        ttk.Label(input_frame, text="Parámetros:").grid(row=2, column=2, sticky="e")
+        ttk.Entry(input_frame, textvariable=self.params_str, width=25).grid(row=2, column=3, columnspan=3, sticky="w", padx=5, pady=5)
+
+        ttk.Label(input_frame, text="Método:").grid(row=3, column=0, sticky="e")
+        ttk.Combobox(input_frame, textvariable=self.metodo_val, state="readonly", width=22,
+                     values=("RK4 (paso fijo)", "RK45 adaptativo", "BDF2 implícito")).grid(row=3, column=1, padx=5, pady=5)
+
+        ttk.Label(input_frame, text="Tol. relativa:").grid(row=3, column=2, sticky="e")
+        ttk.Entry(input_frame, textvariable=self.rtol_val, width=8).grid(row=3, column=3, padx=5)
+
+        ttk.Label(input_frame, text="Tol. absoluta:").grid(row=3, column=4, sticky="e")
+        ttk.Entry(input_frame, textvariable=self.atol_val, width=8).grid(row=3, column=5, padx=5)
+
+        # Pasos aceptados/rechazados del método adaptativo
+        ttk.Label(input_frame, textvariable=self.info_val, font=("Arial", 8, "italic"),
+                  foreground="gray").grid(row=4, column=0, columnspan=7)
+
     #ttk.Label(input_frame, text="Sintaxis: t**2, sin(t), exp(x)... (Usa 't' y 'x')", font=("Arial", 8, "italic"),
     #             foreground="gray").grid(row=2, column=0, columnspan=7, pady=5)
 
+        # Barra de estado: evaluaciones de f y tiempo de cálculo, tabla y gráfica del último cálculo
+        self.barra_estado = BarraEstado(root, "RK4")
+        self.barra_estado.pack(side="bottom", fill="x", padx=10)
+
         # --- Resultados ---
         results_frame = ttk.Frame(root)
         results_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -52,41 +97,32 @@ class RK4App:
         table_frame = ttk.LabelFrame(results_frame, text="Tabla de Resultados")
         table_frame.pack(side="left", fill="y", padx=5)
 
-        columns = ("n", "t", "x_rk4")
-        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=20)
-        self.tree.heading("n", text="Iter")
-        self.tree.heading("t", text="t (tiempo)")
-        self.tree.heading("x_rk4", text="x (RK4)")
-
-        self.tree.column("n", width=40, anchor="center")
-        self.tree.column("t", width=80, anchor="center")
-        self.tree.column("x_rk4", width=120, anchor="center")
-
-        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.tabla = TablaVirtual(table_frame, [("n", "Iter", 40, "{}"),
+                                                ("t", "t (tiempo)", 80, "{:.4f}"),
+                                                ("x_rk4", "x (RK4)", 120, "{:.6f}")])
 
         # Gráfica
         graph_frame = ttk.LabelFrame(results_frame, text="Gráfica")
         graph_frame.pack(side="right", fill="both", expand=True, padx=5)
 
-        self.fig, self.ax = plt.subplots(figsize=(5, 4), dpi=100)
+        # (Figure y no plt.subplots: así plt.show() de otra herramienta del lanzador no la abre aparte)
+        self.fig = Figure(figsize=(5, 4), dpi=100)
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
+        self.calculo = CalculoEnVivo(root, self.ax, self.canvas, self.tabla, self.progreso, self.info_val,
+                                     barra=self.barra_estado)
+
     def evaluar_funcion(self, expr, t, x):
         """ Evalúa f(t, x) """
-        allowed = {"sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "sqrt": np.sqrt, "log": np.log,
-                   "pi": np.pi, "e": np.e}
-        # Evalúa f(t,x) de forma segura
-        return eval(expr, {"__builtins__": None}, {**allowed, 't': t, 'x': x})
+        # Evalúa f(t,x) de forma segura (compilada una vez y en caché)
+        return compilar_expresion(expr, ("t", "x"))(t, x)
 
     def calcular_rk4(self):
-        # Limpieza
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.ax.clear()
+        # Un cálculo a la vez: mientras corre, se usa Cancelar
+        if self.calculo.ocupado():
+            return
 
         try:
             f_str = self.func_str.get()
@@ -94,65 +130,46 @@ class RK4App:
             x0 = self.x0_val.get()
             h = self.h_val.get()
             tf = self.tf_val.get()
+            adaptativo = self.metodo_val.get().startswith("RK45")
+            implicito = self.metodo_val.get().startswith("BDF2")
+            self.info_val.set("")
 
-            if h <= 0:
+            if h <= 0 and not adaptativo:
                 messagebox.showerror("Error", "h debe ser > 0")
                 return
             if tf <= t0:
                 messagebox.showerror("Error", "t final debe ser mayor que t inicial")
                 return
 
-            # Inicialización
-            ts = [t0]
-            xs = [x0]
-            t = t0
-            x = x0
-            n = 0
-
-            self.tree.insert("", "end", values=(n, f"{t:.4f}", f"{x:.6f}"))
-
-            # --- BUCLE PRINCIPAL (Lógica RK4 con t y x) ---
-            while t < tf - 1e-9:
-                # 1. k1: Pendiente al inicio (t, x)
-                k1 = self.evaluar_funcion(f_str, t, x)
-
-                # 2. k2: Pendiente en el punto medio
-                # t aumenta h/2
-                # x aumenta h/2 * k1
-                k2 = self.evaluar_funcion(f_str, t + 0.5 * h, x + 0.5 * h * k1)
-
-                # 3. k3: Pendiente en el punto medio (usando k2)
-                # t aumenta h/2
-                # x aumenta h/2 * k2
-                k3 = self.evaluar_funcion(f_str, t + 0.5 * h, x + 0.5 * h * k2)
-
-                # 4. k4: Pendiente al final
-                # t aumenta h completo
-                # x aumenta h * k3
-                k4 = self.evaluar_funcion(f_str, t + h, x + h * k3)
-
-                # Fórmula RK4: Promedio ponderado para hallar el nuevo X
-                x_next = x + (h / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
-                t_next = t + h
-
-                # Actualizar variables reales
-                t = t_next
-                x = x_next
-                n += 1
-
-                # Guardar y mostrar
-                ts.append(t)
-                xs.append(x)
-                self.tree.insert("", "end", values=(n, f"{t:.4f}", f"{x:.6f}"))
-
-            # Graficar
-            self.ax.plot(ts, xs, 'r-o', label='Método RK4', markersize=4)  # 'r' es rojo
-            self.ax.set_title(f"Solución RK4: {f_str}")
-            self.ax.set_xlabel("Tiempo (t)")
-            self.ax.set_ylabel("Estado (x)")
-            self.ax.grid(True, linestyle='--', alpha=0.7)
-            self.ax.legend()
-            self.canvas.draw()
+            # Compilar f(t,x) una sola vez antes del bucle (escalar o sistema)
+            f, x0, estados = motor_edo.preparar(f_str, self.estados_str.get(), x0, self.params_str.get())
+
+            # El cálculo corre en segundo plano (barra de avance y botón Cancelar)
+            if adaptativo:
+                # --- Dormand-Prince 5(4): el paso se ajusta con las tolerancias, no con h ---
+                rtol, atol = self.rtol_val.get(), self.atol_val.get()
+                self.calculo.completo(
+                    lambda progreso: motor_edo.dormand_prince(f, t0, x0, tf, rtol, atol, progreso=progreso),
+                    t0, tf, estados, 'r', 'Método RK45', f"Solución RK45: {f_str}",
+                    lambda est: f"RK45: {est['aceptados']} pasos aceptados, {est['rechazados']} rechazados, "
+                                f"{est['evaluaciones']} evaluaciones de f")
+            elif implicito:
+                # --- BDF2: fórmula implícita de orden 2 resuelta con Newton y jacobiano simbólico ---
+                parametros = motor_edo.leer_parametros(self.params_str.get())
+                self.calculo.completo(
+                    lambda progreso: motor_edo.resolver_implicito(f_str, "bdf2", t0, x0, h, tf, estados,
+                                                                  parametros, progreso=progreso),
+                    t0, tf, estados, 'r', 'Método BDF2', f"Solución BDF2: {f_str}",
+                    lambda est: f"BDF2: {est['iteraciones_newton']} iteraciones de Newton, "
+                                f"{est['jacobianos']} evaluaciones del jacobiano")
+            else:
+                # --- BUCLE PRINCIPAL (Lógica RK4 con t y x, en el núcleo sin GUI); la tabla y
+                #     la gráfica (roja) se llenan a medida que avanza ---
+                parametros = motor_edo.leer_parametros(self.params_str.get())
+                self.calculo.paso_fijo(f, motor_edo.paso_rk4, t0, x0, h, tf, estados,
+                                       'r', 'Método RK4', f"Solución RK4: {f_str}",
+                                       clave=cache_edo.clave(f_str, "rk4", t0, x0, h, estados, parametros),
+                                       nucleo=nucleos_edo.nucleo(f_str, "rk4", estados, parametros))
 
         except Exception as e:
             messagebox.showerror("Error", f"Error de cálculo: {e}")
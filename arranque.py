@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from main import TRAP_APP, NEWTON_APP, ECUA_APP, EULER_APP, EULER_UP_APP, RK4_APP
+
+# Control del tiempo de arranque de cada herramienta: se abre en un proceso
+# nuevo (arranque en frío del intérprete) con python -X importtime, se mide
+# cuánto tarda en quedar dibujada su ventana y qué importaciones pesaron más,
+# y se compara con un presupuesto. Falla (código 1) si alguna herramienta se
+# pasa del presupuesto o carga al abrir un módulo que solo necesita después
+# (SymPy para las derivadas, pyplot para las gráficas aparte).
+#
+# Uso:  python arranque.py [-r 3] [--presupuesto 1.5] [-o arranque.json]
+#
+# Sin pantalla (o con --sin-ventana) solo se mide la importación del módulo.
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Módulos que ninguna herramienta necesita para mostrar su ventana
+PROHIBIDOS = ("sympy", "matplotlib.pyplot")
+
+# herramienta -> (presupuesto en segundos, módulos prohibidos al arrancar). Las de
+# EDO dibujan su gráfica dentro de la ventana, así que sí cargan matplotlib.
+PRESUPUESTOS = {
+    TRAP_APP: (1.0, PROHIBIDOS + ("matplotlib",)),
+    NEWTON_APP: (1.0, PROHIBIDOS + ("matplotlib",)),
+    ECUA_APP: (1.0, PROHIBIDOS + ("matplotlib",)),
+    EULER_APP: (2.0, PROHIBIDOS),
+    EULER_UP_APP: (2.0, PROHIBIDOS),
+    RK4_APP: (2.0, PROHIBIDOS),
+}
+
+# Lo que corre el proceso hijo: importa el módulo, construye la ventana y la
+# dibuja; imprime en una línea los instantes (time.time) de cada etapa, si llegó
+# a haber ventana y cuáles de los módulos prohibidos quedaron cargados.
+_HIJO = r"""
+import importlib, sys, time
+modulo = importlib.import_module(sys.argv[1])
+importado = time.time()
+root = None
+if sys.argv[3] == "1":
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        root = None
+    if root is not None:
+        getattr(modulo, sys.argv[2])(root)
+        root.update()
+mostrada = time.time()
+cargados = [m for m in sys.argv[4:] if m in sys.modules]
+if root is not None:
+    root.destroy()
+print(importado, mostrada, int(root is not None), *cargados)
+"""
+
+
+def leer_importtime(texto):
+    """Importaciones de primer nivel de la salida de -X importtime: [(módulo, segundos acumulados)]."""
+    importaciones = []
+    for linea in texto.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        partes = linea[len("import time:"):].split("|")
+        if len(partes) != 3 or not partes[1].strip().isdigit():
+            continue  # encabezado
+        nombre = partes[2][1:]
+        if not nombre.startswith(" "):  # las anidadas vienen indentadas
+            importaciones.append((nombre.strip(), int(partes[1]) / 1e6))
+    return importaciones
+
+
+def medir_arranque(herramienta, prohibidos, con_ventana=True):
+    """Abre la herramienta en un intérprete nuevo y devuelve los tiempos de esa corrida."""
+    modulo, clase = herramienta
+    inicio = time.time()
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", _HIJO, modulo, clase,
+                              "1" if con_ventana else "0", *prohibidos],
+                             cwd=DIR, capture_output=True, text=True, encoding="utf-8")
+    if proceso.returncode != 0:
+        ultima = (proceso.stderr.strip().splitlines() or ["sin salida"])[-1]
+        raise ValueError(f"{modulo} no arrancó: {ultima}")
+    importado, mostrada, ventana, *cargados = proceso.stdout.split()
+    importaciones = leer_importtime(proceso.stderr)
+    return {
+        "arranque": float(mostrada) - inicio,
+        "hasta_importar": float(importado) - inicio,
+        "importacion": sum(segundos for _, segundos in importaciones),
+        "ventana": ventana == "1",
+        "cargados": cargados,
+        "mas_pesadas": sorted(importaciones, key=lambda par: -par[1])[:5],
+    }
+
+
+def ejecutar(presupuesto=None, repeticiones=3, con_ventana=True, filtro=None, informar=None):
+    """Mide todas las herramientas; cada una se abre 'repeticiones' veces y vale la mediana."""
+    resultados = []
+    for herramienta, (limite, prohibidos) in PRESUPUESTOS.items():
+        modulo = herramienta[0]
+        if filtro and filtro.lower() not in modulo.lower():
+            continue
+        limite = presupuesto if presupuesto is not None else limite
+        fila = {"herramienta": modulo, "presupuesto": limite}
+        try:
+            corridas = sorted((medir_arranque(herramienta, prohibidos, con_ventana)
+                               for _ in range(repeticiones)), key=lambda c: c["arranque"])
+        except ValueError as e:
+            fila["error"] = str(e)
+        else:
+            fila.update(corridas[len(corridas) // 2])
+            fila["arranques"] = [c["arranque"] for c in corridas]
+        fila["fallas"] = fallas(fila)
+        resultados.append(fila)
+        if informar is not None:
+            informar(fila)
+    return resultados
+
+
+def fallas(fila):
+    """Motivos por los que la herramienta no cumple (lista vacía si cumple)."""
+    if "error" in fila:
+        return [fila["error"]]
+    motivos = []
+    if fila["arranque"] > fila["presupuesto"]:
+        motivos.append(f"tarda {fila['arranque']:.3f} s (presupuesto {fila['presupuesto']:.3f} s)")
+    if fila["cargados"]:
+        motivos.append("carga al abrir " + ", ".join(fila["cargados"]))
+    return motivos
+
+
+def formatear_fila(fila):
+    if "error" in fila:
+        return f"{fila['herramienta']:<18} ERROR  {fila['error']}"
+    etapa = "ventana" if fila["ventana"] else "importación"
+    pesadas = ", ".join(f"{nombre} {segundos * 1e3:.0f} ms" for nombre, segundos in fila["mas_pesadas"][:3])
+    estado = "EXCEDE" if fila["fallas"] else "ok"
+    return (f"{fila['herramienta']:<18} {etapa:<11} {fila['arranque']:7.3f} s  "
+            f"(importación {fila['importacion']:.3f} s, presupuesto {fila['presupuesto']:.2f} s)  "
+            f"{estado:<6} más pesadas: {pesadas}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide cuánto tarda cada herramienta en mostrar su ventana.")
+    parser.add_argument("-r", "--repeticiones", type=int, default=3, help="se toma la mediana de estas aperturas")
+    parser.add_argument("--presupuesto", type=float, default=None,
+                        help="segundos permitidos para todas las herramientas (por defecto, el de cada una)")
+    parser.add_argument("--sin-ventana", action="store_true", help="medir solo la importación del módulo")
+    parser.add_argument("-k", "--filtro", default=None, help="solo las herramientas cuyo módulo contiene este texto")
+    parser.add_argument("-o", "--salida", default=None, help="archivo .json donde guardar las mediciones")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.presupuesto, max(1, args.repeticiones), not args.sin_ventana, args.filtro,
+                          informar=lambda fila: print(formatear_fila(fila)))
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"python": sys.version.split()[0], "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+                       "resultados": resultados}, archivo, indent=2, ensure_ascii=False)
+        print(f"{len(resultados)} herramientas -> {args.salida}")
+
+    excedidas = [fila for fila in resultados if fila["fallas"]]
+    for fila in excedidas:
+        print(f"FALLA {fila['herramienta']}: {'; '.join(fila['fallas'])}")
+    return 1 if excedidas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
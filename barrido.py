@@ -0,0 +1,136 @@
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import motor_edo
+from expresiones import compilar_expresion
+
+# Barridos de parámetros (x0, h, tf) repartidos en varios procesos.
+#
+# Uso:  python barrido.py "t - x + 2" --metodo rk4 --x0 0:4:1000 --h 0.1,0.01 --tf 1,5 -j 8 -o barrido.csv
+#
+# Los valores se dan como lista separada por comas o como rango "inicio:fin:cantidad".
+# Cada tarea agrupa varios x0 con el mismo (h, tf) y los integra juntos como ensamble.
+
+TIPO_RESULTADO = np.dtype([
+    ("x0", "f8"), ("h", "f8"), ("tf", "f8"),
+    ("pasos", "i8"), ("t_final", "f8"), ("x_final", "f8"),
+])
+
+def _resolver_tarea_con(f, paso, tarea):
+    """Integra un grupo de x0 con el mismo (h, tf). Devuelve un arreglo de resultados."""
+    t0, h, tf, x0s = tarea
+    # Solo interesa el estado final: no se guarda la trayectoria
+    pasos, t_final, x_final = motor_edo.integrar_final(f, paso, t0, np.array(x0s), h, tf)
+    resultado = np.empty(len(x0s), dtype=TIPO_RESULTADO)
+    resultado["x0"] = x0s
+    resultado["h"] = h
+    resultado["tf"] = tf
+    resultado["pasos"] = pasos
+    resultado["t_final"] = t_final
+    resultado["x_final"] = x_final
+    return resultado
+
+
+# Estado de cada proceso trabajador: la expresión se envía y compila una sola vez.
+# Solo lo usa el pool; sin pool f se pasa en cada llamada (ver cuadratura.py).
+_f_trabajador = None
+_paso_trabajador = None
+
+
+def _iniciar_trabajador(expr, metodo):
+    global _f_trabajador, _paso_trabajador
+    _f_trabajador = compilar_expresion(expr, ("t", "x"))
+    _paso_trabajador = motor_edo.obtener_paso(metodo)
+
+
+def _resolver_tarea(tarea):
+    return _resolver_tarea_con(_f_trabajador, _paso_trabajador, tarea)
+
+
+def _tareas(t0, x0s, hs, tfs, tam_lote):
+    for h, tf in itertools.product(hs, tfs):
+        for i in range(0, len(x0s), tam_lote):
+            yield (t0, h, tf, x0s[i:i + tam_lote])
+
+
+def barrer(expr, metodo, t0, x0s, hs, tfs, procesos=None, tam_lote=64):
+    """Resuelve dx/dt = expr para todas las combinaciones de x0, h y tf.
+
+    Devuelve un arreglo estructurado (x0, h, tf, pasos, t_final, x_final) con
+    una fila por combinación, en el orden de (h, tf, x0).
+    """
+    x0s = np.atleast_1d(np.asarray(x0s, dtype=float))
+    hs = [float(h) for h in np.atleast_1d(hs)]
+    tfs = [float(tf) for tf in np.atleast_1d(tfs)]
+    if any(h <= 0 for h in hs):
+        raise ValueError("Todos los pasos h deben ser positivos.")
+
+    # Validar en el proceso principal para no arrancar el pool con una expresión inválida
+    f = compilar_expresion(expr, ("t", "x"))
+    paso = motor_edo.obtener_paso(metodo)
+
+    procesos = procesos or os.cpu_count() or 1
+    tareas = list(_tareas(float(t0), x0s, hs, tfs, max(1, tam_lote)))
+    if procesos == 1 or len(tareas) == 1:
+        partes = [_resolver_tarea_con(f, paso, tarea) for tarea in tareas]
+    else:
+        # Varias tareas por envío para que la comunicación entre procesos no domine
+        por_envio = max(1, len(tareas) // (4 * procesos))
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(expr, metodo)) as pool:
+            partes = list(pool.map(_resolver_tarea, tareas, chunksize=por_envio))
+    return np.concatenate(partes) if partes else np.empty(0, dtype=TIPO_RESULTADO)
+
+
+def guardar_resultados(resultados, ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".npy":
+        np.save(ruta, resultados)
+    elif extension == ".csv":
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(resultados.dtype.names)
+            escritor.writerows(fila.tolist() for fila in resultados)
+    else:
+        raise ValueError(f"Formato de salida no soportado: '{extension}' (use .npy o .csv)")
+
+
+def leer_valores(texto):
+    """'0.1,0.01' -> lista; '0:2:11' -> np.linspace(0, 2, 11)."""
+    if ":" in texto:
+        inicio, fin, cantidad = texto.split(":")
+        return np.linspace(float(inicio), float(fin), int(cantidad))
+    return np.array([float(v) for v in texto.split(",")])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de dx/dt = f(t,x) en varios procesos.")
+    parser.add_argument("expresion", help="f(t,x), p. ej. 't - x + 2'")
+    parser.add_argument("--metodo", default="rk4", help="euler, heun o rk4")
+    parser.add_argument("--t0", type=float, default=0.0)
+    parser.add_argument("--x0", type=leer_valores, required=True)
+    parser.add_argument("--h", type=leer_valores, required=True)
+    parser.add_argument("--tf", type=leer_valores, required=True)
+    parser.add_argument("-j", "--procesos", type=int, default=None, help="procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--lote", type=int, default=64, help="x0 por tarea")
+    parser.add_argument("-o", "--salida", default="barrido.csv", help="archivo .npy o .csv")
+    args = parser.parse_args(argv)
+
+    try:
+        resultados = barrer(args.expresion, args.metodo, args.t0, args.x0, args.h, args.tf,
+                            procesos=args.procesos, tam_lote=args.lote)
+        guardar_resultados(resultados, args.salida)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"{len(resultados)} corridas -> {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
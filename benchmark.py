@@ -0,0 +1,352 @@
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import motor_edo
+import flujo_edo
+import nucleos_edo
+import cuadratura
+import polinomios
+import raices
+from Metodo_Trapecios import integral_trapecios
+from metodonewton import pasos_newton
+from expresiones import compilar_expresion, compilar_jacobiano, compilar_con_derivada
+
+# Banco de pruebas de velocidad y precisión de los métodos, con problemas de
+# solución exacta conocida. Para cada caso se mide el tiempo (el mejor de varias
+# repeticiones), los pasos por segundo, las evaluaciones de f, el pico de memoria
+# (tracemalloc, en una corrida aparte para no distorsionar el tiempo) y el error
+# máximo contra la solución exacta.
+#
+# Los métodos se llaman como los usan las ventanas: motor_edo (calcular_euler,
+# calcular_heun, calcular_rk4), integral_trapecios, cuadratura, pasos_newton y raices.
+# Los casos .../<método>_nucleo integran las ecuaciones escalares con los núcleos
+# generados (nucleos_edo.py), como lo hacen las ventanas.
+#
+# Uso:  python benchmark.py -o resultados.json
+#       python benchmark.py -o nuevos.json --base resultados.json [--umbral 0.25]
+#
+# Con --base se comparan los casos en común y se marcan como regresión los que
+# tardan más que (1 + umbral) veces lo anterior, usan más evaluaciones o pierden
+# precisión (error más de 10 veces mayor); en ese caso el programa termina con 1.
+# -k FILTRO corre solo los casos cuyo nombre contiene FILTRO (p. ej. -k edo/rigida).
+
+EXPLICITOS = ("euler", "heun", "rk4")
+FACTOR_ERROR = 10.0
+
+
+# --- Problemas de referencia ---
+
+def _rigida_exacta(lam):
+    """x' = -lam·(x - cos t), x(0) = 0."""
+    def exacta(t):
+        a = lam * lam / (lam * lam + 1)
+        return a * np.cos(t) + lam / (lam * lam + 1) * np.sin(t) - a * np.exp(-lam * t)
+    return exacta
+
+
+def _forzada_exacta(a):
+    """x' = -a·x + sin t, x(0) = 0 (horizonte largo)."""
+    def exacta(t):
+        return (a * np.sin(t) - np.cos(t) + np.exp(-a * t)) / (a * a + 1)
+    return exacta
+
+
+PROBLEMAS_EDO = [
+    {"nombre": "lineal", "expresion": "t - x + 2", "estados": ("x",), "x0": 2.0,
+     "t0": 0.0, "tf": 5.0, "h": 1e-3, "exacta": lambda t: t + 1 + np.exp(-t),
+     "metodos": EXPLICITOS + ("rk45",) + motor_edo.IMPLICITOS},
+    {"nombre": "rigida", "expresion": "-50*(x - cos(t))", "estados": ("x",), "x0": 0.0,
+     "t0": 0.0, "tf": 2.0, "h": 1e-2, "exacta": _rigida_exacta(50.0),
+     "metodos": EXPLICITOS + ("rk45",) + motor_edo.IMPLICITOS},
+    {"nombre": "oscilador", "expresion": "[v, -x]", "estados": ("x", "v"), "x0": np.array([1.0, 0.0]),
+     "t0": 0.0, "tf": 20.0, "h": 1e-2, "exacta": lambda t: np.column_stack([np.cos(t), -np.sin(t)]),
+     "metodos": EXPLICITOS + ("rk45",) + motor_edo.IMPLICITOS},
+    {"nombre": "largo", "expresion": "-0.1*x + sin(t)", "estados": ("x",), "x0": 0.0,
+     "t0": 0.0, "tf": 1000.0, "h": 1e-2, "exacta": _forzada_exacta(0.1),
+     "metodos": EXPLICITOS + ("rk45",)},
+]
+
+PROBLEMAS_INTEGRAL = [
+    {"nombre": "gauss", "expresion": "exp(-x**2)", "a": -5.0, "b": 5.0,
+     "exacta": math.sqrt(math.pi) * math.erf(5.0)},
+    {"nombre": "oscilante", "expresion": "sin(20*x)*exp(-x)", "a": 0.0, "b": 10.0,
+     "exacta": (20 - math.exp(-10) * (math.sin(200) + 20 * math.cos(200))) / 401},
+]
+N_TRAPECIOS = 1_000_000
+TOL_INTEGRAL = 1e-10
+
+PROBLEMAS_RAICES = [
+    {"nombre": "cubica", "expresion": "x**3 - 6*x**2 + 11*x - 6", "a": 0.0, "b": 4.0,
+     "raices": [1.0, 2.0, 3.0], "semilla": 3.7},
+    {"nombre": "trascendente", "expresion": "cos(x) - x", "a": -2.0, "b": 2.0,
+     "raices": [0.7390851332151607], "semilla": 1.0},
+]
+
+PROBLEMAS_POLINOMIO = [
+    {"nombre": "repetidas_y_complejas", "expresion": "(x + 1)**3 * (x**2 + 4) * (x - 2)",
+     "raices": [(-1 + 0j, 3), (2 + 0j, 1), (2j, 1)]},
+]
+
+
+# --- Casos: cada uno es (nombre, correr, evaluar) ---
+# correr() hace el trabajo medido; evaluar(resultado) devuelve (pasos, evaluaciones, error).
+
+def _contar(f):
+    """Envuelve f para contar cuántas veces se la llama."""
+    contador = [0]
+
+    def f_contada(*args):
+        contador[0] += 1
+        return f(*args)
+    return f_contada, contador
+
+
+def _caso_edo(problema, metodo):
+    expr, estados = problema["expresion"], problema["estados"]
+    t0, x0, h, tf = problema["t0"], problema["x0"], problema["h"], problema["tf"]
+    f = motor_edo.compilar_rhs(expr, estados)
+    jac = compilar_jacobiano(expr, estados, ("t",)) if metodo in motor_edo.IMPLICITOS else None
+
+    def correr():
+        f_contada, contador = _contar(f)
+        if metodo == "rk45":
+            ts, xs, _ = motor_edo.dormand_prince(f_contada, t0, x0, tf, rtol=1e-8, atol=1e-10)
+        elif metodo in motor_edo.IMPLICITOS:
+            ts, xs, _ = motor_edo.integrar_implicito(f_contada, jac, metodo, t0, x0, h, tf)
+        else:
+            ts, xs = motor_edo.integrar(f_contada, motor_edo.PASOS[metodo], t0, x0, h, tf)
+        return ts, xs, contador[0]
+
+    def evaluar(resultado):
+        ts, xs, evaluaciones = resultado
+        error = float(np.max(np.abs(xs - problema["exacta"](ts))))
+        return len(ts) - 1, evaluaciones, error
+
+    return f"edo/{problema['nombre']}/{metodo}", correr, evaluar
+
+
+def _caso_nucleo(problema, metodo):
+    """Como _caso_edo, con el núcleo generado y el bucle por bloques de las ventanas."""
+    expr, estados = problema["expresion"], problema["estados"]
+    t0, x0, h, tf = problema["t0"], problema["x0"], problema["h"], problema["tf"]
+    nucleo = nucleos_edo.nucleo(expr, metodo, estados)
+    f = motor_edo.compilar_rhs(expr, estados)
+
+    def correr():
+        ts, xs, llenado = flujo_edo.trayectoria_por_bloques(f, motor_edo.PASOS[metodo], t0, x0, h, tf,
+                                                            nucleo=nucleo)
+        for _ in llenado:
+            pass
+        return ts, xs
+
+    def evaluar(resultado):
+        ts, xs = resultado
+        error = float(np.max(np.abs(xs - problema["exacta"](ts))))
+        return len(ts) - 1, nucleo.etapas * (len(ts) - 1), error
+
+    return f"edo/{problema['nombre']}/{metodo}_nucleo", correr, evaluar
+
+
+def _caso_integral(problema, metodo):
+    f = compilar_expresion(problema["expresion"], ("x",))
+    a, b = problema["a"], problema["b"]
+
+    def correr():
+        if metodo == "trapecio":
+            area, _, _, evaluaciones = integral_trapecios(f, a, b, N_TRAPECIOS)
+            return area, {"evaluaciones": evaluaciones}  # Suma y, con n grande, puntos de la gráfica
+        return cuadratura.integrar(f, a, b, metodo, TOL_INTEGRAL)
+
+    def evaluar(resultado):
+        valor, est = resultado
+        # Cada "paso" es un punto donde se evaluó f (f se evalúa vectorizada)
+        return est["evaluaciones"], est["evaluaciones"], abs(valor - problema["exacta"])
+
+    return f"integral/{problema['nombre']}/{metodo}", correr, evaluar
+
+
+def _error_raices(encontradas, exactas):
+    if len(encontradas) != len(exactas):
+        return math.inf
+    return float(np.max(np.abs(np.sort(encontradas) - np.sort(exactas))))
+
+
+def _caso_newton(problema):
+    fdf = compilar_con_derivada(problema["expresion"])
+
+    def correr():
+        fdf_contada, contador = _contar(fdf)
+        pasos = list(pasos_newton(fdf_contada, problema["semilla"], 100, tol=1e-14))
+        return pasos[-1][1], len(pasos), contador[0]
+
+    def evaluar(resultado):
+        x, iteraciones, evaluaciones = resultado
+        error = float(np.min(np.abs(np.asarray(problema["raices"]) - x)))
+        return iteraciones, evaluaciones, error
+
+    return f"raices/{problema['nombre']}/newton", correr, evaluar
+
+
+def _caso_todas_las_raices(problema):
+    fdf = compilar_con_derivada(problema["expresion"])
+
+    def correr():
+        fdf_contada, contador = _contar(fdf)
+        encontradas, _ = raices.todas_las_raices(fdf_contada, problema["a"], problema["b"])
+        return encontradas, contador[0]
+
+    def evaluar(resultado):
+        encontradas, evaluaciones = resultado
+        return evaluaciones, evaluaciones, _error_raices(encontradas, problema["raices"])
+
+    return f"raices/{problema['nombre']}/todas", correr, evaluar
+
+
+def _caso_polinomio(problema):
+    coefs = polinomios.coeficientes(problema["expresion"])
+
+    def correr():
+        return polinomios.resolver_caracteristica(coefs)
+
+    def evaluar(grupos):
+        exactas = problema["raices"]
+        if sorted(m for _, m in grupos) != sorted(m for _, m in exactas):
+            return 1, 0, math.inf
+        error = max(min(abs(r - e) for e, _ in exactas) for r, _ in grupos)
+        return 1, 0, float(error)
+
+    return f"polinomio/{problema['nombre']}/matriz_companera", correr, evaluar
+
+
+def casos():
+    """Todos los casos del banco de pruebas, en orden."""
+    lista = []
+    for problema in PROBLEMAS_EDO:
+        lista += [_caso_edo(problema, metodo) for metodo in problema["metodos"]]
+        if len(problema["estados"]) == 1:
+            lista += [_caso_nucleo(problema, metodo) for metodo in EXPLICITOS]
+    for problema in PROBLEMAS_INTEGRAL:
+        lista += [_caso_integral(problema, metodo) for metodo in ("trapecio",) + cuadratura.METODOS]
+    for problema in PROBLEMAS_RAICES:
+        lista += [_caso_newton(problema), _caso_todas_las_raices(problema)]
+    lista += [_caso_polinomio(problema) for problema in PROBLEMAS_POLINOMIO]
+    return lista
+
+
+# --- Medición ---
+
+def medir(nombre, correr, evaluar, repeticiones=3):
+    """Corre un caso y devuelve sus métricas como diccionario."""
+    correr()  # Calentamiento: compilación y cachés fuera de la medición
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = correr()
+        tiempos.append(time.perf_counter() - inicio)
+    tiempo = min(tiempos)
+
+    tracemalloc.start()
+    try:
+        correr()
+        memoria_pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    pasos, evaluaciones, error = evaluar(resultado)
+    return {
+        "caso": nombre,
+        "tiempo": tiempo,
+        "pasos": int(pasos),
+        "pasos_por_segundo": pasos / tiempo if tiempo > 0 else math.inf,
+        "evaluaciones": int(evaluaciones),
+        "memoria_pico": int(memoria_pico),
+        "error": float(error),
+    }
+
+
+def ejecutar(filtro=None, repeticiones=3, informar=None):
+    """Mide todos los casos (o los que contienen 'filtro'). 'informar(fila)' se llama tras cada uno."""
+    resultados = []
+    for nombre, correr, evaluar in casos():
+        if filtro and filtro not in nombre:
+            continue
+        fila = medir(nombre, correr, evaluar, repeticiones)
+        resultados.append(fila)
+        if informar is not None:
+            informar(fila)
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "maquina": platform.platform(),
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "repeticiones": repeticiones,
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, base, umbral=0.25, factor_error=FACTOR_ERROR):
+    """Lista de (caso, motivo) para los casos en común que empeoraron respecto de 'base'."""
+    anteriores = {fila["caso"]: fila for fila in base["resultados"]}
+    regresiones = []
+    for fila in actual["resultados"]:
+        anterior = anteriores.get(fila["caso"])
+        if anterior is None:
+            continue
+        if fila["tiempo"] > anterior["tiempo"] * (1 + umbral):
+            aumento = 100 * (fila["tiempo"] / anterior["tiempo"] - 1)
+            regresiones.append((fila["caso"], f"tiempo {anterior['tiempo'] * 1e3:.2f} ms -> "
+                                              f"{fila['tiempo'] * 1e3:.2f} ms (+{aumento:.0f}%)"))
+        if fila["evaluaciones"] > anterior["evaluaciones"] * (1 + umbral):
+            regresiones.append((fila["caso"], f"evaluaciones {anterior['evaluaciones']} -> {fila['evaluaciones']}"))
+        if fila["error"] > anterior["error"] * factor_error + 1e-14:
+            regresiones.append((fila["caso"], f"error {anterior['error']:.3e} -> {fila['error']:.3e}"))
+    return regresiones
+
+
+def formatear_fila(fila):
+    return (f"{fila['caso']:<48} {fila['tiempo'] * 1e3:10.2f} ms {fila['pasos_por_segundo']:14,.0f} pasos/s "
+            f"{fila['evaluaciones']:10d} evals {fila['memoria_pico'] / 1024:10.1f} KiB  error {fila['error']:.3e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide velocidad y precisión de los métodos con problemas de solución exacta.")
+    parser.add_argument("-o", "--salida", default=None, help="archivo .json donde guardar los resultados")
+    parser.add_argument("--base", default=None, help="resultados .json anteriores para detectar regresiones")
+    parser.add_argument("--umbral", type=float, default=0.25, help="aumento de tiempo tolerado (0.25 = 25%%)")
+    parser.add_argument("-r", "--repeticiones", type=int, default=3, help="se toma el mejor tiempo de estas corridas")
+    parser.add_argument("-k", "--filtro", default=None, help="solo los casos cuyo nombre contiene este texto")
+    args = parser.parse_args(argv)
+
+    base = None
+    if args.base:
+        try:
+            with open(args.base, encoding="utf-8") as archivo:
+                base = json.load(archivo)
+        except (OSError, ValueError) as e:
+            print(f"Error: no se pudo leer la base '{args.base}': {e}", file=sys.stderr)
+            return 2
+
+    resultados = ejecutar(args.filtro, max(1, args.repeticiones), informar=lambda fila: print(formatear_fila(fila)))
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"{len(resultados['resultados'])} casos -> {args.salida}")
+
+    if base is None:
+        return 0
+    regresiones = comparar(resultados, base, args.umbral)
+    for caso, motivo in regresiones:
+        print(f"REGRESIÓN {caso}: {motivo}")
+    if not regresiones:
+        print(f"Sin regresiones respecto de {args.base}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+from expresiones import normalizar_expresion
+
+# Caché de trayectorias de paso fijo para las ventanas de EDO (EULER.py,
+# eulermejorado.py y RK4.py). Como el tiempo se calcula como t = t0 + n·h, la
+# trayectoria hasta un tf es el comienzo exacto de la trayectoria hasta
+# cualquier tf mayor: con la misma clave (expresión normalizada, método, t0,
+# x0, h, estados y parámetros) un resultado guardado sirve sin recalcular para
+# todo tf menor o igual, y si se pide uno mayor se continúa desde su último punto.
+#
+# En memoria se guardan hasta MAX_BYTES; al pasarse se descartan las menos
+# usadas recientemente (LRU). Con la variable de entorno CACHE_EDO=<carpeta>
+# además se escriben como .npz en esa carpeta y se recuperan en otra sesión.
+
+MAX_BYTES = 256 * 2**20
+
+
+def clave(expr, metodo, t0, x0, h, estados=("x",), parametros=None):
+    """Clave de la caché; no incluye tf (ver arriba)."""
+    return (normalizar_expresion(expr), metodo.strip().lower(), float(t0),
+            tuple(np.atleast_1d(np.asarray(x0, dtype=float)).tolist()), float(h),
+            tuple(estados), tuple(sorted((parametros or {}).items())))
+
+
+class CacheTrayectorias:
+    """Trayectorias (ts, xs) por clave, con memoria acotada y desalojo LRU."""
+
+    def __init__(self, max_bytes=MAX_BYTES, carpeta=None):
+        self.max_bytes = max_bytes
+        self.carpeta = carpeta
+        self._entradas = OrderedDict()  # clave -> (ts, xs), la última es la más reciente
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def buscar(self, clave):
+        """Devuelve la trayectoria (ts, xs) guardada para la clave, o None."""
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._entradas.move_to_end(clave)
+            return entrada
+        entrada = self._leer(clave)
+        if entrada is not None:
+            self._agregar(clave, *entrada)
+        return entrada
+
+    def guardar(self, clave, ts, xs):
+        """Guarda la trayectoria si llega más lejos que la que ya había.
+
+        Los arreglos no se copian: quien los guarda no debe modificarlos después.
+        """
+        anterior = self._entradas.get(clave)
+        if anterior is not None and len(anterior[0]) >= len(ts):
+            return
+        self._agregar(clave, ts, xs)
+        if self.carpeta:
+            self._escribir(clave, ts, xs)
+
+    def limpiar(self):
+        self._entradas.clear()
+        self.bytes = 0
+
+    def _agregar(self, clave, ts, xs):
+        self._quitar(clave)
+        tam = ts.nbytes + xs.nbytes
+        if tam > self.max_bytes:
+            return  # No entra ni sola: no se desaloja todo lo demás por ella
+        self._entradas[clave] = (ts, xs)
+        self.bytes += tam
+        while self.bytes > self.max_bytes:
+            self._quitar(next(iter(self._entradas)))
+
+    def _quitar(self, clave):
+        entrada = self._entradas.pop(clave, None)
+        if entrada is not None:
+            self.bytes -= entrada[0].nbytes + entrada[1].nbytes
+
+    # --- Copia en disco (.npz) ---
+
+    def _ruta(self, clave):
+        nombre = hashlib.sha1(repr(clave).encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.carpeta, f"trayectoria_{nombre}.npz")
+
+    def _leer(self, clave):
+        if not self.carpeta:
+            return None
+        ruta = self._ruta(clave)
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with np.load(ruta) as datos:
+                if str(datos["clave"]) != repr(clave):
+                    return None  # Otro problema con el mismo nombre de archivo
+                return datos["ts"], datos["xs"]
+        except (OSError, ValueError, KeyError):
+            return None  # Archivo dañado o incompleto: se vuelve a calcular
+
+    def _escribir(self, clave, ts, xs):
+        # Se escribe aparte y se reemplaza, así una sesión cortada no deja un .npz a medias
+        ruta = self._ruta(clave)
+        temporal = ruta[:-len(".npz")] + ".tmp.npz"
+        try:
+            os.makedirs(self.carpeta, exist_ok=True)
+            np.savez(temporal, clave=np.array(repr(clave)), ts=ts, xs=xs)
+            os.replace(temporal, ruta)
+        except OSError:
+            pass  # La copia en disco es opcional; el resultado sigue en memoria
+
+
+# Una sola caché para todas las ventanas (en el lanzador comparten proceso)
+CACHE = CacheTrayectorias(carpeta=os.environ.get("CACHE_EDO") or None)
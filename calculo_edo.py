@@ -0,0 +1,167 @@
+from tkinter import messagebox
+import cache_edo
+import flujo_edo
+from graficos import GraficaEnVivo, graficar_estados
+from instrumentacion import Medicion
+from tarea_fondo import TareaEnFondo
+
+# Ejecución de los integradores en segundo plano para las ventanas de EDO
+# (EULER.py, eulermejorado.py y RK4.py). Con paso fijo la trayectoria se llena
+# por bloques en arreglos reservados de antemano, y la tabla y la gráfica se
+# actualizan en vivo con lo que ya está calculado. RK45 y los métodos
+# implícitos corren completos en el hilo de trabajo e informan su avance.
+# Al cancelar se muestra lo calculado hasta ese momento.
+#
+# Las trayectorias de paso fijo se guardan en cache_edo.CACHE: calcular otra
+# vez lo mismo no recalcula nada y subir t final solo calcula el tramo nuevo.
+#
+# Cada cálculo se mide (evaluaciones de f, iteraciones de Newton y tiempo de
+# cálculo, tabla y gráfica) y el resumen va a la barra de estado de la ventana.
+
+
+class CalculoEnVivo:
+    def __init__(self, root, ax, canvas, tabla, panel, info_val, al_fallar=None, barra=None):
+        """panel: PanelProgreso de la ventana; info_val: StringVar para los mensajes;
+        barra: BarraEstado opcional donde se muestra la medición de cada cálculo."""
+        self.root = root
+        self.ax = ax
+        self.canvas = canvas
+        self.tabla = tabla
+        self.panel = panel
+        self.info_val = info_val
+        self.al_fallar = al_fallar or (lambda e: messagebox.showerror("Error", f"Error de cálculo: {e}"))
+        self.vivo = None
+        self.barra = barra
+        self.medicion = barra.medicion if barra is not None else Medicion("edo")
+
+    def ocupado(self):
+        return self.panel.ocupado()
+
+    def paso_fijo(self, f, paso, t0, x0, h, tf, estados, color, label, titulo, clave=None, nucleo=None):
+        """Integra con un método de paso fijo mostrando los puntos a medida que salen.
+
+        Con 'clave' (ver cache_edo.clave) se aprovecha lo que ya esté en la caché
+        y al terminar se guarda ahí lo calculado, aunque se haya cancelado.
+        Con 'nucleo' (nucleos_edo.nucleo) los pasos se dan con el código generado.
+        """
+        medicion = self.medicion.iniciar(metodo=label, t0=t0, h=h, tf=tf, estados=list(estados),
+                                         nucleo=nucleo is not None)
+        if nucleo is None:
+            f = medicion.envolver(f)
+        previa = cache_edo.CACHE.buscar(clave) if clave is not None else None
+        ts, xs, llenado = flujo_edo.trayectoria_por_bloques(f, paso, t0, x0, h, tf, previa=previa, nucleo=nucleo)
+        reutilizados = min(len(previa[0]), len(ts)) if previa is not None else 0
+        if reutilizados == len(ts):
+            self.info_val.set("Resultado ya calculado: se muestra sin recalcular")
+        elif reutilizados:
+            self.info_val.set(f"Se continúa desde t = {ts[reutilizados - 1]:.6g} "
+                              f"({reutilizados} puntos ya calculados)")
+        if reutilizados:
+            medicion.contar("puntos_reutilizados", reutilizados)
+        self._preparar(t0, t0 + h * (len(ts) - 1), estados, color, titulo)
+        listos = [0]
+
+        def trabajo(tarea):
+            for n in medicion.iterar("cálculo", llenado):
+                tarea.avanzar(n / len(ts))
+                yield n
+
+        def al_recibir(n):
+            with medicion.fase("gráfica"):
+                self.vivo.agregar(ts[listos[0]:n], xs[listos[0]:n])
+            listos[0] = n
+            with medicion.fase("tabla"):
+                self.tabla.mostrar_estados(ts[:n], xs[:n], estados, mantener=True)
+
+        def al_terminar(cancelada):
+            n = listos[0]
+            if cancelada:
+                self.info_val.set(f"Cancelado: {n} de {len(ts)} puntos calculados")
+            pasos = max(n - max(reutilizados, 1), 0)
+            medicion.contar("pasos", pasos)
+            if nucleo is not None:
+                # f va escrita dentro del núcleo: se cuentan las evaluaciones que hace el método
+                medicion.contar("evaluaciones", nucleo.etapas * pasos)
+            if clave is not None and n > reutilizados:
+                # Si se canceló, se guarda una copia del tramo calculado (no el arreglo entero)
+                cache_edo.CACHE.guardar(clave, *((ts, xs) if n == len(ts) else (ts[:n].copy(), xs[:n].copy())))
+            with medicion.fase("gráfica"):
+                self._graficar(ts[:n], xs[:n], estados, color, label, titulo)
+            self._informar("cancelado" if cancelada else "completo")
+
+        self._iniciar(trabajo, al_recibir, al_terminar)
+
+    def completo(self, calcular, t0, tf, estados, color, label, titulo, describir):
+        """Corre 'calcular(progreso)' -> (ts, xs, estadisticas) en segundo plano.
+
+        'describir(estadisticas)' devuelve el texto que se muestra al terminar.
+        """
+        medicion = self.medicion.iniciar(metodo=label, t0=t0, tf=tf, estados=list(estados))
+        self._preparar(t0, tf, estados, color, titulo)
+        resultado = []
+
+        def trabajo(tarea):
+            with medicion.fase("cálculo"):
+                calculado = calcular(tarea.avanzar)
+            yield calculado
+
+        def al_terminar(cancelada):
+            if cancelada:
+                self.info_val.set("Cálculo cancelado")
+                self._graficar([], [], estados, color, label, titulo)
+                self._informar("cancelado")
+                return
+            ts, xs, est = resultado[0]
+            medicion.agregar(est)  # Evaluaciones, pasos e iteraciones de Newton del integrador
+            self.info_val.set(describir(est))
+            with medicion.fase("tabla"):
+                self.tabla.mostrar_estados(ts, xs, estados)
+            with medicion.fase("gráfica"):
+                self._graficar(ts, xs, estados, color, label, titulo)
+            self._informar("completo")
+
+        self._iniciar(trabajo, resultado.append, al_terminar)
+
+    def _iniciar(self, trabajo, al_recibir, al_terminar):
+        def al_fallar(error):
+            # Lo calculado hasta el error queda a la vista
+            self._terminar_vivo()
+            self.canvas.draw()
+            self._informar("error")
+            self.al_fallar(error)
+
+        tarea = TareaEnFondo(self.root, trabajo, al_recibir=al_recibir, al_terminar=al_terminar,
+                             al_fallar=al_fallar)
+        self.panel.vincular(tarea).iniciar()
+
+    def _informar(self, estado):
+        self.medicion.terminar(estado)
+        if self.barra is not None:
+            self.barra.actualizar()
+
+    def _decorar(self, titulo):
+        self.ax.set_title(titulo)
+        self.ax.set_xlabel("Tiempo (t)")
+        self.ax.set_ylabel("Estado (x)")
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+
+    def _preparar(self, t0, tf, estados, color, titulo):
+        self.tabla.limpiar()
+        self.ax.clear()
+        self._decorar(titulo)
+        colores = [color] if len(estados) == 1 else [color] + [f"C{i}" for i in range(len(estados) - 1)]
+        self.vivo = GraficaEnVivo(self.ax, self.canvas, t0, tf, colores)
+
+    def _terminar_vivo(self):
+        if self.vivo is not None:
+            self.vivo.terminar()
+            self.vivo = None
+
+    def _graficar(self, ts, xs, estados, color, label, titulo):
+        self._terminar_vivo()  # La gráfica final reemplaza a la de en vivo
+        self.ax.clear()
+        if len(ts):
+            graficar_estados(self.ax, ts, xs, estados, color=color, label=label)
+            self.ax.legend()
+        self._decorar(titulo)
+        self.canvas.draw()
@@ -0,0 +1,460 @@
+import argparse
+import functools
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from expresiones import compilar_expresion
+
+# Integración numérica guiada por una tolerancia, en lugar de un n fijo.
+#
+#   romberg             trapecio con el paso a la mitad en cada nivel (solo se evalúan
+#                       los puntos nuevos) + extrapolación de Richardson.
+#   simpson_adaptativo  Simpson que divide solo los tramos donde no converge; cada
+#                       división reutiliza los tres puntos ya evaluados del tramo.
+#   gauss_kronrod       Gauss-Kronrod 7-15 adaptativo: el error de cada tramo se estima
+#                       con la diferencia entre la regla de 7 y la de 15 puntos.
+#
+# Todas devuelven (valor, estadisticas) con el error estimado, la cantidad de
+# evaluaciones de f y los bordes de los tramos usados (para graficar). f se
+# evalúa sobre arreglos: en los modos adaptativos se evalúan juntos todos los
+# tramos que siguen abiertos, una llamada por nivel.
+#
+# Para n enormes y para datos medidos (t, y no uniformes, en .npy o .csv) están
+# trapecio_por_bloques y las funciones *_muestras: recorren los datos en bloques
+# de tamaño fijo (los .npy se leen mapeados en memoria) y acumulan las sumas
+# parciales con suma compensada, así la memoria no depende de n.
+#
+# integrar_paralelo reparte [a, b] en tramos fijos (no dependen de la cantidad
+# de trabajadores) que se resuelven en un pool de hilos o de procesos; las
+# partes se combinan siempre en el mismo orden, así el resultado es idéntico
+# con 1 o con 16 trabajadores.
+#
+# Uso:  python cuadratura.py "exp(-x**2)" --a -5 --b 5 --metodo gauss_kronrod --tol 1e-12 -j 4
+
+METODOS = ("romberg", "simpson", "gauss_kronrod")
+TAM_BLOQUE = 1 << 20
+PARTES = 16  # Tramos en que se divide [a, b] para integrar en paralelo
+
+# Nodos y pesos de Kronrod (15 puntos) y de Gauss (7 puntos, en los nodos impares de Kronrod)
+_XK = np.array([0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+                0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+                0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+                0.207784955007898467600689403773245, 0.0])
+_WK = np.array([0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+                0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+                0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+                0.204432940075298892414161999234649, 0.209482141084727828012999174891714])
+_WG = np.array([0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+                0.381830050505118944950369775488975, 0.417959183673469387755102040816327])
+_NODOS_K = np.concatenate([-_XK[:-1], _XK[::-1]])            # 15 nodos en [-1, 1]
+_PESOS_K = np.concatenate([_WK[:-1], _WK[::-1]])
+_PESOS_G = np.zeros(15)
+_PESOS_G[1:7:2] = _WG[:3]
+_PESOS_G[7] = _WG[3]
+_PESOS_G[9:14:2] = _WG[2::-1]
+
+
+def _evaluar(f, x):
+    """f(x) como arreglo de la forma de x (una expresión constante devuelve un escalar)."""
+    return np.broadcast_to(np.asarray(f(x), dtype=float), np.shape(x))
+
+
+def romberg(f, a, b, tol=1e-10, max_niveles=25, avanzar=None):
+    """Integra f en [a, b] con el método de Romberg hasta que dos diagonales
+    sucesivas difieran menos que 'tol'. Cada nivel reutiliza todas las
+    evaluaciones del anterior y solo evalúa los puntos medios nuevos."""
+    a, b = float(a), float(b)
+    h = b - a
+    fa, fb = _evaluar(f, np.array([a, b]))
+    anterior = [h / 2 * (fa + fb)]
+    evaluaciones = 2
+    error = np.inf
+    for k in range(1, max_niveles + 1):
+        h /= 2
+        nuevos = a + h * (2 * np.arange(2 ** (k - 1)) + 1)
+        actual = [anterior[0] / 2 + h * np.sum(_evaluar(f, nuevos))]
+        evaluaciones += len(nuevos)
+        for j in range(1, k + 1):
+            actual.append(actual[j - 1] + (actual[j - 1] - anterior[j - 1]) / (4 ** j - 1))
+        error = abs(actual[-1] - anterior[-1])
+        anterior = actual
+        if avanzar is not None:
+            avanzar(k / max_niveles)
+        # Con menos de 4 niveles (17 puntos) la coincidencia puede ser casual
+        if k >= 4 and error <= tol:
+            break
+    return anterior[-1], {"error": error, "evaluaciones": evaluaciones,
+                          "subintervalos": np.linspace(a, b, 2 ** k + 1), "niveles": k}
+
+
+def simpson_adaptativo(f, a, b, tol=1e-10, max_niveles=50, avanzar=None):
+    """Integra f en [a, b] con Simpson adaptativo: un tramo se acepta cuando
+    Simpson en el tramo y en sus dos mitades difieren menos que su parte de la
+    tolerancia; si no, se divide. Cada nivel evalúa f una sola vez para todos
+    los tramos abiertos."""
+    a, b = float(a), float(b)
+    izq = np.array([a])
+    der = np.array([b])
+    f_izq, f_med, f_der = (np.array([v]) for v in _evaluar(f, np.array([a, (a + b) / 2, b])))
+    entero = (der - izq) / 6 * (f_izq + 4 * f_med + f_der)
+    tolerancias = np.array([float(tol)])
+    evaluaciones = 3
+    total, error, cubierto = 0.0, 0.0, 0.0
+    bordes = [np.array([a, b])]
+
+    for nivel in range(max_niveles):
+        med = (izq + der) / 2
+        valores = _evaluar(f, np.concatenate([(izq + med) / 2, (med + der) / 2]))
+        evaluaciones += len(valores)
+        f_cuarto, f_tres_cuartos = valores[:len(izq)], valores[len(izq):]
+        mitad_izq = (med - izq) / 6 * (f_izq + 4 * f_cuarto + f_med)
+        mitad_der = (der - med) / 6 * (f_med + 4 * f_tres_cuartos + f_der)
+        diferencia = mitad_izq + mitad_der - entero
+
+        listos = np.abs(diferencia) <= 15 * tolerancias
+        if nivel < 2:
+            listos[:] = False  # Al menos dos divisiones antes de confiar en la estimación
+        elif nivel == max_niveles - 1:
+            listos[:] = True
+        # Corrección de Richardson: Simpson compuesto + diferencia/15 (orden 6)
+        total += np.sum(mitad_izq[listos] + mitad_der[listos] + diferencia[listos] / 15)
+        error += np.sum(np.abs(diferencia[listos])) / 15
+        cubierto += np.sum(der[listos] - izq[listos])
+        bordes.append(med)
+        if avanzar is not None:
+            avanzar(cubierto / (b - a) if b != a else 1.0)
+
+        seguir = ~listos
+        if not seguir.any():
+            break
+        izq, med, der = izq[seguir], med[seguir], der[seguir]
+        f_izq, f_med, f_der = f_izq[seguir], f_med[seguir], f_der[seguir]
+        f_cuarto, f_tres_cuartos = f_cuarto[seguir], f_tres_cuartos[seguir]
+        # Cada tramo abierto se parte en sus dos mitades (que ya tienen su Simpson calculado)
+        izq, der = np.concatenate([izq, med]), np.concatenate([med, der])
+        f_izq, f_med, f_der = (np.concatenate([f_izq, f_med]), np.concatenate([f_cuarto, f_tres_cuartos]),
+                               np.concatenate([f_med, f_der]))
+        entero = np.concatenate([mitad_izq[seguir], mitad_der[seguir]])
+        tolerancias = np.concatenate([tolerancias[seguir], tolerancias[seguir]]) / 2
+
+    return total, {"error": error, "evaluaciones": evaluaciones,
+                   "subintervalos": np.unique(np.concatenate(bordes))}
+
+
+def gauss_kronrod(f, a, b, tol=1e-10, max_niveles=50, avanzar=None):
+    """Integra f en [a, b] con Gauss-Kronrod 7-15 adaptativo. Un tramo se acepta
+    cuando |K15 - G7| es menor que su parte de la tolerancia (proporcional a su
+    largo); si no, se divide en dos."""
+    a, b = float(a), float(b)
+    izq = np.array([a])
+    der = np.array([b])
+    evaluaciones = 0
+    total, error, cubierto = 0.0, 0.0, 0.0
+    bordes = [np.array([a, b])]
+
+    for nivel in range(max_niveles):
+        centro = (izq + der) / 2
+        radio = (der - izq) / 2
+        x = centro[:, None] + radio[:, None] * _NODOS_K
+        fx = _evaluar(f, x.ravel()).reshape(x.shape)
+        evaluaciones += fx.size
+        kronrod = radio * (fx @ _PESOS_K)
+        gauss = radio * (fx @ _PESOS_G)
+        diferencia = np.abs(kronrod - gauss)
+
+        listos = diferencia <= tol * (der - izq) / (b - a) if b != a else np.ones(len(izq), dtype=bool)
+        if nivel == max_niveles - 1:
+            listos[:] = True
+        total += np.sum(kronrod[listos])
+        error += np.sum(diferencia[listos])
+        cubierto += np.sum(der[listos] - izq[listos])
+        if avanzar is not None:
+            avanzar(cubierto / (b - a) if b != a else 1.0)
+
+        seguir = ~listos
+        if not seguir.any():
+            break
+        izq, centro, der = izq[seguir], centro[seguir], der[seguir]
+        bordes.append(centro)
+        izq, der = np.concatenate([izq, centro]), np.concatenate([centro, der])
+
+    return total, {"error": error, "evaluaciones": evaluaciones,
+                   "subintervalos": np.unique(np.concatenate(bordes))}
+
+
+class SumaCompensada:
+    """Acumulador de Neumaier: guarda aparte los bits que se pierden al sumar
+    números de distinta magnitud, así el error no crece con la cantidad de bloques."""
+
+    def __init__(self):
+        self.suma = 0.0
+        self.compensacion = 0.0
+
+    def agregar(self, valor):
+        valor = float(valor)
+        total = self.suma + valor
+        if abs(self.suma) >= abs(valor):
+            self.compensacion += (self.suma - total) + valor
+        else:
+            self.compensacion += (valor - total) + self.suma
+        self.suma = total
+
+    @property
+    def total(self):
+        return self.suma + self.compensacion
+
+
+def trapecio_por_bloques(f, a, b, n, tam_bloque=TAM_BLOQUE, avanzar=None):
+    """Regla del trapecio con n tramos iguales, evaluando f por bloques.
+
+    Nunca se arma la malla completa: cada bloque genera sus x como a + k·h,
+    suma sus f(x) con una reducción de numpy y el total se acumula con suma
+    compensada. Devuelve (valor, estadisticas) como los demás métodos.
+    """
+    a, b, n = float(a), float(b), int(n)
+    if n < 1:
+        raise ValueError("El número de trapecios debe ser al menos 1.")
+    h = (b - a) / n
+    suma = SumaCompensada()
+    for inicio in range(0, n + 1, tam_bloque):
+        fin = min(inicio + tam_bloque, n + 1)
+        x = a + h * np.arange(inicio, fin, dtype=float)
+        if fin == n + 1:
+            x[-1] = b
+        y = _evaluar(f, x)
+        if inicio == 0:
+            suma.agregar(-y[0] / 2)
+        if fin == n + 1:
+            suma.agregar(-y[-1] / 2)
+        suma.agregar(np.sum(y))
+        if avanzar is not None:
+            avanzar(fin / (n + 1))
+    return h * suma.total, {"evaluaciones": n + 1}
+
+
+def trapecio_muestras(ts, ys, tam_bloque=TAM_BLOQUE, avanzar=None):
+    """Trapecio sobre muestras (t, y) con t creciente y paso no necesariamente uniforme.
+
+    ts e ys pueden ser arreglos mapeados en memoria: se recorren por bloques,
+    así solo un bloque a la vez pasa a la RAM.
+    """
+    total = len(ts)
+
+    def bloques():
+        for inicio in range(0, total, tam_bloque):
+            fin = min(inicio + tam_bloque, total)
+            yield np.asarray(ts[inicio:fin], dtype=float), np.asarray(ys[inicio:fin], dtype=float)
+            if avanzar is not None:
+                avanzar(fin / total)
+
+    return trapecio_bloques_muestras(bloques())
+
+
+def trapecio_bloques_muestras(bloques):
+    """Trapecio sobre una secuencia de bloques (t, y) consecutivos.
+
+    Entre un bloque y el siguiente se guarda el último punto para no perder
+    el tramo que los une. Devuelve (valor, estadisticas).
+    """
+    suma = SumaCompensada()
+    t_ant = y_ant = None
+    muestras = 0
+    for t, y in bloques:
+        if len(t) == 0:
+            continue
+        muestras += len(t)
+        if t_ant is not None:
+            t = np.concatenate([[t_ant], t])
+            y = np.concatenate([[y_ant], y])
+        suma.agregar(np.sum(np.diff(t) * (y[1:] + y[:-1])) / 2)
+        t_ant, y_ant = t[-1], y[-1]
+    if muestras < 2:
+        raise ValueError("Se necesitan al menos dos muestras para integrar.")
+    return suma.total, {"muestras": muestras}
+
+
+def leer_muestras(ruta, columna=1):
+    """Abre un .npy de forma (N, k) mapeado en memoria y devuelve las vistas (t, y).
+
+    La columna 0 es t (como en los archivos de flujo_edo.py) e y es 'columna'.
+    """
+    datos = np.load(ruta, mmap_mode="r")
+    if datos.ndim != 2 or datos.shape[1] <= columna:
+        raise ValueError(f"'{ruta}' debe tener forma (N, k) con al menos {columna + 1} columnas")
+    return datos[:, 0], datos[:, columna]
+
+
+def bloques_csv(ruta, columna=1, tam_bloque=TAM_BLOQUE, avanzar=None):
+    """Lee un .csv de muestras (t en la columna 0) por bloques de filas. Se
+    saltea una primera fila de encabezado si no es numérica."""
+    tamano = os.path.getsize(ruta) or 1
+    with open(ruta, "rb") as archivo:
+        primera = archivo.readline()
+        try:
+            [float(v) for v in primera.split(b",")]
+            archivo.seek(0)
+        except ValueError:
+            pass
+        while True:
+            lineas = [linea.decode("utf-8") for linea in itertools.islice(archivo, tam_bloque)]
+            if not lineas:
+                return
+            datos = np.loadtxt(lineas, delimiter=",", ndmin=2, usecols=(0, columna))
+            yield datos[:, 0], datos[:, 1]
+            if avanzar is not None:
+                avanzar(archivo.tell() / tamano)
+
+
+def integrar_muestras(ruta, columna=1, tam_bloque=TAM_BLOQUE, avanzar=None):
+    """Integra datos medidos guardados en .npy (mapeado en memoria) o .csv (por bloques)."""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".npy":
+        ts, ys = leer_muestras(ruta, columna)
+        return trapecio_muestras(ts, ys, tam_bloque, avanzar)
+    if extension == ".csv":
+        return trapecio_bloques_muestras(bloques_csv(ruta, columna, tam_bloque, avanzar))
+    raise ValueError(f"Formato de datos no soportado: '{extension}' (use .npy o .csv)")
+
+
+def integrar(f, a, b, metodo="gauss_kronrod", tol=1e-10, avanzar=None):
+    """Integra f en [a, b] con el método dado (ver METODOS). Devuelve (valor, estadisticas)."""
+    funciones = {"romberg": romberg, "simpson": simpson_adaptativo, "gauss_kronrod": gauss_kronrod}
+    clave = metodo.strip().lower()
+    if clave not in funciones:
+        raise ValueError(f"Método de integración desconocido: '{metodo}' (use {', '.join(METODOS)})")
+    if tol <= 0:
+        raise ValueError("La tolerancia debe ser positiva.")
+    return funciones[clave](f, a, b, tol, avanzar=avanzar)
+
+
+def _preparar_funcion(f):
+    return compilar_expresion(f, ("x",)) if isinstance(f, str) else f
+
+
+def _resolver_parte_con(f, parte):
+    """Integra un tramo con f. parte = (metodo, a, b, n o tol)."""
+    metodo, a, b, parametro = parte
+    if metodo == "trapecio":
+        return trapecio_por_bloques(f, a, b, parametro)
+    return integrar(f, a, b, metodo, parametro)
+
+
+# Estado de cada proceso trabajador: f se envía (como texto) y se compila una sola
+# vez. Solo lo usa el pool de procesos; con hilos (o sin pool) f se pasa en cada
+# llamada, porque en el lanzador (main.py) varias ventanas comparten el proceso y
+# dos integraciones a la vez se pisarían la variable global.
+_f_trabajador = None
+
+
+def _iniciar_trabajador(f):
+    global _f_trabajador
+    _f_trabajador = _preparar_funcion(f)
+
+
+def _resolver_parte(parte):
+    """Integra un tramo con la f del proceso trabajador."""
+    return _resolver_parte_con(_f_trabajador, parte)
+
+
+def _partes(metodo, a, b, n, tol, partes):
+    if metodo == "trapecio":
+        # Se reparten los n tramos del trapecio; los bordes coinciden con la malla global
+        cortes = np.linspace(0, n, min(partes, n) + 1).round().astype(int)
+        h = (b - a) / n
+        return [("trapecio", a + h * i, b if j == n else a + h * j, int(j - i))
+                for i, j in zip(cortes[:-1], cortes[1:])]
+    bordes = np.linspace(a, b, partes + 1)
+    # Cada tramo recibe la parte de la tolerancia que le corresponde por su largo
+    return [(metodo, float(i), float(j), tol / partes) for i, j in zip(bordes[:-1], bordes[1:])]
+
+
+def integrar_paralelo(f, a, b, metodo="gauss_kronrod", tol=1e-10, n=None, partes=PARTES,
+                      trabajadores=None, usar_procesos=False, avanzar=None):
+    """Integra f en [a, b] repartiendo 'partes' tramos entre varios trabajadores.
+
+    'metodo' es "trapecio" (con n tramos en total) o uno de METODOS (con la
+    tolerancia repartida entre los tramos, que se refinan en paralelo). f
+    puede ser una función o el texto de la expresión; con usar_procesos=True
+    f debe ser texto (o una función que se pueda enviar a otro proceso) y se
+    compila una vez por proceso. Devuelve (valor, estadisticas).
+    """
+    a, b = float(a), float(b)
+    clave = metodo.strip().lower()
+    if clave == "trapecio":
+        if n is None or int(n) < 1:
+            raise ValueError("El número de trapecios debe ser al menos 1.")
+        n = int(n)
+    elif clave not in METODOS:
+        raise ValueError(f"Método de integración desconocido: '{metodo}' (use trapecio o {', '.join(METODOS)})")
+    elif tol <= 0:
+        raise ValueError("La tolerancia debe ser positiva.")
+    tareas = _partes(clave, a, b, n, tol, max(1, int(partes)))
+
+    # Validar en el proceso principal para no arrancar el pool con una expresión inválida
+    funcion = _preparar_funcion(f)
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if trabajadores == 1:
+        resultados = []
+        for i, tarea in enumerate(tareas):
+            resultados.append(_resolver_parte_con(funcion, tarea))
+            if avanzar is not None:
+                avanzar((i + 1) / len(tareas))
+    else:
+        if usar_procesos:
+            pool = ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_trabajador, initargs=(f,))
+            resolver = _resolver_parte
+        else:
+            pool = ThreadPoolExecutor(max_workers=trabajadores)
+            resolver = functools.partial(_resolver_parte_con, funcion)
+        try:
+            resultados = []
+            for resultado in pool.map(resolver, tareas):
+                resultados.append(resultado)
+                if avanzar is not None:
+                    avanzar(len(resultados) / len(tareas))
+        finally:
+            # Si se canceló (avanzar lanzó una excepción) no se esperan las partes pendientes
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # Combinar siempre en el orden de los tramos, con suma compensada
+    valor = SumaCompensada()
+    for parcial, _ in resultados:
+        valor.agregar(parcial)
+    estadisticas = {"evaluaciones": sum(est["evaluaciones"] for _, est in resultados), "partes": len(tareas)}
+    if clave != "trapecio":
+        estadisticas["error"] = sum(est["error"] for _, est in resultados)
+        estadisticas["subintervalos"] = np.unique(np.concatenate([est["subintervalos"] for _, est in resultados]))
+    return valor.total, estadisticas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Integral de f(x) en [a, b], en paralelo por tramos.")
+    parser.add_argument("expresion", help="f(x), p. ej. 'exp(-x**2)'")
+    parser.add_argument("--a", type=float, required=True)
+    parser.add_argument("--b", type=float, required=True)
+    parser.add_argument("--metodo", default="gauss_kronrod", help="trapecio, romberg, simpson o gauss_kronrod")
+    parser.add_argument("--tol", type=float, default=1e-10, help="tolerancia (métodos adaptativos)")
+    parser.add_argument("--n", type=int, default=None, help="trapecios (método trapecio)")
+    parser.add_argument("--partes", type=int, default=PARTES, help="tramos en que se divide [a, b]")
+    parser.add_argument("-j", "--trabajadores", type=int, default=None, help="hilos o procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--procesos", action="store_true", help="usar procesos en lugar de hilos")
+    args = parser.parse_args(argv)
+
+    try:
+        valor, est = integrar_paralelo(args.expresion, args.a, args.b, args.metodo, args.tol, args.n,
+                                       args.partes, args.trabajadores, args.procesos)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"integral = {valor:.15g}")
+    if "error" in est:
+        print(f"error estimado = {est['error']:.2e}")
+    print(f"evaluaciones de f = {est['evaluaciones']} ({est['partes']} tramos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,183 +1,176 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
 import numpy as np
-import matplotlib.pyplot as plt
-import sympy as sp
-
-
-# ----------------- NEWTON RAPHSON PARA UNA RAÍZ -----------------
-def newton_all_steps(func_str, deriv_str, x0, iters):
-    """Devuelve la raíz y todas las iteraciones para graficar."""
-    def f(x):
-        return eval(func_str, {"x": x, "np": np})
-
-    def fprima(x):
-        return eval(deriv_str, {"x": x, "np": np})
-
-    xs = [x0]
-
-    for _ in range(iters):
-        fx = f(x0)
-        dfx = fprima(x0)
-
-        if dfx == 0:
-            raise ValueError("La derivada se hizo cero. No se puede continuar.")
-
-        x1 = x0 - fx / dfx
-        xs.append(x1)
-
-        if abs(f(x1)) < 1e-8:
-            return x1, xs
-
-        x0 = x1
-
-    return x1, xs
-
-# ----------------- FUNCIÓN PRINCIPAL -----------------
-def calcular_todo():
-    try:
-        funcion_str = entry_funcion.get()
-        derivada_str = entry_derivada.get()
-        x0_1 = float(entry_x0_1.get())
-        x0_2 = float(entry_x0_2.get())
-        iter_user = int(entry_iter.get())
-
-        texto_resultados.delete(1.0, tk.END)
-        texto_resultados.insert(tk.END, "=== MÉTODO DE NEWTON PARA LAS DOS RAÍCES ===\n\n")
-
-        # Obtener coeficientes a, b, c automáticamente
-        x = sp.Symbol("x")
-        pol = sp.sympify(funcion_str)
-        pol = sp.expand(pol)
-
-        a = float(pol.coeff(x, 2))
-        b = float(pol.coeff(x, 1))
-        c = float(pol.coeff(x, 0))
-
-        texto_resultados.insert(tk.END, f"Ecuación característica:\n {a}m² + {b}m + {c} = 0\n\n")
-
-        # Newton para m1
-        m1, its1 = newton_all_steps(funcion_str, derivada_str, x0_1, iter_user)
-        texto_resultados.insert(tk.END, f"Raíz 1 (m1) usando x0 = {x0_1} → {m1}\n")
-
-        # Newton para m2
-        m2, its2 = newton_all_steps(funcion_str, derivada_str, x0_2, iter_user)
-        texto_resultados.insert(tk.END, f"Raíz 2 (m2) usando x0 = {x0_2} → {m2}\n\n")
-
-        # Determinar tipo de solución + mostrar m₁ y m₂
-        if abs(m1 - m2) < 1e-6:
-            caso = "Caso I (Raíz doble)"
-            texto_resultados.insert(tk.END, "-> CASO I: Raíz doble\n")
-            texto_resultados.insert(
-                tk.END,
-                f"x(t) = k1 · e^({m1:.6f}·t)  +  t · k2 · e^({m1:.6f}·t)\n"
-            )
-        else:
-            caso = "Caso II (Raíces distintas)"
-            texto_resultados.insert(tk.END, "-> CASO II: Raíces distintas\n")
-            texto_resultados.insert(
-                tk.END,
-                f"x(t) = k1 · e^({m1:.6f}·t)  +  k2 · e^({m2:.6f}·t)\n"
-            )
+from expresiones import compilar_expresion
+import polinomios
+from instrumentacion import BarraEstado
+
+
+# ----------------- RAÍCES DE LA ECUACIÓN CARACTERÍSTICA -----------------
+def describir_raiz(r, m):
+    """Texto de una raíz agrupada: real o par conjugado, con su multiplicidad."""
+    if r.imag == 0:
+        texto = f"m = {r.real:.6f}"
+    else:
+        texto = f"m = {r.real:.6f} ± {r.imag:.6f}i"
+    nombres = {1: "simple", 2: "doble", 3: "triple"}
+    return f"{texto}   ({nombres.get(m, f'multiplicidad {m}')})"
+
+
+def clasificar(grupos):
+    """Caso de la solución según las raíces (como los casos I/II/III de 2.º orden)."""
+    casos = []
+    if any(r.imag == 0 and m == 1 for r, m in grupos):
+        casos.append("raíces reales distintas")
+    if any(m > 1 for r, m in grupos):
+        casos.append("raíces repetidas")
+    if any(r.imag != 0 for r, m in grupos):
+        casos.append("raíces complejas (oscilación)")
+    return ", ".join(casos).capitalize()
+
+
+# ----------------- GRÁFICAS -----------------
+def graficar(funcion_str, grupos, k, t_final, caso, medicion):
+    """Arma las tres figuras (se muestran después con plt.show())."""
+    import matplotlib.pyplot as plt  # Se carga recién con la primera gráfica (abre antes la ventana)
+    # Graficar función característica (una sola evaluación vectorizada)
+    f = compilar_expresion(funcion_str, ("x",))
+    reales = [r.real for r, m in grupos if r.imag == 0]
+    centro = np.mean(reales) if reales else 0.0
+    radio = max(10.0, 1.5 * max((abs(r - centro) for r, m in grupos), default=0.0))
+    xs = np.linspace(centro - radio, centro + radio, 400)
+    f_vals = np.broadcast_to(f(xs), xs.shape)
+
+    plt.figure(figsize=(8,5))
+    plt.axhline(0, color="black")
+    plt.plot(xs, f_vals, label="f(m)")
+    plt.scatter(reales, np.zeros(len(reales)), color="red", s=80, label="Raíces reales")
+    plt.title("Función Característica")
+    plt.xlabel("m")
+    plt.ylabel("f(m)")
+    plt.grid(True)
+    plt.legend()
+
+    # Todas las raíces en el plano complejo (con los conjugados)
+    todas = [z for r, m in grupos for z in ([r] if r.imag == 0 else [r, r.conjugate()])]
+    plt.figure(figsize=(6,6))
+    plt.axhline(0, color="black")
+    plt.axvline(0, color="black")
+    plt.scatter([z.real for z in todas], [z.imag for z in todas], color="red", s=80)
+    for r, m in grupos:
+        if m > 1:
+            plt.annotate(f"×{m}", (r.real, r.imag), textcoords="offset points", xytext=(8, 8))
+    plt.title("Raíces en el plano complejo")
+    plt.xlabel("Re(m)")
+    plt.ylabel("Im(m)")
+    plt.grid(True)
+
+    # Gráfica de la solución diferencial x(t), evaluada de una vez sobre toda la malla
+    t_vals = np.linspace(0, t_final, 2000)
+    x_vals = polinomios.evaluar_solucion(grupos, k, t_vals)
+    medicion.contar("puntos_de_la_solución", len(t_vals))
+
+    plt.figure(figsize=(8,5))
+    plt.plot(t_vals, x_vals, label="x(t)")
+    plt.title(f"Solución de la Ecuación Diferencial ({caso})")
+    plt.xlabel("t")
+    plt.ylabel("x(t)")
+    plt.grid(True)
+    plt.legend()
+
+
+# ----------------- INTERFAZ (en una tk.Tk propia o en una tk.Toplevel del lanzador, main.py) -----------------
+class EcuacionApp:
+    def __init__(self, ventana):
+        self.ventana = ventana
+        self.ventana.title("Ecuación Característica (cualquier orden) + Ecuación Diferencial Completa")
+        self.ventana.geometry("600x750")
+
+        tk.Label(self.ventana, text="Función característica f(m) (polinomio en x, de cualquier grado):").pack()
+        self.entry_funcion = tk.Entry(self.ventana, width=50)
+        self.entry_funcion.insert(0, "2*x**2 + 8*x - 10")
+        self.entry_funcion.pack()
+
+        tk.Label(self.ventana, text="Condiciones iniciales x(0), x'(0), ... (opcional):").pack()
+        self.entry_ci = tk.Entry(self.ventana, width=50)
+        self.entry_ci.pack()
+
+        tk.Label(self.ventana, text="t final de la gráfica:").pack()
+        self.entry_tf = tk.Entry(self.ventana)
+        self.entry_tf.insert(0, "10")
+        self.entry_tf.pack()
+
+        tk.Label(self.ventana, text="Pasos de Newton para pulir las raíces:").pack()
+        self.entry_iter = tk.Entry(self.ventana)
+        self.entry_iter.insert(0, "3")
+        self.entry_iter.pack()
+
+        tk.Button(self.ventana, text="Calcular", command=self.calcular_todo,
+                  bg="lightblue").pack(pady=10)
+
+        self.texto_resultados = scrolledtext.ScrolledText(self.ventana, width=70, height=18)
+        self.texto_resultados.pack(padx=10, pady=10)
+
+        self.barra_estado = BarraEstado(self.ventana, "Ecuación característica")  # Tiempos de cálculo, texto y gráficas
+        self.barra_estado.pack(side="bottom", fill="x")
+
+    def calcular_todo(self):
+        try:
+            funcion_str = self.entry_funcion.get()
+            pasos = int(self.entry_iter.get())
+            t_final = float(self.entry_tf.get())
+            condiciones = self.entry_ci.get().strip()
+            medicion = self.barra_estado.medicion.iniciar(funcion=funcion_str, pasos_newton=pasos, condiciones=condiciones)
+
+            with medicion.fase("cálculo"):
+                # Coeficientes del polinomio (de cualquier grado) y todas sus raíces en una
+                # sola llamada de álgebra lineal (autovalores de la matriz compañera)
+                coefs = polinomios.coeficientes(funcion_str)
+                grupos = polinomios.resolver_caracteristica(coefs, pasos_newton=pasos)
+
+                # Constantes: con condiciones iniciales se resuelven; si no, todas valen 1
+                if condiciones:
+                    k = polinomios.constantes_iniciales(grupos, [float(v) for v in condiciones.split(",")])
+                else:
+                    k = np.ones(len(coefs) - 1)
+            medicion.parametros["grado"] = len(coefs) - 1
+            medicion.contar("raíces_distintas", len(grupos))
+
+            caso = clasificar(grupos)
+            with medicion.fase("texto"):
+                self.mostrar_texto(funcion_str, coefs, grupos, k, condiciones, caso)
+            with medicion.fase("gráfica"):
+                graficar(funcion_str, grupos, k, t_final, caso, medicion)
+            medicion.terminar()
+            self.barra_estado.actualizar()
+            import matplotlib.pyplot as plt
+            plt.show(block=False)  # Las tres figuras a la vez, sin detener la ventana
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Ocurrió un error: {e}")
+
+
+    def mostrar_texto(self, funcion_str, coefs, grupos, k, condiciones, caso):
+        self.texto_resultados.delete(1.0, tk.END)
+        self.texto_resultados.insert(tk.END, "=== ECUACIÓN CARACTERÍSTICA ===\n")
+        self.texto_resultados.insert(tk.END, f" {funcion_str} = 0   (grado {len(coefs) - 1})\n\n")
+
+        self.texto_resultados.insert(tk.END, "=== RAÍCES (matriz compañera + Newton) ===\n")
+        for r, m in grupos:
+            self.texto_resultados.insert(tk.END, f" {describir_raiz(r, m)}\n")
+
+        self.texto_resultados.insert(tk.END, f"\n-> {caso}\n")
+        self.texto_resultados.insert(tk.END, f"{polinomios.solucion_general(grupos)}\n")
+        if condiciones:
+            self.texto_resultados.insert(tk.END, "\nConstantes para las condiciones iniciales:\n")
+            self.texto_resultados.insert(tk.END, "".join(f" k{i} = {v:.6f}\n" for i, v in enumerate(k, start=1)))
 
         # Reconstrucción de la ecuación diferencial
-        texto_resultados.insert(tk.END, "\n=== ECUACIÓN DIFERENCIAL ORIGINAL ===\n")
-        texto_resultados.insert(tk.END, f"{a}x'' + {b}x' + {c}x = 0\n\n")
-
-        # Graficar función característica
-        xs = np.linspace(-10, 10, 400)
-        f_vals = [eval(funcion_str, {"x": x, "np": np}) for x in xs]
-
-        plt.figure(figsize=(8,5))
-        plt.axhline(0, color="black")
-        plt.plot(xs, f_vals, label="f(m)")
-        plt.scatter([m1, m2], [0, 0], color="red", s=80, label="Raíces encontradas")
-        plt.title("Función Característica")
-        plt.xlabel("m")
-        plt.ylabel("f(m)")
-        plt.grid(True)
-        plt.legend()
-        plt.show()
-
-        # Gráfica de iteraciones de Newton para m1
-        plt.figure(figsize=(8,5))
-        its_f = [eval(funcion_str, {"x": x, "np": np}) for x in its1]
-        plt.plot(its1, its_f, marker="o")
-        plt.axhline(0, color="black")
-        plt.title("Iteraciones Newton - Raíz m1")
-        plt.xlabel("x")
-        plt.ylabel("f(x)")
-        plt.grid(True)
-        plt.show()
-
-        # Gráfica de iteraciones de Newton para m2
-        plt.figure(figsize=(8,5))
-        its_f2 = [eval(funcion_str, {"x": x, "np": np}) for x in its2]
-        plt.plot(its2, its_f2, marker="o")
-        plt.axhline(0, color="black")
-        plt.title("Iteraciones Newton - Raíz m2")
-        plt.xlabel("x")
-        plt.ylabel("f(x)")
-        plt.grid(True)
-        plt.show()
-
-        # Gráfica de la solución diferencial x(t)
-        t_vals = np.linspace(0, 10, 300)
-
-        if abs(m1 - m2) < 1e-6:
-            m = m1
-            x_vals = np.exp(m * t_vals) + t_vals * np.exp(m * t_vals)
-        else:
-            x_vals = np.exp(m1 * t_vals) + np.exp(m2 * t_vals)
-
-        plt.figure(figsize=(8,5))
-        plt.plot(t_vals, x_vals, label="x(t)")
-        plt.title(f"Solución de la Ecuación Diferencial ({caso})")
-        plt.xlabel("t")
-        plt.ylabel("x(t)")
-        plt.grid(True)
-        plt.legend()
-        plt.show()
-
-    except Exception as e:
-        messagebox.showerror("Error", f"Ocurrió un error: {e}")
-
-
-# ----------------- INTERFAZ -----------------
-ventana = tk.Tk()
-ventana.title("Método de Newton + Ecuación Diferencial Completa")
-ventana.geometry("600x750")
-
-tk.Label(ventana, text="Función característica f(m):").pack()
-entry_funcion = tk.Entry(ventana, width=50)
-entry_funcion.insert(0, "2*x**2 + 8*x - 10")
-entry_funcion.pack()
-
-tk.Label(ventana, text="Derivada f'(m):").pack()
-entry_derivada = tk.Entry(ventana, width=50)
-entry_derivada.insert(0, "4*x + 8")
-entry_derivada.pack()
-
-tk.Label(ventana, text="Valor inicial x0 para raíz 1:").pack()
-entry_x0_1 = tk.Entry(ventana)
-entry_x0_1.insert(0, "-5")
-entry_x0_1.pack()
-
-tk.Label(ventana, text="Valor inicial x0 para raíz 2:").pack()
-entry_x0_2 = tk.Entry(ventana)
-entry_x0_2.insert(0, "5")
-entry_x0_2.pack()
-
-tk.Label(ventana, text="Iteraciones:").pack()
-entry_iter = tk.Entry(ventana)
-entry_iter.insert(0, "20")
-entry_iter.pack()
-
-tk.Button(ventana, text="Calcular", command=calcular_todo,
-          bg="lightblue").pack(pady=10)
-
-texto_resultados = scrolledtext.ScrolledText(ventana, width=70, height=18)
-texto_resultados.pack(padx=10, pady=10)
-
-ventana.mainloop()
+        self.texto_resultados.insert(tk.END, "\n=== ECUACIÓN DIFERENCIAL ORIGINAL ===\n")
+        self.texto_resultados.insert(tk.END, f"{polinomios.ecuacion_diferencial(coefs)}\n\n")
+
 
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = EcuacionApp(root)
+    root.mainloop()
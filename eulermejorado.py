@@ -1,8 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from expresiones import compilar_expresion
+import motor_edo
+import cache_edo
+import nucleos_edo
+from tabla_virtual import TablaVirtual
+from tarea_fondo import PanelProgreso
+from calculo_edo import CalculoEnVivo
+from instrumentacion import BarraEstado
 
 class EulerMejoradoApp:
     def __init__(self, root):
@@ -17,9 +25,15 @@ class EulerMejoradoApp:
         # Variables de control (Valores por defecto adaptados a t y x)
         self.func_str = tk.StringVar(value="t - x + 2") # Ejemplo: f(t,x)
         self.t0_val = tk.DoubleVar(value=0.0) # Antes x0
-        self.x0_val = tk.DoubleVar(value=2.0) # Antes y0
+        self.x0_val = tk.StringVar(value="2.0") # Antes y0 (para sistemas: "1, 0")
         self.h_val = tk.DoubleVar(value=0.1)
         self.tf_val = tk.DoubleVar(value=1.0) # Antes xf
+        # Sistemas de EDO: variables de estado ("x, v") y parámetros opcionales ("a=1, b=0.5")
+        self.estados_str = tk.StringVar(value="x")
+        self.params_str = tk.StringVar(value="")
+        # Heun explícito o regla del trapecio implícita (para ecuaciones rígidas, con Newton)
+        self.metodo_val = tk.StringVar(value="Heun (explícito)")
+        self.info_val = tk.StringVar(value="")
 
         # Grid de inputs
         ttk.Label(input_frame, text="dx/dt = f(t,x):").grid(row=0, column=0, sticky="e")
@@ -39,10 +53,32 @@ class EulerMejoradoApp:
 
         ttk.Button(input_frame, text="CALCULAR", command=self.calcular_heun).grid(row=0, column=6, rowspan=2, padx=20)
 
+        # Avance y cancelación del cálculo (corre en segundo plano)
+        self.progreso = PanelProgreso(input_frame)
+        self.progreso.barra.grid(row=2, column=6, padx=20)
+        self.progreso.boton.grid(row=3, column=6, padx=20)
+
+        ttk.Label(input_frame, text="Variables de estado:").grid(row=2, column=0, sticky="e")
+        ttk.Entry(input_frame, textvariable=self.estados_str, width=8).grid(row=2, column=1, sticky="w", padx=5, pady=5)
+
+        ttk.Label(input_frame, text="Parámetros:").grid(row=2, column=2, sticky="e")
+        ttk.Entry(input_frame, textvariable=self.params_str, width=25).grid(row=2, column=3, columnspan=3, sticky="w", padx=5, pady=5)
+
+        ttk.Label(input_frame, text="Método:").grid(row=3, column=0, sticky="e")
+        ttk.Combobox(input_frame, textvariable=self.metodo_val, state="readonly", width=18,
+                     values=("Heun (explícito)", "Trapecio implícito")).grid(row=3, column=1, sticky="w", padx=5, pady=5)
+
+        ttk.Label(input_frame, textvariable=self.info_val, font=("Arial", 8, "italic"),
+                  foreground="gray").grid(row=4, column=0, columnspan=7)
+
         #help_lbl = ttk.Label(input_frame, text="Sintaxis Python: t**2, sin(t), exp(x), etc. (Usar 't' y 'x')",
                             # font=("Arial", 8, "italic"), foreground="gray")
         #help_lbl.grid(row=2, column=0, columnspan=7, pady=5)
 
+        # Barra de estado: evaluaciones de f y tiempo de cálculo, tabla y gráfica del último cálculo
+        self.barra_estado = BarraEstado(root, "Euler mejorado")
+        self.barra_estado.pack(side="bottom", fill="x", padx=10)
+
         # --- Resultados ---
         results_frame = ttk.Frame(root)
         results_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -51,41 +87,32 @@ class EulerMejoradoApp:
         table_frame = ttk.LabelFrame(results_frame, text="Tabla de Iteraciones")
         table_frame.pack(side="left", fill="y", padx=5)
 
-        columns = ("n", "t", "x_aprox")
-        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=20)
-        self.tree.heading("n", text="Iter")
-        self.tree.heading("t", text="t (tiempo)")
-        self.tree.heading("x_aprox", text="x (Mejorado)")
-
-        self.tree.column("n", width=40, anchor="center")
-        self.tree.column("t", width=80, anchor="center")
-        self.tree.column("x_aprox", width=120, anchor="center")
-
-        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.tabla = TablaVirtual(table_frame, [("n", "Iter", 40, "{}"),
+                                                ("t", "t (tiempo)", 80, "{:.4f}"),
+                                                ("x_aprox", "x (Mejorado)", 120, "{:.6f}")])
 
         # Gráfica
         graph_frame = ttk.LabelFrame(results_frame, text="Gráfica")
         graph_frame.pack(side="right", fill="both", expand=True, padx=5)
 
-        self.fig, self.ax = plt.subplots(figsize=(5, 4), dpi=100)
+        # (Figure y no plt.subplots: así plt.show() de otra herramienta del lanzador no la abre aparte)
+        self.fig = Figure(figsize=(5, 4), dpi=100)
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
+        self.calculo = CalculoEnVivo(root, self.ax, self.canvas, self.tabla, self.progreso, self.info_val,
+                                     barra=self.barra_estado)
+
     def evaluar_funcion(self, expr, t, x):
         """ Evalúa f(t, x) """
-        allowed = {"sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "sqrt": np.sqrt, "log": np.log,
-                   "pi": np.pi, "e": np.e}
-        # IMPORTANTE: Diccionario adaptado para recibir t y x
-        return eval(expr, {"__builtins__": None}, {**allowed, 't': t, 'x': x})
+        # Compilada una sola vez (caché) y evaluada con t y x
+        return compilar_expresion(expr, ("t", "x"))(t, x)
 
     def calcular_heun(self):
-        # Limpieza
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.ax.clear()
+        # Un cálculo a la vez: mientras corre, se usa Cancelar
+        if self.calculo.ocupado():
+            return
 
         try:
             f_str = self.func_str.get()
@@ -93,6 +120,7 @@ class EulerMejoradoApp:
             x0 = self.x0_val.get()
             h = self.h_val.get()
             tf = self.tf_val.get()
+            self.info_val.set("")
 
             if h <= 0:
                 messagebox.showerror("Error", "h debe ser > 0")
@@ -101,52 +129,27 @@ class EulerMejoradoApp:
                 messagebox.showerror("Error", "t final debe ser mayor que t inicial")
                 return
 
-            # Inicialización
-            ts = [t0]
-            xs = [x0]
-            t = t0
-            x = x0
-            n = 0
-
-            self.tree.insert("", "end", values=(n, f"{t:.4f}", f"{x:.6f}"))
-
-            # --- BUCLE PRINCIPAL (Lógica Euler Mejorado con t y x) ---
-            while t < tf - 1e-9:
-                # 1. Calcular k1 (Pendiente al inicio) -> f(t_n, x_n)
-                k1 = self.evaluar_funcion(f_str, t, x)
-
-                # 2. Predecir el siguiente punto (Euler simple) -> x_star (antes y_star)
-                # x* = x_n + h * k1
-                x_star = x + h * k1
-
-                # 3. Calcular el tiempo siguiente
-                t_next = t + h
-
-                # 4. Calcular k2 (Pendiente al final estimado usando t_next y x_star)
-                k2 = self.evaluar_funcion(f_str, t_next, x_star)
-
-                # 5. Corrector (Promedio de pendientes)
-                pendiente_promedio = (k1 + k2) / 2
-                x_next = x + h * pendiente_promedio
-
-                # Actualizar valores reales
-                t = t_next
-                x = x_next
-                n += 1
-
-                # Guardar y mostrar
-                ts.append(t)
-                xs.append(x)
-                self.tree.insert("", "end", values=(n, f"{t:.4f}", f"{x:.6f}"))
-
-            # Graficar
-            self.ax.plot(ts, xs, 'g-o', label='Euler Mejorado (Heun)', markersize=4)
-            self.ax.set_title(f"Solución: {f_str}")
-            self.ax.set_xlabel("Tiempo (t)")
-            self.ax.set_ylabel("Estado (x)")
-            self.ax.grid(True, linestyle='--', alpha=0.7)
-            self.ax.legend()
-            self.canvas.draw()
+            # Compilar f(t,x) una sola vez antes del bucle (escalar o sistema)
+            f, x0, estados = motor_edo.preparar(f_str, self.estados_str.get(), x0, self.params_str.get())
+
+            # --- BUCLE PRINCIPAL (Lógica Euler Mejorado con t y x, en el núcleo sin GUI) ---
+            # Corre en segundo plano; la tabla y la gráfica (verde) se llenan a medida que avanza
+            titulo = f"Solución: {f_str}"
+            if self.metodo_val.get() == "Trapecio implícito":
+                # x_new = x + h/2 * (f(t, x) + f(t_new, x_new)), resuelto con Newton y jacobiano simbólico
+                parametros = motor_edo.leer_parametros(self.params_str.get())
+                self.calculo.completo(
+                    lambda progreso: motor_edo.resolver_implicito(f_str, "trapecio", t0, x0, h, tf, estados,
+                                                                  parametros, progreso=progreso),
+                    t0, tf, estados, 'g', 'Trapecio implícito', titulo,
+                    lambda est: f"Trapecio implícito: {est['iteraciones_newton']} iteraciones de Newton, "
+                                f"{est['jacobianos']} evaluaciones del jacobiano")
+            else:
+                parametros = motor_edo.leer_parametros(self.params_str.get())
+                self.calculo.paso_fijo(f, motor_edo.paso_heun, t0, x0, h, tf, estados,
+                                       'g', 'Euler Mejorado (Heun)', titulo,
+                                       clave=cache_edo.clave(f_str, "heun", t0, x0, h, estados, parametros),
+                                       nucleo=nucleos_edo.nucleo(f_str, "heun", estados, parametros))
 
         except Exception as e:
             messagebox.showerror("Error", f"Error de cálculo: {e}")
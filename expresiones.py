@@ -0,0 +1,300 @@
+import ast
+from functools import lru_cache
+
+import numpy as np
+
+# Funciones y constantes que el usuario puede escribir en una expresión.
+# Todas son de numpy, así que sirven igual con escalares que con arreglos.
+FUNCIONES_PERMITIDAS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "log": np.log, "log10": np.log10, "sqrt": np.sqrt,
+    "abs": np.abs,
+}
+CONSTANTES_PERMITIDAS = {"pi": np.pi, "e": np.e}
+
+_OPERADORES_BINARIOS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv)
+_OPERADORES_UNARIOS = (ast.UAdd, ast.USub)
+
+
+def _validar_nodo(nodo, variables):
+    """Recorre el árbol y rechaza todo lo que no sea aritmética con nombres permitidos."""
+    if isinstance(nodo, ast.Expression):
+        _validar_nodo(nodo.body, variables)
+    elif isinstance(nodo, ast.Constant):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float, complex)):
+            raise ValueError(f"Constante no permitida: {nodo.value!r}")
+    elif isinstance(nodo, ast.Name):
+        if nodo.id not in variables and nodo.id not in CONSTANTES_PERMITIDAS:
+            raise ValueError(f"Nombre no permitido: '{nodo.id}'")
+    elif isinstance(nodo, ast.BinOp):
+        if not isinstance(nodo.op, _OPERADORES_BINARIOS):
+            raise ValueError(f"Operador no permitido: {type(nodo.op).__name__}")
+        _validar_nodo(nodo.left, variables)
+        _validar_nodo(nodo.right, variables)
+    elif isinstance(nodo, ast.UnaryOp):
+        if not isinstance(nodo.op, _OPERADORES_UNARIOS):
+            raise ValueError(f"Operador no permitido: {type(nodo.op).__name__}")
+        _validar_nodo(nodo.operand, variables)
+    elif isinstance(nodo, ast.Call):
+        if nodo.keywords:
+            raise ValueError("No se permiten argumentos con nombre")
+        _validar_funcion(nodo.func)
+        for arg in nodo.args:
+            if isinstance(arg, ast.Starred):
+                raise ValueError("No se permiten argumentos con *")
+            _validar_nodo(arg, variables)
+    else:
+        raise ValueError(f"Elemento no permitido: {type(nodo).__name__}")
+
+
+def _validar_funcion(nodo):
+    """Acepta 'sin(...)' y también 'np.sin(...)' (sintaxis usada en las herramientas de Newton)."""
+    if isinstance(nodo, ast.Name) and nodo.id in FUNCIONES_PERMITIDAS:
+        return
+    if (isinstance(nodo, ast.Attribute) and isinstance(nodo.value, ast.Name)
+            and nodo.value.id == "np" and nodo.attr in FUNCIONES_PERMITIDAS):
+        return
+    raise ValueError(f"Función no permitida: {ast.unparse(nodo)}")
+
+
+class _Sustituir(ast.NodeTransformer):
+    """Reemplaza nombres por constantes (parámetros) o por X[i] (componentes del estado)."""
+
+    def __init__(self, constantes=(), estados=(), vector="_X"):
+        self.constantes = dict(constantes)
+        self.estados = {nombre: i for i, nombre in enumerate(estados)}
+        self.vector = vector
+
+    def visit_Name(self, nodo):
+        if nodo.id in self.constantes:
+            valor = float(self.constantes[nodo.id])
+            constante = ast.Constant(abs(valor))
+            return ast.UnaryOp(ast.USub(), constante) if valor < 0 else constante
+        if nodo.id in self.estados:
+            return ast.Subscript(ast.Name(self.vector, ast.Load()), ast.Constant(self.estados[nodo.id]), ast.Load())
+        return nodo
+
+
+def _comprobar_nombres(nombres):
+    for nombre in nombres:
+        if (not nombre.isidentifier() or nombre.startswith("_")
+                or nombre in FUNCIONES_PERMITIDAS or nombre in CONSTANTES_PERMITIDAS):
+            raise ValueError(f"Nombre de variable inválido: '{nombre}'")
+    if len(set(nombres)) != len(nombres):
+        raise ValueError("Hay nombres de variables repetidos")
+
+
+def _analizar(expr):
+    # x^2 se lee como x**2, igual que con sympify en las herramientas originales.
+    # Se cambia en el texto (no en el árbol) para que tenga la precedencia de **:
+    # 2*x^2 + 1 es 2*x**2 + 1 y no (2*x) ^ (2 + 1).
+    try:
+        return ast.parse(expr.replace("^", "**"), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Error de sintaxis en la función: {e.msg}") from None
+
+
+def _a_lambda(argumentos, cuerpo):
+    """La expresión ya es segura: se compila una sola vez como lambda de Python."""
+    entorno = {"__builtins__": {}, "np": np, "_apilar": _apilar, **FUNCIONES_PERMITIDAS, **CONSTANTES_PERMITIDAS}
+    fuente = f"lambda {', '.join(argumentos)}: ({cuerpo})"
+    return eval(compile(fuente, "<expresion>", "eval"), entorno)
+
+
+def _apilar(componentes):
+    """Lista de componentes -> arreglo (n,) o (n, N) si alguna componente es un arreglo."""
+    try:
+        return np.array(componentes, dtype=float)
+    except ValueError:
+        return np.array(np.broadcast_arrays(*componentes), dtype=float)
+
+
+def _arbol(expr, variables, constantes):
+    _comprobar_nombres(variables + tuple(n for n, _ in constantes))
+    arbol = _analizar(expr)
+    _validar_nodo(arbol, set(variables) | {n for n, _ in constantes})
+    return _Sustituir(constantes).visit(arbol.body)
+
+
+@lru_cache(maxsize=256)
+def _compilar(expr, variables, constantes):
+    return _a_lambda(variables, ast.unparse(_arbol(expr, variables, constantes)))
+
+
+@lru_cache(maxsize=256)
+def _compilar_sistema(expr, estados, variables, constantes):
+    _comprobar_nombres(estados + variables + tuple(n for n, _ in constantes))
+    arbol = _analizar(expr)
+    componentes = arbol.body.elts if isinstance(arbol.body, (ast.List, ast.Tuple)) else [arbol.body]
+    if len(componentes) != len(estados):
+        raise ValueError(f"La función tiene {len(componentes)} componentes pero hay {len(estados)} "
+                         f"variables de estado ({', '.join(estados)})")
+    permitidos = set(estados) | set(variables) | {n for n, _ in constantes}
+    sustituir = _Sustituir(constantes, estados)
+    cuerpos = []
+    for componente in componentes:
+        _validar_nodo(componente, permitidos)
+        cuerpos.append(ast.unparse(sustituir.visit(componente)))
+    # Todas las componentes se calculan en una sola llamada
+    return _a_lambda(variables + ("_X",), f"_apilar([{', '.join(cuerpos)}])")
+
+
+def normalizar_expresion(expr):
+    """Texto canónico de la expresión: "t-x +2" y "t - x + 2" quedan iguales."""
+    return ast.unparse(_analizar(expr.strip()))
+
+
+def _normalizar_constantes(constantes):
+    return tuple(sorted((constantes or {}).items()))
+
+
+def compilar_expresion(expr, variables=("t", "x"), constantes=None):
+    """Valida la expresión una vez y devuelve una función f(*variables) reutilizable.
+
+    'constantes' es un diccionario opcional {nombre: valor} de parámetros que
+    se reemplazan por su valor al compilar. El resultado queda en una caché LRU
+    con clave (texto, variables, constantes), así que compilar la misma
+    expresión otra vez no vuelve a analizarla.
+    """
+    return _compilar(expr.strip(), tuple(variables), _normalizar_constantes(constantes))
+
+
+def arbol_validado(expr, variables=("t", "x"), constantes=None):
+    """Árbol (ast) de la expresión ya validada, con los parámetros reemplazados por
+    su valor; para generar código a partir de ella (nucleos_edo.py)."""
+    return _arbol(expr.strip(), tuple(variables), _normalizar_constantes(constantes))
+
+
+def compilar_sistema(expr, estados, variables=("t",), constantes=None):
+    """Compila un lado derecho vectorial, p. ej. "[v, -(b*v + c*x)/a]" con estados ("x", "v").
+
+    Devuelve f(*variables, X), donde X[i] es el estado 'estados[i]' (X puede
+    ser (n,) o (n, N) para un ensamble), y el resultado es un arreglo con una
+    componente por estado calculado en una sola evaluación.
+    """
+    return _compilar_sistema(expr.strip(), tuple(estados), tuple(variables), _normalizar_constantes(constantes))
+
+
+# --- Derivadas simbólicas (SymPy se importa solo cuando se piden) ---
+
+# Equivalencias entre los nombres permitidos y las funciones de SymPy
+_NOMBRES_SYMPY = {
+    "sin": "sin", "cos": "cos", "tan": "tan",
+    "asin": "asin", "acos": "acos", "atan": "atan",
+    "arcsin": "asin", "arccos": "acos", "arctan": "atan",
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh",
+    "exp": "exp", "log": "log", "sqrt": "sqrt", "abs": "Abs",
+}
+
+
+class _QuitarNp(ast.NodeTransformer):
+    """np.sin(x) -> sin(x), para evaluar la expresión con funciones de SymPy."""
+
+    def visit_Attribute(self, nodo):
+        return ast.Name(nodo.attr, ast.Load())
+
+
+def _a_sympy(nodo, simbolos):
+    """Convierte un nodo ya validado en una expresión de SymPy."""
+    import sympy as sp
+    entorno = {"__builtins__": {}, **simbolos, "pi": sp.pi, "e": sp.E,
+               "log10": lambda v: sp.log(v, 10),
+               **{nombre: getattr(sp, nombre_sp) for nombre, nombre_sp in _NOMBRES_SYMPY.items()}}
+    fuente = ast.unparse(_QuitarNp().visit(nodo))
+    return sp.sympify(eval(compile(fuente, "<expresion>", "eval"), entorno))
+
+
+def expresion_sympy(expr, variables=("x",), constantes=None):
+    """Expresión de SymPy del texto, validado igual que en compilar_expresion
+    (mismos nombres, con o sin "np."). Devuelve (expresión, {nombre: símbolo})."""
+    import sympy as sp
+    variables = tuple(variables)
+    constantes = _normalizar_constantes(constantes)
+    _comprobar_nombres(variables + tuple(n for n, _ in constantes))
+    arbol = _analizar(expr.strip())
+    _validar_nodo(arbol, set(variables) | {n for n, _ in constantes})
+    simbolos = {n: sp.Symbol(n) for n in variables}
+    simbolos.update({n: sp.Float(v) for n, v in constantes})
+    return _a_sympy(arbol.body, simbolos), simbolos
+
+
+@lru_cache(maxsize=64)
+def _compilar_jacobiano(expr, estados, variables, constantes):
+    import sympy as sp
+    _comprobar_nombres(estados + variables + tuple(n for n, _ in constantes))
+    arbol = _analizar(expr)
+    es_lista = isinstance(arbol.body, (ast.List, ast.Tuple))
+    componentes = arbol.body.elts if es_lista else [arbol.body]
+    if len(componentes) != len(estados):
+        raise ValueError(f"La función tiene {len(componentes)} componentes pero hay {len(estados)} "
+                         f"variables de estado ({', '.join(estados)})")
+    permitidos = set(estados) | set(variables) | {n for n, _ in constantes}
+    simbolos = {n: sp.Symbol(n) for n in estados + variables}
+    simbolos.update({n: sp.Float(v) for n, v in constantes})
+    filas = []
+    for componente in componentes:
+        _validar_nodo(componente, permitidos)
+        fi = _a_sympy(componente, simbolos)
+        filas.append([sp.diff(fi, simbolos[e]) for e in estados])
+
+    argumentos = [simbolos[n] for n in variables + estados]
+    if len(estados) == 1 and not es_lista:
+        return sp.lambdify(argumentos, filas[0][0], "numpy")
+    matriz = sp.lambdify(argumentos, sp.Matrix(filas), "numpy")
+    return lambda *args: np.array(matriz(*args[:-1], *args[-1]), dtype=float)
+
+
+def compilar_jacobiano(expr, estados=("x",), variables=("t",), constantes=None):
+    """Deriva simbólicamente el lado derecho respecto de los estados y lo compila con numpy.
+
+    Devuelve J(*variables, x): un escalar df/dx si la expresión es escalar, o la
+    matriz (n, n) con J[i][j] = df_i/dx_j para un sistema "[...]" .
+    """
+    return _compilar_jacobiano(expr.strip(), tuple(estados), tuple(variables), _normalizar_constantes(constantes))
+
+
+@lru_cache(maxsize=64)
+def _compilar_con_derivada(expr, variable, constantes):
+    import sympy as sp
+    _comprobar_nombres((variable,) + tuple(n for n, _ in constantes))
+    arbol = _analizar(expr)
+    _validar_nodo(arbol, {variable} | {n for n, _ in constantes})
+    simbolos = {variable: sp.Symbol(variable)}
+    simbolos.update({n: sp.Float(v) for n, v in constantes})
+    f = _a_sympy(arbol.body, simbolos)
+    df = sp.diff(f, simbolos[variable])
+    # Una sola función para el valor y la derivada: las subexpresiones comunes
+    # (p. ej. exp(x) en f y en f') se calculan una vez (cse=True)
+    return sp.lambdify([simbolos[variable]], (f, df), "numpy", cse=True), str(df)
+
+
+def compilar_con_derivada(expr, variable="x", constantes=None):
+    """Compila f y su derivada (obtenida con SymPy) en una sola pasada.
+
+    Devuelve fdf(x) -> (f(x), f'(x)); funciona con escalares y con arreglos.
+    """
+    return _compilar_con_derivada(expr.strip(), variable, _normalizar_constantes(constantes))[0]
+
+
+def derivada_texto(expr, variable="x", constantes=None):
+    """Derivada simbólica de la expresión como texto, p. ej. para mostrarla."""
+    return _compilar_con_derivada(expr.strip(), variable, _normalizar_constantes(constantes))[1]
+
+
+def derivada_coincide(expr, derivada, puntos, variable="x", tol=1e-6):
+    """Compara una derivada escrita a mano con la automática en los puntos dados.
+
+    Devuelve True si coinciden (error relativo menor que tol) en todos los puntos
+    donde ambas son finitas.
+    """
+    puntos = np.asarray(puntos, dtype=float)
+    _, automatica = compilar_con_derivada(expr, variable)(puntos)
+    a_mano = compilar_expresion(derivada, (variable,))(puntos)
+    automatica = np.broadcast_to(np.asarray(automatica, dtype=float), puntos.shape)
+    a_mano = np.broadcast_to(np.asarray(a_mano, dtype=float), puntos.shape)
+    finitos = np.isfinite(automatica) & np.isfinite(a_mano)
+    return bool(np.all(np.abs(automatica[finitos] - a_mano[finitos])
+                       <= tol * np.maximum(1.0, np.abs(automatica[finitos]))))
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import motor_edo
+import nucleos_edo
+
+# Integración por bloques con memoria constante. En lugar de acumular toda la
+# trayectoria en listas, se generan bloques de tamaño fijo (ts, xs) y, si se
+# pide, se escriben directamente en un archivo .npy mapeado en memoria que se
+# puede reanudar desde el último bloque escrito.
+#
+# Uso:  python flujo_edo.py "t - x + 2" --x0 2 --h 1e-6 --tf 100 -o trayectoria.npy
+#
+# El archivo tiene forma (pasos + 1, 1 + n_estados): columna 0 = t, resto = x.
+# Se lee sin copiar con leer_trayectoria() (np.load con mmap_mode="r").
+# Con una sola ecuación, Euler, Heun y RK4 usan los núcleos generados de nucleos_edo.py.
+
+TAM_BLOQUE = 65536
+
+
+numero_pasos = motor_edo.numero_pasos  # La misma cuenta que motor_edo.integrar
+
+
+def integrar_por_bloques(f, paso, t0, x0, h, tf, tam_bloque=TAM_BLOQUE, n_inicio=0, tam_inicial=None,
+                         nucleo=None):
+    """Genera bloques (ts, xs) de hasta 'tam_bloque' puntos.
+
+    El tiempo se calcula como t0 + n·h (sin acumular error), así que se puede
+    continuar desde cualquier punto n_inicio con su estado x0. Con 'tam_inicial'
+    los bloques empiezan chicos y se duplican hasta tam_bloque, para que el
+    primer resultado llegue enseguida.
+
+    Con 'nucleo' (nucleos_edo.nucleo) cada bloque se avanza en una sola llamada
+    al bucle generado; si el núcleo da un error numérico, ese bloque y los
+    siguientes se calculan con 'paso', con flotantes de numpy (que dan inf o nan
+    donde corresponda, ver motor_edo.flotantes_numpy).
+    """
+    if h <= 0:
+        raise ValueError("El paso h debe ser positivo.")
+    n_total = numero_pasos(t0, tf, h)
+    x = float(x0) if nucleo is not None else motor_edo.flotantes_numpy(t0, x0)[1]
+    n = n_inicio
+    tam = tam_inicial or tam_bloque
+    while n <= n_total:
+        cuantos = min(tam, n_total + 1 - n)
+        tam = min(2 * tam, tam_bloque)
+        ts = t0 + h * np.arange(n, n + cuantos, dtype=float)
+        xs = np.empty((cuantos,) + np.shape(x0), dtype=float)
+        if nucleo is not None:
+            try:
+                x = nucleo.bucle(t0, h, n, x, xs, n_total)
+            except nucleos_edo.ERRORES:
+                nucleo = None
+                x = np.float64(x)
+        if nucleo is None:
+            for i in range(cuantos):
+                xs[i] = x
+                if n + i < n_total:
+                    x = paso(f, ts[i], x, h)
+        n += cuantos
+        yield ts, xs
+
+
+def trayectoria_por_bloques(f, paso, t0, x0, h, tf, tam_inicial=256, tam_bloque=TAM_BLOQUE, previa=None,
+                            nucleo=None):
+    """Reserva los arreglos completos (ts, xs) y devuelve también un generador que
+    los va llenando por bloques; el generador produce cuántos puntos ya están listos.
+
+    'previa' es una trayectoria (ts, xs) ya calculada con los mismos t0, x0 y h
+    (p. ej. hasta un tf menor): sus puntos se copian y se continúa desde el último.
+    'nucleo' se pasa a integrar_por_bloques.
+    """
+    total = numero_pasos(t0, tf, h) + 1
+    ts = np.empty(total, dtype=float)
+    xs = np.empty((total,) + np.shape(x0), dtype=float)
+    copiados = min(len(previa[0]), total) if previa is not None else 0
+    if copiados:
+        ts[:copiados] = previa[0][:copiados]
+        xs[:copiados] = previa[1][:copiados]
+        x0 = xs[copiados - 1].copy()
+
+    def llenar():
+        n = max(copiados - 1, 0)  # El último punto copiado se vuelve a escribir igual
+        if copiados:
+            yield copiados
+        for ts_bloque, xs_bloque in integrar_por_bloques(f, paso, t0, x0, h, tf, tam_bloque, n_inicio=n,
+                                                          tam_inicial=tam_inicial, nucleo=nucleo):
+            ts[n:n + len(ts_bloque)] = ts_bloque
+            xs[n:n + len(ts_bloque)] = xs_bloque
+            n += len(ts_bloque)
+            yield n
+
+    return ts, xs, llenar()
+
+
+def _ruta_progreso(ruta):
+    return ruta + ".progreso.json"
+
+
+def integrar_a_npy(ruta, expr, metodo, t0, x0, h, tf, estados=("x",), parametros=None,
+                   tam_bloque=TAM_BLOQUE, reanudar=True):
+    """Escribe la trayectoria completa en un .npy mapeado en memoria, bloque por bloque.
+
+    Junto al archivo se guarda '<ruta>.progreso.json' con los datos del problema
+    y los puntos ya escritos; con reanudar=True una corrida interrumpida sigue
+    desde el último bloque. Devuelve la cantidad de puntos escritos.
+    """
+    paso = motor_edo.obtener_paso(metodo)
+    f = motor_edo.compilar_rhs(expr, estados, parametros)
+    x0 = np.asarray(x0, dtype=float)
+    dimension = int(np.size(x0))
+    if dimension != len(estados):
+        raise ValueError(f"Se esperaban {len(estados)} valores iniciales y se dieron {dimension}")
+    if len(estados) == 1 and not expr.strip().startswith("["):
+        x0 = float(x0.reshape(-1)[0])
+
+    problema = {"expresion": expr, "metodo": metodo.strip().lower(), "t0": float(t0), "h": float(h),
+                "tf": float(tf), "estados": list(estados), "parametros": parametros or {},
+                "x0": np.atleast_1d(x0).tolist()}
+    total = numero_pasos(problema["t0"], problema["tf"], problema["h"]) + 1
+    ruta_progreso = _ruta_progreso(ruta)
+
+    escritos = 0
+    if reanudar and os.path.exists(ruta) and os.path.exists(ruta_progreso):
+        with open(ruta_progreso, encoding="utf-8") as archivo:
+            progreso = json.load(archivo)
+        if progreso["problema"] != problema:
+            raise ValueError(f"'{ruta}' contiene otro problema; use reanudar=False para sobrescribirlo")
+        salida = np.lib.format.open_memmap(ruta, mode="r+")
+        escritos = progreso["escritos"]
+    else:
+        salida = np.lib.format.open_memmap(ruta, mode="w+", dtype=np.float64, shape=(total, 1 + dimension))
+
+    if escritos >= total:
+        return total
+    if escritos:
+        # Se continúa desde el último punto guardado (se vuelve a escribir igual)
+        n_inicio = escritos - 1
+        x_inicio = salida[n_inicio, 1:].copy()
+        if np.ndim(x0) == 0:
+            x_inicio = float(x_inicio[0])
+    else:
+        n_inicio, x_inicio = 0, x0
+
+    n = n_inicio
+    nucleo = nucleos_edo.nucleo(expr, metodo, estados, parametros) if np.ndim(x_inicio) == 0 else None
+    for ts, xs in integrar_por_bloques(f, paso, problema["t0"], x_inicio, problema["h"], problema["tf"],
+                                       tam_bloque, n_inicio, nucleo=nucleo):
+        salida[n:n + len(ts), 0] = ts
+        salida[n:n + len(ts), 1:] = xs.reshape(len(ts), dimension)
+        n += len(ts)
+        salida.flush()
+        with open(ruta_progreso, "w", encoding="utf-8") as archivo:
+            json.dump({"problema": problema, "escritos": n, "total": total}, archivo)
+    del salida
+    return n
+
+
+def leer_trayectoria(ruta):
+    """Devuelve (ts, xs) como vistas del archivo mapeado en memoria (sin copiar)."""
+    datos = np.load(ruta, mmap_mode="r")
+    xs = datos[:, 1] if datos.shape[1] == 2 else datos[:, 1:]
+    return datos[:, 0], xs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Integra dx/dt = f(t,x) por bloques y escribe un .npy en disco.")
+    parser.add_argument("expresion")
+    parser.add_argument("--metodo", default="rk4", help="euler, heun o rk4")
+    parser.add_argument("--estados", default="x", help="variables de estado, p. ej. 'x, v'")
+    parser.add_argument("--parametros", default="", help="p. ej. 'a=1, b=0.5'")
+    parser.add_argument("--t0", type=float, default=0.0)
+    parser.add_argument("--x0", required=True, help="valor inicial (o lista '1, 0' para sistemas)")
+    parser.add_argument("--h", type=float, required=True)
+    parser.add_argument("--tf", type=float, required=True)
+    parser.add_argument("--bloque", type=int, default=TAM_BLOQUE, help="puntos por bloque")
+    parser.add_argument("--desde-cero", action="store_true", help="no reanudar una corrida anterior")
+    parser.add_argument("-o", "--salida", default="trayectoria.npy")
+    args = parser.parse_args(argv)
+
+    try:
+        escritos = integrar_a_npy(args.salida, args.expresion, args.metodo, args.t0,
+                                  motor_edo.leer_vector(args.x0), args.h, args.tf,
+                                  motor_edo.leer_nombres(args.estados),
+                                  motor_edo.leer_parametros(args.parametros),
+                                  args.bloque, reanudar=not args.desde_cero)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"{escritos} puntos -> {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import numpy as np
+
+# Capa de dibujo para resultados grandes: en lugar de mandar a matplotlib un
+# punto (y un marcador) por cada paso, se reduce la curva a lo que el lienzo
+# puede mostrar (mínimo y máximo por píxel) y se vuelve a reducir al hacer zoom.
+
+MAX_MARCADORES = 200  # Por encima de esto los marcadores se vuelven una mancha
+MAX_TRAPECIOS = 2000  # Por encima de esto un trapecio mide menos de un píxel
+
+
+def decimar_min_max(ts, xs, n_pixeles, t_min=None, t_max=None):
+    """Reduce (ts, xs) a ~4 puntos por píxel conservando la forma de la curva.
+
+    Para cada grupo de puntos que cae en un píxel se conservan el primero, el
+    último, el mínimo y el máximo, así los picos no desaparecen. Si se dan
+    t_min/t_max solo se procesa ese tramo (más un punto a cada lado).
+    'ts' debe estar ordenado.
+    """
+    inicio = 0 if t_min is None else max(0, int(np.searchsorted(ts, t_min)) - 1)
+    fin = len(ts) if t_max is None else min(len(ts), int(np.searchsorted(ts, t_max, side="right")) + 1)
+    ts = ts[inicio:fin]
+    xs = xs[inicio:fin]
+
+    n_pixeles = max(1, int(n_pixeles))
+    if len(ts) <= 4 * n_pixeles:
+        return ts, xs
+
+    tam = len(ts) // n_pixeles
+    m = n_pixeles * tam
+    bloques = xs[:m].reshape(n_pixeles, tam)
+    # Solo cuentan los valores finitos (una corrida que diverge deja grupos
+    # enteros de nan/inf); en esos grupos argmin/argmax dan el primero
+    finitos = np.isfinite(bloques)
+    base = np.arange(n_pixeles) * tam
+    indices = np.concatenate([
+        base,                                   # primero de cada grupo
+        base + tam - 1,                         # último de cada grupo
+        base + np.argmin(np.where(finitos, bloques, np.inf), axis=1),
+        base + np.argmax(np.where(finitos, bloques, -np.inf), axis=1),
+        np.arange(m, len(ts)),                  # resto que no llena un grupo
+    ])
+    indices = np.unique(indices)
+    return ts[indices], xs[indices]
+
+
+class LineaDecimada:
+    """Línea de matplotlib que muestra una versión reducida de (ts, xs) y se recalcula con el zoom."""
+
+    def __init__(self, ax, ts, xs, color="r", marker="o", markersize=4, label=None):
+        self.ax = ax
+        self.ts = np.asarray(ts, dtype=float)
+        self.xs = np.asarray(xs, dtype=float)
+        self.marker = marker
+        self.linea, = ax.plot([], [], color=color, linestyle="-", marker=marker,
+                              markersize=markersize, label=label)
+        self._actualizar(None, completo=True)
+        ax.update_datalim(np.column_stack([self.linea.get_xdata(), self.linea.get_ydata()]))
+        ax.autoscale_view()
+        ax.callbacks.connect("xlim_changed", self._actualizar)
+
+    def _actualizar(self, ax, completo=False):
+        ancho = self.ax.get_window_extent().width or 1000
+        t_min, t_max = (None, None) if completo else self.ax.get_xlim()
+        ts, xs = decimar_min_max(self.ts, self.xs, ancho, t_min, t_max)
+        self.linea.set_data(ts, xs)
+        # Marcadores solo cuando los puntos están lo bastante separados para verse
+        self.linea.set_marker(self.marker if len(ts) <= MAX_MARCADORES else "None")
+
+
+def graficar_trayectoria(ax, ts, xs, color="r", marker="o", markersize=4, label=None):
+    """Equivalente a ax.plot(ts, xs, 'r-o') pero con costo acotado por el ancho del lienzo."""
+    return LineaDecimada(ax, ts, xs, color=color, marker=marker, markersize=markersize, label=label)
+
+
+def graficar_estados(ax, ts, xs, estados, color="r", marker="o", label=None):
+    """Grafica una trayectoria escalar, o todas las componentes si xs tiene forma (M, n)."""
+    if np.ndim(xs) == 1:
+        return [graficar_trayectoria(ax, ts, xs, color=color, marker=marker, label=label)]
+    colores = [color] + [f"C{i}" for i in range(len(estados))]
+    return [graficar_trayectoria(ax, ts, xs[:, i], color=colores[i % len(colores)], marker=marker,
+                                 label=f"{nombre} ({label})" if label else nombre)
+            for i, nombre in enumerate(estados)]
+
+
+class GraficaEnVivo:
+    """Dibuja una trayectoria mientras se calcula, redibujando solo las líneas (blitting).
+
+    Guarda el mínimo y el máximo de cada columna de píxeles de [t0, tf], así
+    cada bloque nuevo cuesta lo que mide el bloque y no toda la trayectoria.
+    Solo se redibuja la figura completa cuando los datos salen del eje y.
+
+    Al terminar el cálculo (completo, cancelado o con error) quien la usa llama
+    a terminar(): las líneas animadas no se dibujan con canvas.draw(), así que
+    sin eso lo calculado desaparecería en el próximo dibujo completo.
+    """
+
+    def __init__(self, ax, canvas, t0, tf, colores):
+        self.ax = ax
+        self.canvas = canvas
+        self.t0 = t0
+        self.tf = tf
+        self.ancho = max(1, int(ax.get_window_extent().width or 500))
+        self.minimos = np.full((self.ancho, len(colores)), np.nan)
+        self.maximos = np.full((self.ancho, len(colores)), np.nan)
+        self.centros = t0 + (np.arange(self.ancho) + 0.5) * (tf - t0) / self.ancho
+        ax.set_xlim(t0, tf)
+        self.lineas = [ax.plot([], [], color=c, animated=True)[0] for c in colores]
+        self._ylim_fijado = False
+        self._redibujar_todo()
+
+    def agregar(self, ts, xs):
+        if len(ts) == 0:
+            return
+        xs = np.where(np.isfinite(xs), xs, np.nan).reshape(len(ts), -1)
+        pixeles = np.clip(((ts - self.t0) / (self.tf - self.t0) * self.ancho).astype(int), 0, self.ancho - 1)
+        inicios = np.concatenate([[0], np.flatnonzero(np.diff(pixeles)) + 1])
+        ids = pixeles[inicios]
+        self.minimos[ids] = np.fmin(self.minimos[ids], np.fmin.reduceat(xs, inicios, axis=0))
+        self.maximos[ids] = np.fmax(self.maximos[ids], np.fmax.reduceat(xs, inicios, axis=0))
+        self._actualizar_lineas()
+
+        if np.all(np.isnan(self.minimos)):
+            return
+        y_min, y_max = np.nanmin(self.minimos), np.nanmax(self.maximos)
+        inferior, superior = self.ax.get_ylim()
+        if y_min < inferior or y_max > superior or not self._ylim_fijado:
+            margen = 0.1 * (y_max - y_min) or 0.5
+            self.ax.set_ylim(y_min - margen, y_max + margen)
+            self._ylim_fijado = True
+            self._redibujar_todo()
+        else:
+            self._blit()
+
+    def terminar(self):
+        """Deja las líneas como artistas normales (ya no se agregan datos); lo
+        calculado queda en el eje hasta el próximo ax.clear()."""
+        for linea in self.lineas:
+            linea.set_animated(False)
+        self.lineas = []
+
+    def _actualizar_lineas(self):
+        llenos = np.flatnonzero(~np.isnan(self.minimos[:, 0]))
+        t = np.repeat(self.centros[llenos], 2)
+        for j, linea in enumerate(self.lineas):
+            linea.set_data(t, np.column_stack([self.minimos[llenos, j], self.maximos[llenos, j]]).ravel())
+
+    def _redibujar_todo(self):
+        self.canvas.draw()
+        self.fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._blit()
+
+    def _blit(self):
+        self.canvas.restore_region(self.fondo)
+        for linea in self.lineas:
+            self.ax.draw_artist(linea)
+        self.canvas.blit(self.ax.bbox)
+
+
+def dibujar_trapecios(ax, x_vals, y_vals, color="red", alpha=0.4):
+    """Dibuja todos los trapecios como una sola colección de polígonos.
+
+    Si hay más trapecios de los que se pueden distinguir, se rellena el área bajo
+    la poligonal (reducida por píxel) como un único polígono.
+    """
+    x_vals = np.asarray(x_vals, dtype=float)
+    y_vals = np.asarray(y_vals, dtype=float)
+    if len(x_vals) - 1 > MAX_TRAPECIOS:
+        xs, ys = decimar_min_max(x_vals, y_vals, MAX_TRAPECIOS // 4)
+        return ax.fill_between(xs, 0, ys, color=color, alpha=alpha)
+
+    # Vértices (n, 4, 2): (x_i, 0), (x_i, y_i), (x_i+1, y_i+1), (x_i+1, 0)
+    ceros = np.zeros(len(x_vals) - 1)
+    vertices = np.stack([
+        np.column_stack([x_vals[:-1], ceros]),
+        np.column_stack([x_vals[:-1], y_vals[:-1]]),
+        np.column_stack([x_vals[1:], y_vals[1:]]),
+        np.column_stack([x_vals[1:], ceros]),
+    ], axis=1)
+    from matplotlib.collections import PolyCollection  # Trapecios no carga matplotlib al abrir
+    coleccion = PolyCollection(vertices, facecolors=color, edgecolors=color, alpha=alpha)
+    ax.add_collection(coleccion)
+    ax.autoscale_view()
+    return coleccion
@@ -0,0 +1,162 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from tkinter import ttk, filedialog, messagebox
+
+# Medición de cada cálculo de las ventanas sin un perfilador externo: cuenta
+# evaluaciones de f e iteraciones de Newton, toma el tiempo de cada fase
+# (cálculo, tabla, gráfica) y, si se pide, el pico de memoria con tracemalloc.
+# Cada ventana muestra el resumen en su barra de estado y puede guardar el
+# informe completo en JSON con el botón "Informe...".
+#
+# La variable de entorno INSTRUMENTACION elige el modo:
+#   "1" (por defecto)  contadores y tiempos (costo despreciable)
+#   "memoria"          además el pico de memoria (tracemalloc hace más lento el cálculo)
+#   "0"                nada: envolver() devuelve f sin tocar y las fases no miden
+
+MODO = os.environ.get("INSTRUMENTACION", "1").strip().lower()
+
+
+class Medicion:
+    """Contadores, tiempos por fase y pico de memoria de un cálculo."""
+
+    def __init__(self, herramienta, activa=None, memoria=None):
+        self.herramienta = herramienta
+        self.activa = MODO != "0" if activa is None else activa
+        self.memoria = MODO == "memoria" if memoria is None else memoria
+        self.iniciar()
+
+    def iniciar(self, **parametros):
+        """Empieza una medición nueva; los parámetros se guardan en el informe."""
+        self.parametros = parametros
+        self.contadores = {}
+        self.fases = {}
+        self.memoria_pico = None
+        self.estado = "en curso"
+        self._inicio = time.perf_counter()
+        self.duracion = None
+        self._traza_propia = False
+        if self.activa and self.memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._traza_propia = True
+            tracemalloc.reset_peak()
+        return self
+
+    def terminar(self, estado="completo"):
+        self.estado = estado
+        self.duracion = time.perf_counter() - self._inicio
+        if self.activa and self.memoria and tracemalloc.is_tracing():
+            self.memoria_pico = tracemalloc.get_traced_memory()[1]
+            if self._traza_propia:
+                tracemalloc.stop()
+                self._traza_propia = False
+        return self
+
+    # --- Contadores ---
+
+    def contar(self, clave, n=1):
+        if self.activa:
+            self.contadores[clave] = self.contadores.get(clave, 0) + n
+
+    def agregar(self, estadisticas):
+        """Suma los valores enteros de un diccionario de estadísticas (p. ej. el de dormand_prince)."""
+        for clave, valor in estadisticas.items():
+            if isinstance(valor, int) and not isinstance(valor, bool):
+                self.contar(clave, valor)
+
+    def envolver(self, f, clave="evaluaciones"):
+        """f que cuenta sus llamadas en 'clave'."""
+        if not self.activa:
+            return f
+
+        def f_contada(*args):
+            self.contadores[clave] = self.contadores.get(clave, 0) + 1
+            return f(*args)
+        return f_contada
+
+    # --- Tiempos ---
+
+    @contextmanager
+    def fase(self, nombre):
+        """Suma el tiempo del bloque a la fase 'nombre'."""
+        if not self.activa:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases[nombre] = self.fases.get(nombre, 0.0) + time.perf_counter() - inicio
+
+    def iterar(self, nombre, iterable):
+        """Recorre 'iterable' sumando a la fase 'nombre' solo el tiempo de producir cada valor."""
+        iterador = iter(iterable)
+        while True:
+            with self.fase(nombre):
+                try:
+                    valor = next(iterador)
+                except StopIteration:
+                    return
+            yield valor
+
+    # --- Resultados ---
+
+    def resumen(self):
+        """Una línea para la barra de estado."""
+        if not self.activa:
+            return ""
+        partes = [f"{valor:,}".replace(",", " ") + " " + clave.replace("_", " ")
+                  for clave, valor in self.contadores.items()]
+        partes += [f"{nombre} {segundos * 1e3:.1f} ms" for nombre, segundos in self.fases.items()]
+        if self.memoria_pico is not None:
+            partes.append(f"pico {self.memoria_pico / 2**20:.1f} MiB")
+        if self.estado != "completo":
+            partes.append(self.estado)
+        return " · ".join(partes)
+
+    def informe(self):
+        return {
+            "herramienta": self.herramienta,
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "estado": self.estado,
+            "parametros": self.parametros,
+            "duracion": self.duracion,
+            "fases": dict(self.fases),
+            "contadores": dict(self.contadores),
+            "memoria_pico": self.memoria_pico,
+        }
+
+    def guardar(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self.informe(), archivo, indent=2, ensure_ascii=False, default=str)
+
+
+class BarraEstado(ttk.Frame):
+    """Línea de estado con el resumen de la última medición y un botón para guardar su informe."""
+
+    def __init__(self, master, herramienta, **kwargs):
+        super().__init__(master, **kwargs)
+        self.medicion = Medicion(herramienta)
+        self.etiqueta = ttk.Label(self, text="", anchor="w", font=("Arial", 8), foreground="gray")
+        self.etiqueta.pack(side="left", fill="x", expand=True, padx=5)
+        self.boton = ttk.Button(self, text="Informe...", command=self.guardar_informe, state="disabled")
+        if self.medicion.activa:
+            self.boton.pack(side="right", padx=5)
+
+    def actualizar(self):
+        self.etiqueta.configure(text=self.medicion.resumen())
+        if self.medicion.duracion is not None:
+            self.boton.configure(state="normal")
+
+    def guardar_informe(self):
+        ruta = filedialog.asksaveasfilename(title="Guardar informe", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if not ruta:
+            return
+        try:
+            self.medicion.guardar(ruta)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar el informe: {e}")
@@ -0,0 +1,156 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+import motor_edo
+
+# Modo por lotes (sin ventanas): lee muchos problemas dx/dt = f(t,x) de un archivo
+# JSON o CSV, los resuelve con motor_edo y escribe todas las trayectorias.
+#
+# Uso:  python lote_edo.py problemas.json -o resultados.csv
+#
+# Cada problema tiene los campos: expresion, t0, x0, h, tf y metodo (euler, heun, rk4, rk45,
+# o los implícitos euler_implicito, trapecio y bdf2 para ecuaciones rígidas).
+# Con rk45 el paso es adaptativo: h es opcional y se pueden dar rtol y atol.
+#
+# Con --muestras N cada trayectoria se escribe en N tiempos equiespaciados de t0
+# a tf, evaluando la salida densa del método (salida_densa.py): un h grueso da
+# una curva fina sin evaluar f de más.
+
+CAMPOS = ("expresion", "t0", "x0", "h", "tf", "metodo")
+
+
+def leer_problemas(ruta):
+    """Devuelve una lista de diccionarios con los campos de cada problema."""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".json":
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        if isinstance(datos, dict):
+            datos = datos.get("problemas", [datos])
+    elif extension == ".csv":
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            datos = list(csv.DictReader(archivo))
+    else:
+        raise ValueError(f"Formato de entrada no soportado: '{extension}' (use .json o .csv)")
+
+    problemas = []
+    for i, datos_problema in enumerate(datos):
+        metodo = str(datos_problema.get("metodo") or "rk4").strip().lower()
+        opcionales = ("metodo", "h") if metodo == "rk45" else ("metodo",)
+        faltantes = [c for c in CAMPOS if c not in opcionales and c not in datos_problema]
+        if faltantes:
+            raise ValueError(f"Problema {i}: faltan los campos {', '.join(faltantes)}")
+        h = datos_problema.get("h")
+        problema = {
+            "expresion": str(datos_problema["expresion"]),
+            "t0": float(datos_problema["t0"]),
+            "x0": float(datos_problema["x0"]),
+            "h": float(h) if h not in (None, "") else None,
+            "tf": float(datos_problema["tf"]),
+            "metodo": metodo,
+        }
+        if metodo == "rk45":
+            problema["rtol"] = float(datos_problema.get("rtol") or 1e-6)
+            problema["atol"] = float(datos_problema.get("atol") or 1e-9)
+        problemas.append(problema)
+    return problemas
+
+
+def resolver_lote(problemas, muestras=None):
+    """Resuelve cada problema; los que fallan guardan el mensaje en 'error'.
+
+    Con 'muestras' la trayectoria se evalúa en esa cantidad de tiempos equiespaciados.
+    """
+    resultados = []
+    for problema in problemas:
+        resultado = dict(problema)
+        try:
+            if muestras:
+                solucion = motor_edo.resolver_continuo(
+                    problema["expresion"], problema["metodo"], problema["t0"], problema["x0"], problema["h"],
+                    problema["tf"], problema.get("rtol", 1e-6), problema.get("atol", 1e-9))
+                resultado.update(solucion.estadisticas)
+                ts, xs = solucion.muestrear(muestras)
+            elif problema["metodo"] == "rk45":
+                ts, xs, estadisticas = motor_edo.resolver_adaptativo(
+                    problema["expresion"], problema["t0"], problema["x0"], problema["tf"],
+                    problema["rtol"], problema["atol"], h0=problema["h"])
+                resultado.update(estadisticas)
+            else:
+                ts, xs = motor_edo.resolver(problema["expresion"], problema["metodo"],
+                                            problema["t0"], problema["x0"], problema["h"], problema["tf"])
+            resultado["t"] = ts
+            resultado["x"] = xs
+        except Exception as e:
+            resultado["error"] = str(e)
+        resultados.append(resultado)
+    return resultados
+
+
+def escribir_resultados(resultados, ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".json":
+        salida = []
+        for resultado in resultados:
+            fila = dict(resultado)
+            if "t" in fila:
+                fila["t"] = fila["t"].tolist()
+                fila["x"] = fila["x"].tolist()
+            salida.append(fila)
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(salida, archivo)
+    elif extension == ".csv":
+        # Formato largo: una fila por paso de cada problema
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["problema", *CAMPOS, "n", "t", "x"])
+            for i, resultado in enumerate(resultados):
+                if "error" in resultado:
+                    continue
+                datos = [i, *(resultado[c] for c in CAMPOS)]
+                for n, (t, x) in enumerate(zip(resultado["t"], resultado["x"])):
+                    escritor.writerow([*datos, n, repr(float(t)), repr(float(x))])
+    elif extension == ".npz":
+        arreglos = {}
+        for i, resultado in enumerate(resultados):
+            if "error" not in resultado:
+                arreglos[f"t_{i}"] = resultado["t"]
+                arreglos[f"x_{i}"] = resultado["x"]
+        np.savez(ruta, **arreglos)
+    else:
+        raise ValueError(f"Formato de salida no soportado: '{extension}' (use .json, .csv o .npz)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve por lotes problemas dx/dt = f(t,x) sin interfaz gráfica.")
+    parser.add_argument("entrada", help="archivo .json o .csv con los problemas")
+    parser.add_argument("-o", "--salida", default="resultados.json", help="archivo .json, .csv o .npz de salida")
+    parser.add_argument("--muestras", type=int, default=None,
+                        help="escribir cada solución en esta cantidad de tiempos equiespaciados (salida densa)")
+    args = parser.parse_args(argv)
+    if args.muestras is not None and args.muestras < 2:
+        print("Error: --muestras debe ser al menos 2", file=sys.stderr)
+        return 2
+
+    try:
+        problemas = leer_problemas(args.entrada)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    resultados = resolver_lote(problemas, args.muestras)
+    escribir_resultados(resultados, args.salida)
+
+    fallidos = [(i, r["error"]) for i, r in enumerate(resultados) if "error" in r]
+    for i, mensaje in fallidos:
+        print(f"Problema {i}: {mensaje}", file=sys.stderr)
+    print(f"{len(resultados) - len(fallidos)} de {len(resultados)} problemas resueltos -> {args.salida}")
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
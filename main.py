@@ -1,49 +1,59 @@
-import os
-import sys
-import subprocess
+import importlib
 import tkinter as tk
 from tkinter import messagebox
 
-# Ruta del intérprete Python actual
-PY = sys.executable
-
-# Nombres de archivo (asume que están en la misma carpeta que este archivo)
-TRAP_FILE = "Metodo_Trapecios.py"
-NEWTON_FILE = "metodonewton.py"
-ECUA_FILE ="ecuacionewton.py"
-EULER_FILE = "EULER.py"
-EULER_UP_FILE = "eulermejorado.py"
-RK4_FILE = "RK4.py"
-
-def run_script(filename):
-    """Lanza un script en un nuevo proceso."""
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
-    if not os.path.exists(path):
-        messagebox.showerror("Error", f"No se encontró {filename}\nRuta esperada: {path}")
+# Todas las herramientas corren en este mismo proceso, cada una en su propia
+# ventana hija (tk.Toplevel): numpy, matplotlib y SymPy se importan una sola
+# vez y se comparten. Cada herramienta se construye la primera vez que se abre;
+# al cerrarla solo se oculta, así la próxima vez aparece al instante y con los
+# datos que tenía.
+
+# (módulo, clase de la ventana); los módulos están en la misma carpeta que este archivo
+TRAP_APP = ("Metodo_Trapecios", "TrapeciosApp")
+NEWTON_APP = ("metodonewton", "NewtonApp")
+ECUA_APP = ("ecuacionewton", "EcuacionApp")
+EULER_APP = ("EULER", "EulerApp")
+EULER_UP_APP = ("eulermejorado", "EulerMejoradoApp")
+RK4_APP = ("RK4", "RK4App")
+
+_ventanas = {}  # módulo -> Toplevel ya construida
+
+def abrir_herramienta(herramienta):
+    """Muestra la ventana de la herramienta; la primera vez la construye."""
+    modulo, clase = herramienta
+    ventana = _ventanas.get(modulo)
+    if ventana is not None and ventana.winfo_exists():
+        ventana.deiconify()
+        ventana.lift()
+        ventana.focus_force()
         return
+    ventana = tk.Toplevel()
     try:
-        # Popen para que el launcher no quede bloqueado
-        subprocess.Popen([PY, path], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        getattr(importlib.import_module(modulo), clase)(ventana)
     except Exception as e:
-        messagebox.showerror("Error", f"No se pudo lanzar {filename}:\n{e}")
+        ventana.destroy()
+        messagebox.showerror("Error", f"No se pudo abrir {modulo}:\n{e}")
+        return
+    ventana.protocol("WM_DELETE_WINDOW", ventana.withdraw)
+    _ventanas[modulo] = ventana
 
 def abrir_trapecios():
-    run_script(TRAP_FILE)
+    abrir_herramienta(TRAP_APP)
 
 def abrir_newton():
-    run_script(NEWTON_FILE)
+    abrir_herramienta(NEWTON_APP)
 
 def abrir_ecua():
-    run_script(ECUA_FILE)
+    abrir_herramienta(ECUA_APP)
 
 def abrir_euler():
-    run_script(EULER_FILE)
+    abrir_herramienta(EULER_APP)
 
 def abrir_euler_up():
-    run_script(EULER_UP_FILE)
+    abrir_herramienta(EULER_UP_APP)
 
 def abrir_rk4():
-    run_script(RK4_FILE)
+    abrir_herramienta(RK4_APP)
 
 # Interfaz gráfica simple
 def crear_ventana():
@@ -62,7 +72,7 @@ def crear_ventana():
     tk.Button(btn_frame, text="Euler Mejorado", width=22, command=abrir_euler_up, bg="#e5aaef").grid(row=2, column=0, padx=5, pady=5)
     tk.Button(btn_frame, text="Método RK4", width=22, command=abrir_rk4, bg="#f67878").grid(row=2, column=1, padx=5, pady=5)
 
-    tk.Label(root, text="(Se abrirán en ventanas separadas)", font=("Segoe UI", 8)).pack(pady=6)
+    tk.Label(root, text="(Se abren en ventanas separadas dentro del mismo programa)", font=("Segoe UI", 8)).pack(pady=6)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,121 +1,242 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
 import numpy as np
-import matplotlib.pyplot as plt
-
-def newton_raphson():
-    try:
-        # Leer entradas del usuario
-        funcion_str = entry_funcion.get()
-        derivada_str = entry_derivada.get()
-        x0 = float(entry_x0.get())
-        iter_user = int(entry_iter.get())  # Iteraciones que solicita el usuario
-
-        # Definir f(x) y f'(x) usando eval
-        def f(x):
-            return eval(funcion_str, {"x": x, "np": np, 
-                                      "sin": np.sin, "cos": np.cos, "exp": np.exp,
-                                      "log": np.log, "sqrt": np.sqrt})
-
-        def fprima(x):
-            return eval(derivada_str, {"x": x, "np": np,
-                                       "sin": np.sin, "cos": np.cos, "exp": np.exp,
-                                       "log": np.log, "sqrt": np.sqrt})
-
-        # Limpiar consola
-        texto_resultados.delete(1.0, tk.END)
-        texto_resultados.insert(tk.END, "Iteraciones del método de Newton-Raphson:\n\n")
-
-        iteraciones = [x0]
-        convergio_en = None
-
-        for i in range(iter_user):
-            fx = f(x0)
-            dfx = fprima(x0)
-
-            if dfx == 0:
-                messagebox.showerror("Error", "La derivada es cero. No se puede continuar.")
-                return
-
-            x1 = x0 - fx / dfx
-            iteraciones.append(x1)
-
-            texto_resultados.insert(
-                tk.END,
-                f"Iteración {i+1}: x = {x1:.6f}, f(x) = {fx:.6f}, f'(x) = {dfx:.6f}\n"
-            )
-
-            # Si la función llega cerca de 0, detener
-            if abs(f(x1)) < 1e-6:
-                convergio_en = i + 1
-                texto_resultados.insert(tk.END, "\nRaíz encontrada antes de las iteraciones solicitadas.\n")
-                break
-
-            x0 = x1
-
-        # Si convergió antes
-        if convergio_en is not None and convergio_en < iter_user:
-            texto_resultados.insert(
-                tk.END,
-                f"\nSolo se necesitaron {convergio_en} iteraciones para llegar a la raíz aproximada.\n"
-            )
-        else:
-            texto_resultados.insert(
-                tk.END,
-                f"\nSe realizaron las {iter_user} iteraciones solicitadas.\n"
-            )
-
-        texto_resultados.insert(tk.END, f"\nRaíz aproximada: {x1:.6f}")
-
-        # --- Gráfica ---
-        x_vals = np.linspace(x1 - 5, x1 + 5, 400)
-        y_vals = [f(x) for x in x_vals]
-        y_deriv = [fprima(x) for x in x_vals]
-
-        plt.figure(figsize=(8,5))
-        plt.axhline(0, color='black', lw=1)
-        plt.plot(x_vals, y_vals, label=f'f(x) = {funcion_str}', color='blue')
-        plt.plot(x_vals, y_deriv, label="f'(x)", color='orange', linestyle='--')
-        plt.scatter(iteraciones, [f(x) for x in iteraciones], color='red', label='Iteraciones')
-        plt.scatter(x1, f(x1), color='green', s=80, label='Raíz aproximada')
-        plt.title("Método de Newton-Raphson")
-        plt.xlabel("x")
-        plt.ylabel("f(x)")
-        plt.legend()
-        plt.grid(True)
-        plt.show()
-
-    except Exception as e:
-        messagebox.showerror("Error", f"Ocurrió un error: {e}")
-
-# --- Interfaz gráfica ---
-ventana = tk.Tk()
-ventana.title("Método de Newton-Raphson")
-ventana.geometry("550x600")
-
-tk.Label(ventana, text="Función f(x):").pack()
-entry_funcion = tk.Entry(ventana, width=50)
-entry_funcion.insert(0, "x**3 - 6*x**2 + 9*x")  # Ejemplo
-entry_funcion.pack()
-
-tk.Label(ventana, text="Derivada f'(x):").pack()
-entry_derivada = tk.Entry(ventana, width=50)
-entry_derivada.insert(0, "3*x**2 - 12*x + 9")  # Ejemplo
-entry_derivada.pack()
-
-tk.Label(ventana, text="Valor inicial x0:").pack()
-entry_x0 = tk.Entry(ventana)
-entry_x0.insert(0, "2.5")
-entry_x0.pack()
-
-tk.Label(ventana, text="¿Cuántas iteraciones desea realizar?").pack()
-entry_iter = tk.Entry(ventana)
-entry_iter.insert(0, "10")
-entry_iter.pack()
-
-tk.Button(ventana, text="Calcular", command=newton_raphson, bg="lightblue").pack(pady=10)
-
-texto_resultados = scrolledtext.ScrolledText(ventana, width=65, height=15)
-texto_resultados.pack(padx=10, pady=10)
-
-ventana.mainloop()
\ No newline at end of file
+from expresiones import compilar_con_derivada, derivada_coincide, derivada_texto
+from tarea_fondo import TareaEnFondo, PanelProgreso
+from raices import todas_las_raices
+from instrumentacion import BarraEstado
+
+def pasos_newton(fdf, x0, iteraciones, tol=1e-6):
+    """Genera (i, x1, f(x0), f'(x0)) por iteración; se detiene cuando |f(x1)| < tol.
+
+    fdf(x) devuelve (f(x), f'(x)): una sola evaluación por iteración, y el
+    valor en x1 que sirve para el criterio de parada se reutiliza en la siguiente.
+    """
+    fx, dfx = fdf(x0)
+    for i in range(iteraciones):
+        if dfx == 0:
+            raise ZeroDivisionError("La derivada es cero. No se puede continuar.")
+
+        x1 = x0 - fx / dfx
+        fx1, dfx1 = fdf(x1)
+        yield i + 1, x1, fx, dfx
+
+        # Si la función llega cerca de 0, detener
+        if abs(fx1) < tol:
+            return
+
+        x0, fx, dfx = x1, fx1, dfx1
+
+def preparar_derivada(funcion_str, derivada_str, puntos):
+    """Compila f junto con su derivada automática. Si se escribió una derivada,
+    solo se usa para comprobar la automática (y se avisa si no coincide)."""
+    fdf = compilar_con_derivada(funcion_str)
+    if derivada_str.strip() and not derivada_coincide(funcion_str, derivada_str, puntos):
+        messagebox.showwarning(
+            "Derivada",
+            f"La derivada escrita no coincide con la calculada: f'(x) = {derivada_texto(funcion_str)}.\n"
+            "Se usa la calculada."
+        )
+    return fdf
+
+# --- Interfaz gráfica (en una tk.Tk propia o en una tk.Toplevel del lanzador, main.py) ---
+class NewtonApp:
+    def __init__(self, ventana):
+        self.ventana = ventana
+        self.ventana.title("Método de Newton-Raphson")
+        self.ventana.geometry("550x730")
+
+        tk.Label(self.ventana, text="Función f(x):").pack()
+        self.entry_funcion = tk.Entry(self.ventana, width=50)
+        self.entry_funcion.insert(0, "x**3 - 6*x**2 + 9*x")  # Ejemplo
+        self.entry_funcion.pack()
+
+        tk.Label(self.ventana, text="Derivada f'(x) (opcional, solo para comprobar; se calcula sola):").pack()
+        self.entry_derivada = tk.Entry(self.ventana, width=50)
+        self.entry_derivada.insert(0, "3*x**2 - 12*x + 9")  # Ejemplo
+        self.entry_derivada.pack()
+
+        tk.Label(self.ventana, text="Valor inicial x0:").pack()
+        self.entry_x0 = tk.Entry(self.ventana)
+        self.entry_x0.insert(0, "2.5")
+        self.entry_x0.pack()
+
+        tk.Label(self.ventana, text="¿Cuántas iteraciones desea realizar?").pack()
+        self.entry_iter = tk.Entry(self.ventana)
+        self.entry_iter.insert(0, "10")
+        self.entry_iter.pack()
+
+        tk.Button(self.ventana, text="Calcular", command=self.newton_raphson, bg="lightblue").pack(pady=10)
+
+        tk.Label(self.ventana, text="Intervalo para buscar todas las raíces (a, b):").pack()
+        self.entry_intervalo = tk.Entry(self.ventana)
+        self.entry_intervalo.insert(0, "-10, 10")
+        self.entry_intervalo.pack()
+
+        tk.Button(self.ventana, text="Todas las raíces", command=self.buscar_todas, bg="lightgreen").pack(pady=5)
+
+        self.progreso = PanelProgreso(self.ventana, largo=300)  # Avance y botón para cancelar
+        self.progreso.barra.pack()
+        self.progreso.boton.pack(pady=5)
+
+        self.texto_resultados = scrolledtext.ScrolledText(self.ventana, width=65, height=15)
+        self.texto_resultados.pack(padx=10, pady=10)
+
+        self.barra_estado = BarraEstado(self.ventana, "Newton-Raphson")  # Evaluaciones, iteraciones y tiempos del último cálculo
+        self.barra_estado.pack(side="bottom", fill="x")
+
+    def newton_raphson(self):
+        if self.progreso.ocupado():  # Un cálculo a la vez (mientras corre, se usa Cancelar)
+            return
+
+        try:
+            # Leer entradas del usuario
+            funcion_str = self.entry_funcion.get()
+            derivada_str = self.entry_derivada.get()
+            x0 = float(self.entry_x0.get())
+            iter_user = int(self.entry_iter.get())  # Iteraciones que solicita el usuario
+
+            # Compilar f(x) y f'(x) (automática) una sola vez (se validan y quedan en caché)
+            fdf = preparar_derivada(funcion_str, derivada_str, x0 + np.linspace(-1, 1, 9))
+            medicion = self.barra_estado.medicion.iniciar(funcion=funcion_str, x0=x0, iteraciones=iter_user)
+
+            # Limpiar consola
+            self.texto_resultados.delete(1.0, tk.END)
+            self.texto_resultados.insert(tk.END, "Iteraciones del método de Newton-Raphson:\n\n")
+
+            iteraciones = [x0]
+
+            # Las iteraciones corren en segundo plano y se muestran por lotes a medida que salen
+            def trabajo(tarea):
+                lote = []
+                for paso in medicion.iterar("cálculo", pasos_newton(medicion.envolver(fdf), x0, iter_user)):
+                    lote.append(paso)
+                    if len(lote) == 500:
+                        tarea.avanzar(paso[0] / iter_user)
+                        yield lote
+                        lote = []
+                yield lote
+
+            def al_recibir(lote):
+                medicion.contar("iteraciones_newton", len(lote))
+                with medicion.fase("texto"):
+                    self.texto_resultados.insert(tk.END, "".join(
+                        f"Iteración {i}: x = {x1:.6f}, f(x) = {fx:.6f}, f'(x) = {dfx:.6f}\n" for i, x1, fx, dfx in lote))
+                iteraciones.extend(x1 for _, x1, _, _ in lote)
+
+            def al_terminar(cancelada):
+                if cancelada:
+                    self.texto_resultados.insert(tk.END, "\nCálculo cancelado.\n")
+                    self.informar(medicion, "cancelado")
+                    return
+                self.mostrar_resultado(funcion_str, fdf, iteraciones, iter_user, medicion)
+
+            def al_fallar(e):
+                self.informar(medicion, "error")
+                if isinstance(e, ZeroDivisionError):
+                    messagebox.showerror("Error", str(e))
+                else:
+                    messagebox.showerror("Error", f"Ocurrió un error: {e}")
+
+            tarea = TareaEnFondo(self.ventana, trabajo, al_recibir=al_recibir, al_terminar=al_terminar, al_fallar=al_fallar)
+            self.progreso.vincular(tarea).iniciar()
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Ocurrió un error: {e}")
+
+    def informar(self, medicion, estado="completo"):
+        """Cierra la medición y muestra su resumen en la barra de estado."""
+        medicion.terminar(estado)
+        self.barra_estado.actualizar()
+
+    def mostrar_resultado(self, funcion_str, fdf, iteraciones, iter_user, medicion):
+        try:
+            x1 = iteraciones[-1]
+            f_iter, _ = fdf(np.array(iteraciones))
+            f_iter = np.broadcast_to(f_iter, (len(iteraciones),))
+            convergio_en = len(iteraciones) - 1 if abs(f_iter[-1]) < 1e-6 else None
+            if convergio_en is not None:
+                self.texto_resultados.insert(tk.END, "\nRaíz encontrada antes de las iteraciones solicitadas.\n")
+
+            # Si convergió antes
+            if convergio_en is not None and convergio_en < iter_user:
+                self.texto_resultados.insert(
+                    tk.END,
+                    f"\nSolo se necesitaron {convergio_en} iteraciones para llegar a la raíz aproximada.\n"
+                )
+            else:
+                self.texto_resultados.insert(
+                    tk.END,
+                    f"\nSe realizaron las {iter_user} iteraciones solicitadas.\n"
+                )
+
+            self.texto_resultados.insert(tk.END, f"\nRaíz aproximada: {x1:.6f}")
+
+            # --- Gráfica ---
+            with medicion.fase("gráfica"):
+                import matplotlib.pyplot as plt  # Se carga recién con la primera gráfica (abre antes la ventana)
+                x_vals = np.linspace(x1 - 5, x1 + 5, 400)
+                y_vals, y_deriv = (np.broadcast_to(v, x_vals.shape) for v in fdf(x_vals))
+
+                plt.figure(figsize=(8,5))
+                plt.axhline(0, color='black', lw=1)
+                plt.plot(x_vals, y_vals, label=f'f(x) = {funcion_str}', color='blue')
+                plt.plot(x_vals, y_deriv, label="f'(x)", color='orange', linestyle='--')
+                plt.scatter(iteraciones, f_iter, color='red', label='Iteraciones')
+                plt.scatter(x1, f_iter[-1], color='green', s=80, label='Raíz aproximada')
+                plt.title("Método de Newton-Raphson")
+                plt.xlabel("x")
+                plt.ylabel("f(x)")
+                plt.legend()
+                plt.grid(True)
+            self.informar(medicion)
+            plt.show(block=False)
+
+        except Exception as e:
+            self.informar(medicion, "error")
+            messagebox.showerror("Error", f"Ocurrió un error: {e}")
+
+    def buscar_todas(self):
+        """Siembra Newton en todo el intervalo [a, b] y muestra todas las raíces reales."""
+        try:
+            funcion_str = self.entry_funcion.get()
+            limites = self.entry_intervalo.get().split(",")
+            if len(limites) != 2:
+                raise ValueError("Escriba el intervalo como 'a, b'.")
+            a, b = (float(v) for v in limites)
+            fdf = preparar_derivada(funcion_str, self.entry_derivada.get(), np.linspace(a, b, 9))
+            medicion = self.barra_estado.medicion.iniciar(funcion=funcion_str, intervalo=[a, b])
+
+            # Todas las semillas se iteran juntas (una evaluación vectorizada por pasada)
+            with medicion.fase("cálculo"):
+                raices, multiplicidades = todas_las_raices(medicion.envolver(fdf, "pasadas_vectorizadas"), a, b)
+
+            with medicion.fase("texto"):
+                self.texto_resultados.delete(1.0, tk.END)
+                self.texto_resultados.insert(tk.END, f"Raíces reales en [{a}, {b}]: {len(raices)}\n\n")
+                for r, m in zip(raices, multiplicidades):
+                    self.texto_resultados.insert(tk.END, f"x = {r:.10f}   (multiplicidad {m})\n")
+
+            # --- Gráfica ---
+            with medicion.fase("gráfica"):
+                import matplotlib.pyplot as plt
+                x_vals = np.linspace(a, b, 800)
+                plt.figure(figsize=(8,5))
+                plt.axhline(0, color='black', lw=1)
+                plt.plot(x_vals, np.broadcast_to(fdf(x_vals)[0], x_vals.shape), label=f'f(x) = {funcion_str}', color='blue')
+                plt.scatter(raices, np.zeros(len(raices)), color='green', s=80, label='Raíces')
+                plt.title("Todas las raíces en el intervalo")
+                plt.xlabel("x")
+                plt.ylabel("f(x)")
+                plt.legend()
+                plt.grid(True)
+            self.informar(medicion)
+            plt.show(block=False)
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Ocurrió un error: {e}")
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = NewtonApp(root)
+    root.mainloop()
@@ -0,0 +1,498 @@
+import numpy as np
+from expresiones import compilar_expresion, compilar_sistema, compilar_jacobiano
+from salida_densa import Hermite, DensaDormandPrince, hermite_desde_puntos
+
+# Núcleo de los métodos para dx/dt = f(t, x), sin Tk ni matplotlib.
+# Lo usan las ventanas (EULER.py, eulermejorado.py, RK4.py) y el modo por lotes (lote_edo.py).
+# El estado x puede ser un escalar o un vector (sistemas y ecuaciones de orden superior):
+# los pasos solo usan aritmética de numpy, así que sirven igual para ambos.
+#
+# Cada paso acepta la pendiente inicial k1 = f(t, x) ya calculada: así la
+# salida densa (integrar_continuo) guarda las pendientes sin evaluar f de más.
+
+
+def paso_euler(f, t, x, h, k1=None):
+    """Un paso de Euler: x_new = x + h * f(t, x)"""
+    return x + h * (f(t, x) if k1 is None else k1)
+
+
+def paso_heun(f, t, x, h, k1=None):
+    """Un paso de Euler Mejorado (Heun): predictor de Euler + promedio de pendientes."""
+    if k1 is None:
+        k1 = f(t, x)                # 1. Pendiente al inicio
+    x_star = x + h * k1             # 2. Predictor (Euler simple)
+    k2 = f(t + h, x_star)           # 3. Pendiente al final estimado
+    return x + h * ((k1 + k2) / 2)  # 4. Corrector (promedio de pendientes)
+
+
+def paso_rk4(f, t, x, h, k1=None):
+    """Un paso de Runge-Kutta 4: promedio ponderado de cuatro pendientes."""
+    if k1 is None:
+        k1 = f(t, x)                       # Pendiente al inicio
+    k2 = f(t + 0.5 * h, x + 0.5 * h * k1)  # Punto medio usando k1
+    k3 = f(t + 0.5 * h, x + 0.5 * h * k2)  # Punto medio usando k2
+    k4 = f(t + h, x + h * k3)              # Pendiente al final
+    return x + (h / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+PASOS = {"euler": paso_euler, "heun": paso_heun, "rk4": paso_rk4}
+
+
+# --- Malla de tiempos ---
+# Con paso fijo el tiempo del punto n es t0 + n·h (no se acumula t = t + h, que
+# arrastra error de redondeo y puede dar un paso de más o de menos), así que la
+# cantidad de pasos se sabe de antemano y los arreglos se reservan completos.
+
+def numero_pasos(t0, tf, h):
+    """Cantidad de pasos de t0 a tf (el último punto queda en t >= tf)."""
+    if h <= 0:
+        raise ValueError("El paso h debe ser positivo.")
+    return max(0, int(np.ceil((tf - t0) / h - 1e-9)))
+
+
+def tiempos(t0, h, pasos):
+    """Los pasos + 1 tiempos t0 + n·h de la malla."""
+    return t0 + h * np.arange(pasos + 1, dtype=float)
+
+
+def flotantes_numpy(t0, x0):
+    """(t0, x0) como flotantes de numpy: np.float64, o un arreglo float64 para x0.
+
+    Con flotantes de Python, x**0.5 con x < 0 da un número complejo (y falla al
+    guardarlo en el arreglo de estados); con los de numpy da nan, como las demás
+    operaciones fuera de su dominio, y la trayectoria sigue con nan desde ahí.
+    """
+    return np.float64(t0), np.asarray(x0, dtype=float)[()]
+
+
+def integrar(f, paso, t0, x0, h, tf, dtype=np.float64):
+    """Aplica 'paso' desde t0 hasta tf y devuelve los arreglos (ts, xs).
+
+    xs se reserva de una vez con forma (pasos + 1,) + forma de x0. Con
+    dtype=np.float32 ocupa la mitad (para ensambles muy grandes); los pasos
+    se siguen calculando en float64 y solo se guardan redondeados.
+    """
+    pasos = numero_pasos(t0, tf, h)
+    t0, x = flotantes_numpy(t0, x0)
+    xs = np.empty((pasos + 1,) + np.shape(x), dtype=dtype)
+    for n in range(pasos):
+        xs[n] = x
+        x = paso(f, t0 + h * n, x, h)
+    xs[pasos] = x
+    return tiempos(t0, h, pasos), xs
+
+
+def integrar_final(f, paso, t0, x0, h, tf):
+    """Como integrar(), sin guardar la trayectoria: devuelve (pasos, t_final, x_final)."""
+    pasos = numero_pasos(t0, tf, h)
+    t0, x = flotantes_numpy(t0, x0)
+    for n in range(pasos):
+        x = paso(f, t0 + h * n, x, h)
+    return pasos, t0 + h * pasos, x
+
+
+def integrar_continuo(f, paso, t0, x0, h, tf):
+    """Como integrar(), pero devuelve una solución continua (salida_densa.Hermite).
+
+    La pendiente f(t_n, x_n) de cada punto es la k1 que el paso calcula de todos
+    modos; solo el último punto cuesta una evaluación más de f.
+    """
+    pasos = numero_pasos(t0, tf, h)
+    t0, x = flotantes_numpy(t0, x0)
+    xs = np.empty((pasos + 1,) + np.shape(x), dtype=float)
+    pendientes = np.empty_like(xs)
+    for n in range(pasos):
+        t = t0 + h * n
+        k1 = f(t, x)
+        xs[n] = x
+        pendientes[n] = k1
+        x = paso(f, t, x, h, k1)
+    ts = tiempos(t0, h, pasos)
+    xs[pasos] = x
+    pendientes[pasos] = f(ts[-1], x)
+    return Hermite(ts, xs, pendientes)
+
+
+def euler(f, t0, x0, h, tf):
+    return integrar(f, paso_euler, t0, x0, h, tf)
+
+
+def heun(f, t0, x0, h, tf):
+    return integrar(f, paso_heun, t0, x0, h, tf)
+
+
+def rk4(f, t0, x0, h, tf):
+    return integrar(f, paso_rk4, t0, x0, h, tf)
+
+
+# --- Dormand–Prince 5(4) adaptativo (RK45) ---
+# Tablero de Butcher; la última etapa se evalúa en (t + h, x_nuevo), así que
+# se reutiliza como primera etapa del paso siguiente (FSAL).
+_DP_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+# Diferencia entre los pesos de orden 5 y los de orden 4: estima el error local.
+_DP_E = (71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+
+def _norma_error(error, x, x_nuevo, rtol, atol):
+    """Norma RMS del error escalada por las tolerancias (<= 1 significa paso aceptado)."""
+    escala = atol + rtol * np.maximum(np.abs(x), np.abs(x_nuevo))
+    return float(np.sqrt(np.mean(np.square(np.asarray(error) / escala))))
+
+
+def dormand_prince(f, t0, x0, tf, rtol=1e-6, atol=1e-9, h0=None, max_pasos=1_000_000, progreso=None,
+                   al_aceptar=None):
+    """Integra con Dormand–Prince 5(4) ajustando el paso según el error estimado.
+
+    En lugar de un paso fijo h recibe tolerancias relativa y absoluta; 'h0' es
+    un paso inicial opcional. Devuelve (ts, xs, estadisticas), donde
+    estadisticas cuenta los pasos aceptados, rechazados y las evaluaciones de f.
+    'progreso(fraccion)' se llama cada tanto (si lanza una excepción, se corta).
+    'al_aceptar(k)' recibe las 7 etapas de cada paso aceptado (para la salida densa).
+    """
+    if rtol <= 0 or atol < 0:
+        raise ValueError("Las tolerancias deben ser positivas.")
+    if tf <= t0:
+        raise ValueError("t final debe ser mayor que t inicial")
+
+    t, x = flotantes_numpy(t0, x0)
+    k1 = f(t, x)
+    evaluaciones = 1
+
+    if h0 is None:
+        # Paso inicial: que el primer incremento sea ~1% del tamaño de x
+        escala = atol + rtol * np.abs(x)
+        d0 = np.sqrt(np.mean(np.square(np.asarray(x) / escala)))
+        d1 = np.sqrt(np.mean(np.square(np.asarray(k1) / escala)))
+        h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    else:
+        h = h0
+    h = min(abs(h), tf - t0)
+
+    ts = [t0]
+    xs = [x]
+    aceptados = 0
+    rechazados = 0
+
+    while t < tf - 1e-12 * max(1.0, abs(tf)):
+        if aceptados + rechazados >= max_pasos:
+            raise ValueError(f"Se superó el máximo de {max_pasos} pasos (¿tolerancia demasiado exigente?)")
+        if t + h > tf:
+            h = tf - t
+
+        k = [k1]
+        for i in range(1, 7):
+            x_etapa = x + h * sum(a * kj for a, kj in zip(_DP_A[i], k) if a != 0.0)
+            k.append(f(t + _DP_C[i] * h, x_etapa))
+        evaluaciones += 6
+        x_nuevo = x_etapa  # La etapa 7 se evalúa justo en la solución de orden 5
+        error = h * sum(e * kj for e, kj in zip(_DP_E, k) if e != 0.0)
+        norma = _norma_error(error, x, x_nuevo, rtol, atol)
+
+        if norma <= 1.0:
+            if al_aceptar is not None:
+                al_aceptar(k)
+            t = t + h
+            x = x_nuevo
+            k1 = k[6]  # FSAL
+            ts.append(t)
+            xs.append(x)
+            aceptados += 1
+            if progreso is not None and aceptados % 64 == 0:
+                progreso((t - t0) / (tf - t0))
+            factor = 5.0 if norma == 0.0 else min(5.0, 0.9 * norma ** -0.2)
+        else:
+            rechazados += 1
+            factor = max(0.2, 0.9 * norma ** -0.2)
+        h = h * factor
+        if h < 1e-14 * max(1.0, abs(t)):
+            raise ValueError(f"El paso se volvió demasiado pequeño en t = {t}")
+
+    estadisticas = {"aceptados": aceptados, "rechazados": rechazados, "evaluaciones": evaluaciones}
+    return np.array(ts, dtype=float), np.array(xs, dtype=float), estadisticas
+
+
+def dormand_prince_continuo(f, t0, x0, tf, rtol=1e-6, atol=1e-9, h0=None, max_pasos=1_000_000,
+                            progreso=None):
+    """Como dormand_prince(), pero devuelve la salida densa de orden 4
+    (salida_densa.DensaDormandPrince) con las estadísticas en .estadisticas."""
+    etapas = []
+    ts, xs, estadisticas = dormand_prince(f, t0, x0, tf, rtol, atol, h0, max_pasos, progreso,
+                                          al_aceptar=etapas.append)
+    solucion = DensaDormandPrince(ts, xs, etapas)
+    solucion.estadisticas = estadisticas
+    return solucion
+
+
+# --- Métodos implícitos para ecuaciones rígidas ---
+# Cada paso resuelve y = c + gamma·h·f(t + h, y) con Newton (como pasos_newton
+# en metodonewton.py), usando el jacobiano simbólico J = df/dx:
+#   euler_implicito: c = x_n                                  gamma = 1
+#   trapecio:        c = x_n + h/2·f(t_n, x_n)                gamma = 1/2
+#   bdf2:            c = 4/3·x_n - 1/3·x_{n-1}                gamma = 2/3 (primer paso con trapecio)
+# La matriz de Newton (I - gamma·h·J) se reutiliza entre pasos mientras Newton
+# converja rápido; solo se recalcula si converge lento o no converge.
+IMPLICITOS = ("euler_implicito", "trapecio", "bdf2")
+
+
+def _norma_max(v):
+    return float(np.max(np.abs(v)))
+
+
+def integrar_implicito(f, jac, metodo, t0, x0, h, tf, tol=1e-10, max_iter=10, progreso=None):
+    """Integra con un método implícito. Devuelve (ts, xs, estadisticas).
+
+    'progreso(fraccion)' se llama cada tanto (si lanza una excepción, se corta).
+    """
+    metodo = metodo.strip().lower()
+    if metodo not in IMPLICITOS:
+        raise ValueError(f"Método implícito desconocido: '{metodo}' (use {', '.join(IMPLICITOS)})")
+    pasos = numero_pasos(t0, tf, h)
+    t0, x0 = flotantes_numpy(t0, x0)
+
+    escalar = np.ndim(x0) == 0
+    identidad = 1.0 if escalar else np.eye(len(x0))
+    est = {"evaluaciones": 0, "iteraciones_newton": 0, "jacobianos": 0}
+    matriz = {"gamma": None, "inversa": None}
+
+    def actualizar_matriz(t, y, gamma):
+        J = jac(t, y)
+        est["jacobianos"] += 1
+        M = identidad - gamma * h * J
+        matriz["inversa"] = 1.0 / M if escalar else np.linalg.inv(M)
+        matriz["gamma"] = gamma
+
+    def newton(t_sig, c, gamma, y):
+        """Resuelve y = c + gamma·h·f(t_sig, y); None si no converge rápido."""
+        anterior = None
+        for _ in range(max_iter):
+            residuo = y - c - gamma * h * f(t_sig, y)
+            est["evaluaciones"] += 1
+            est["iteraciones_newton"] += 1
+            delta = matriz["inversa"] * residuo if escalar else matriz["inversa"] @ residuo
+            y = y - delta
+            norma = _norma_max(delta)
+            if norma <= tol * (1.0 + _norma_max(y)):
+                return y
+            # Convergencia lenta: conviene recalcular el jacobiano
+            if anterior is not None and norma > 0.5 * anterior:
+                return None
+            anterior = norma
+        return None
+
+    xs = np.empty((pasos + 1,) + np.shape(x0), dtype=float)
+    xs[0] = x0
+    x = x0
+    x_anterior = None
+    for n in range(pasos):
+        t = t0 + h * n
+        t_sig = t0 + h * (n + 1)
+        if metodo == "euler_implicito":
+            gamma, c = 1.0, x
+        elif metodo == "trapecio" or x_anterior is None:
+            gamma, c = 0.5, x + 0.5 * h * f(t, x)
+            est["evaluaciones"] += 1
+        else:
+            gamma, c = 2.0 / 3.0, (4.0 * x - x_anterior) / 3.0
+
+        if matriz["gamma"] != gamma:
+            actualizar_matriz(t, x, gamma)
+        y = newton(t_sig, c, gamma, x)
+        if y is None:
+            # Reintentar una vez con el jacobiano evaluado en el punto actual
+            actualizar_matriz(t_sig, x, gamma)
+            y = newton(t_sig, c, gamma, x)
+            if y is None:
+                raise ValueError(f"Newton no convergió en t = {t_sig:.6g} (pruebe con un h menor)")
+
+        x_anterior = x
+        x = y
+        xs[n + 1] = x
+        if progreso is not None and (n + 1) % 64 == 0:
+            progreso((n + 1) / pasos)
+
+    est["pasos"] = pasos
+    return tiempos(t0, h, pasos), xs, est
+
+
+def resolver_implicito(expr, metodo, t0, x0, h, tf, estados=("x",), parametros=None, progreso=None):
+    """Como resolver(), con un método implícito y jacobiano simbólico. Devuelve (ts, xs, estadisticas)."""
+    f = compilar_rhs(expr, estados, parametros)
+    jac = compilar_jacobiano(expr, estados, ("t",), constantes=parametros)
+    if len(estados) > 1 or expr.strip().startswith("["):
+        x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+    else:
+        x0 = float(x0)
+    return integrar_implicito(f, jac, metodo, float(t0), x0, float(h), float(tf), progreso=progreso)
+
+
+def obtener_paso(metodo):
+    try:
+        return PASOS[metodo.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Método desconocido: '{metodo}' (use {', '.join(PASOS)})") from None
+
+
+def resolver(expr, metodo, t0, x0, h, tf, rtol=1e-6, atol=1e-9):
+    """Resuelve dx/dt = expr desde el texto de la expresión. Devuelve (ts, xs).
+
+    Con metodo="rk45" el paso es adaptativo: se usan rtol/atol y h (si no es
+    None) solo como paso inicial. Para ecuaciones rígidas están los métodos
+    implícitos "euler_implicito", "trapecio" y "bdf2".
+    """
+    if metodo.strip().lower() == "rk45":
+        ts, xs, _ = resolver_adaptativo(expr, t0, x0, tf, rtol, atol, h0=h)
+        return ts, xs
+    if metodo.strip().lower() in IMPLICITOS:
+        ts, xs, _ = resolver_implicito(expr, metodo, t0, x0, h, tf)
+        return ts, xs
+    paso = obtener_paso(metodo)
+    f = compilar_expresion(expr, ("t", "x"))
+    return integrar(f, paso, float(t0), float(x0), float(h), float(tf))
+
+
+def resolver_continuo(expr, metodo, t0, x0, h, tf, rtol=1e-6, atol=1e-9, estados=("x",), parametros=None):
+    """Como resolver(), pero devuelve una solución continua: sol(ts) evalúa x en
+    cualquier arreglo de tiempos entre t0 y tf (ver salida_densa.py).
+
+    Los métodos de paso fijo usan Hermite con sus propias pendientes, rk45 su
+    salida densa de orden 4 y los implícitos Hermite con una evaluación
+    vectorizada de f sobre la malla.
+    """
+    metodo = metodo.strip().lower()
+    f = compilar_rhs(expr, estados, parametros)
+    if len(estados) > 1 or expr.strip().startswith("["):
+        x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+    else:
+        x0 = float(x0)
+    if metodo == "rk45":
+        return dormand_prince_continuo(f, float(t0), x0, float(tf), float(rtol), float(atol),
+                                       None if h is None else float(h))
+    if metodo in IMPLICITOS:
+        ts, xs, estadisticas = resolver_implicito(expr, metodo, t0, x0, h, tf, estados, parametros)
+        solucion = hermite_desde_puntos(f, ts, xs)
+        solucion.estadisticas = estadisticas
+        return solucion
+    return integrar_continuo(f, obtener_paso(metodo), float(t0), x0, float(h), float(tf))
+
+
+def resolver_adaptativo(expr, t0, x0, tf, rtol=1e-6, atol=1e-9, h0=None):
+    """Como resolver(), con Dormand–Prince. Devuelve (ts, xs, estadisticas)."""
+    f = compilar_expresion(expr, ("t", "x"))
+    return dormand_prince(f, float(t0), float(x0), float(tf), float(rtol), float(atol),
+                          None if h0 is None else float(h0))
+
+
+def integrar_ensamble(expr, metodo, t0, x0s, h, tf, parametros=None, dtype=np.float64):
+    """Integra el mismo dx/dt = expr desde muchos estados iniciales a la vez.
+
+    'x0s' es un arreglo de condiciones iniciales y 'parametros' un diccionario
+    opcional {nombre: valores} con constantes que aparecen en la expresión
+    (p. ej. 'a' en "a*t - x"). Escalares y arreglos se combinan por broadcasting.
+    Cada paso evalúa f una sola vez sobre todo el lote con numpy.
+
+    Devuelve ts con forma (M,) y X con forma (M, N): una columna por miembro.
+    Con dtype=np.float32 X ocupa la mitad de memoria (ver integrar()).
+    """
+    paso = obtener_paso(metodo)
+    parametros = parametros or {}
+    nombres = tuple(parametros)
+    f_expr = compilar_expresion(expr, ("t", "x", *nombres))
+
+    x0s = np.atleast_1d(np.asarray(x0s, dtype=float))
+    valores = [np.atleast_1d(np.asarray(v, dtype=float)) for v in parametros.values()]
+    try:
+        forma = np.broadcast_shapes(x0s.shape, *(v.shape for v in valores))
+    except ValueError:
+        raise ValueError("x0 y los parámetros deben tener la misma longitud (o ser escalares)") from None
+    if len(forma) != 1:
+        raise ValueError("El ensamble debe ser unidimensional")
+
+    x0s = np.array(np.broadcast_to(x0s, forma))
+    valores = [np.broadcast_to(v, forma) for v in valores]
+
+    def f(t, x):
+        return f_expr(t, x, *valores)
+
+    return integrar(f, paso, float(t0), x0s, float(h), float(tf), dtype)
+
+
+# --- Sistemas de EDO (estado vectorial) ---
+
+def leer_nombres(texto):
+    """"x, v" -> ("x", "v")"""
+    nombres = tuple(n.strip() for n in texto.split(",") if n.strip())
+    if not nombres:
+        raise ValueError("Debe indicar al menos una variable de estado")
+    return nombres
+
+
+def leer_vector(texto):
+    """"1, 0" -> array([1., 0.]); un solo valor -> float."""
+    try:
+        valores = [float(v) for v in str(texto).replace(";", ",").split(",") if v.strip()]
+    except ValueError:
+        raise ValueError(f"Valor inicial inválido: '{texto}'") from None
+    if not valores:
+        raise ValueError("Debe indicar el valor inicial")
+    return valores[0] if len(valores) == 1 else np.array(valores)
+
+
+def leer_parametros(texto):
+    """"a=1, b=0.5" -> {"a": 1.0, "b": 0.5}"""
+    parametros = {}
+    for asignacion in texto.replace(";", ",").split(","):
+        if not asignacion.strip():
+            continue
+        nombre, signo, valor = asignacion.partition("=")
+        try:
+            if not signo:
+                raise ValueError
+            parametros[nombre.strip()] = float(valor)
+        except ValueError:
+            raise ValueError(f"Parámetro inválido: '{asignacion.strip()}' (use nombre=valor)") from None
+    return parametros
+
+
+def compilar_rhs(expr, estados=("x",), parametros=None):
+    """Compila el lado derecho para los integradores.
+
+    Con un solo estado y una expresión escalar devuelve f(t, x) escalar; con
+    varios estados (o una lista "[...]") devuelve f(t, X) vectorial que calcula
+    todas las componentes en una sola evaluación de numpy.
+    """
+    estados = tuple(estados)
+    if len(estados) == 1 and not expr.strip().startswith("["):
+        return compilar_expresion(expr, ("t", estados[0]), constantes=parametros)
+    return compilar_sistema(expr, estados, ("t",), constantes=parametros)
+
+
+def preparar(expr, estados="x", x0="0", parametros=""):
+    """Lee los campos de texto de una ventana y devuelve (f, x0, estados) listos para integrar."""
+    estados = leer_nombres(estados)
+    x0 = leer_vector(x0)
+    if np.size(x0) != len(estados):
+        raise ValueError(f"Se esperaban {len(estados)} valores iniciales ({', '.join(estados)}) "
+                         f"y se dieron {np.size(x0)}")
+    f = compilar_rhs(expr, estados, leer_parametros(parametros))
+    if len(estados) > 1 or expr.strip().startswith("["):
+        x0 = np.atleast_1d(x0)
+    return f, x0, estados
+
+
+def resolver_sistema(expr, estados, metodo, t0, x0, h, tf, parametros=None):
+    """Resuelve un sistema dX/dt = expr. Devuelve ts (M,) y xs (M, n), una columna por estado."""
+    paso = obtener_paso(metodo)
+    x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+    if len(x0) != len(estados):
+        raise ValueError(f"Se esperaban {len(estados)} valores iniciales y se dieron {len(x0)}")
+    f = compilar_sistema(expr, estados, ("t",), constantes=parametros)
+    return integrar(f, paso, float(t0), x0, float(h), float(tf))
@@ -0,0 +1,192 @@
+import ast
+import copy
+import math
+from functools import lru_cache
+
+import numpy as np
+import motor_edo
+from expresiones import CONSTANTES_PERMITIDAS, arbol_validado
+
+# Núcleos generados para Euler, Heun y RK4 con una ecuación escalar: para cada
+# par (expresión, método) se escribe el código Python de un paso con f(t, x)
+# pegada dentro de la fórmula del método (sin llamadas a f) y con las
+# constantes h/2 y h/6 calculadas una sola vez. Además del paso se genera un
+# bucle que avanza un bloque entero de pasos en una sola llamada, con el
+# tiempo t = t0 + n·h como en flujo_edo.integrar_por_bloques.
+#
+# El núcleo trabaja con flotantes de Python y las funciones de math, que con
+# un solo número son mucho más rápidas que las de numpy. Las operaciones son
+# las mismas y en el mismo orden que en motor_edo.paso_*, así que el resultado
+# solo debería diferir en el redondeo de las funciones de math frente a las de
+# numpy. Al generar un núcleo se lo compara con los pasos de referencia en dos
+# tramos cortos fijos (ver _nucleo) y, si difiere, no se usa; no es una prueba
+# de que coincidan para cualquier t0, x0 y h.
+# Donde numpy daría inf o nan, el núcleo no sigue: la división por cero, el
+# desborde de ** o el log de un negativo lanzan ArithmeticError o ValueError,
+# y una potencia de base negativa con exponente no entero (x**0.5 con x < 0)
+# da un complejo, que lanza TypeError al guardarlo en el arreglo de estados.
+# Quien lo usa rehace ese bloque con los pasos de referencia (ver ERRORES), con
+# flotantes de numpy, que dan nan como en la ventana (motor_edo.flotantes_numpy).
+# Los sistemas (varios estados) siguen con los pasos de motor_edo.
+
+ETAPAS = {"euler": 1, "heun": 2, "rk4": 4}  # Evaluaciones de f por paso
+ERRORES = (ArithmeticError, ValueError, TypeError)
+
+# Las mismas funciones que expresiones.FUNCIONES_PERMITIDAS, para un solo número
+_FUNCIONES_MATH = {
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan,
+    "arcsin": math.asin, "arccos": math.acos, "arctan": math.atan,
+    "sinh": math.sinh, "cosh": math.cosh, "tanh": math.tanh,
+    "exp": math.exp, "log": math.log, "log10": math.log10, "sqrt": math.sqrt,
+    "abs": abs,
+}
+
+# Cuerpo de un paso en función de E(t, x), el texto de f con t y x reemplazados.
+# Solo se usan nombres que empiezan con "_" (el usuario no los puede escribir).
+_CUERPOS = {
+    "euler": lambda E: [f"x = x + h * ({E('t', 'x')})"],
+    "heun": lambda E: [
+        f"_k1 = {E('t', 'x')}",
+        "_xe = x + h * _k1",
+        "_t1 = t + h",
+        f"_k2 = {E('_t1', '_xe')}",
+        "x = x + h * ((_k1 + _k2) / 2)",
+    ],
+    "rk4": lambda E: [
+        f"_k1 = {E('t', 'x')}",
+        "_tm = t + _hm",
+        "_x2 = x + _hm * _k1",
+        f"_k2 = {E('_tm', '_x2')}",
+        "_x3 = x + _hm * _k2",
+        f"_k3 = {E('_tm', '_x3')}",
+        "_x4 = x + h * _k3",
+        "_t1 = t + h",
+        f"_k4 = {E('_t1', '_x4')}",
+        "x = x + _h6 * (_k1 + 2 * _k2 + 2 * _k3 + _k4)",
+    ],
+}
+# Constantes del método que dependen solo de h (se calculan una vez por llamada)
+_CONSTANTES = {"euler": [], "heun": [], "rk4": ["_hm = 0.5 * h", "_h6 = h / 6.0"]}
+
+_PLANTILLA = """\
+def _fabrica({entorno}):
+    def paso(t, x, h):
+        {constantes}
+        {cuerpo_paso}
+        return x
+
+    def bucle(t0, h, n, x, xs, n_total):
+        {constantes}
+        pasos = min(len(xs), n_total - n)
+        for _i in range(pasos):
+            xs[_i] = x
+            t = t0 + h * (n + _i)
+            {cuerpo_bucle}
+        if pasos < len(xs):
+            xs[pasos] = x
+        return x
+
+    return paso, bucle
+"""
+
+
+class _Renombrar(ast.NodeTransformer):
+    """Cambia t y x por los nombres de la etapa y np.sin(...) por sin(...)."""
+
+    def __init__(self, nombres):
+        self.nombres = nombres
+
+    def visit_Name(self, nodo):
+        return ast.Name(self.nombres.get(nodo.id, nodo.id), ast.Load())
+
+    def visit_Attribute(self, nodo):
+        return ast.Name(nodo.attr, ast.Load())
+
+
+class Nucleo:
+    """Paso y bucle generados para una expresión y un método.
+
+    paso(t, x, h) -> x siguiente.
+    bucle(t0, h, n, x, xs, n_total) llena xs con los estados de los puntos
+    n, n+1, ... (sin pasar de n_total) y devuelve el estado con el que sigue
+    el bloque siguiente, igual que el bucle de flujo_edo.integrar_por_bloques.
+    """
+
+    def __init__(self, metodo, fuente, paso, bucle):
+        self.metodo = metodo
+        self.etapas = ETAPAS[metodo]
+        self.fuente = fuente
+        self.paso = paso
+        self.bucle = bucle
+
+
+def generar_fuente(expr, metodo, variable="x", parametros=None):
+    """Código Python del paso y del bucle para dx/dt = expr con el método dado."""
+    if metodo not in _CUERPOS:
+        raise ValueError(f"Método sin núcleo: '{metodo}' (use {', '.join(_CUERPOS)})")
+    arbol = _Renombrar({}).visit(arbol_validado(expr, ("t", variable), parametros))
+    entorno = sorted({nodo.id for nodo in ast.walk(arbol) if isinstance(nodo, ast.Name)} - {"t", variable})
+
+    def E(t, x):
+        renombrado = _Renombrar({"t": t, variable: x}).visit(copy.deepcopy(arbol))
+        return f"({ast.unparse(renombrado)})"
+
+    cuerpo = _CUERPOS[metodo](E)
+    constantes = _CONSTANTES[metodo] or ["pass"]
+    return _PLANTILLA.format(entorno=", ".join(entorno),
+                             constantes="\n        ".join(constantes),
+                             cuerpo_paso="\n        ".join(cuerpo),
+                             cuerpo_bucle="\n            ".join(cuerpo)), entorno
+
+
+def diferencia_con_referencia(nucleo, f, t0, x0, h, pasos=64):
+    """Máxima diferencia relativa entre el bucle del núcleo y el de referencia
+    (motor_edo.paso_*) en 'pasos' pasos; 0 si coinciden exactamente y None si
+    el núcleo lanzó uno de ERRORES (ahí se usarían los pasos de referencia)."""
+    paso = motor_edo.obtener_paso(nucleo.metodo)
+    referencia = np.empty(pasos + 1)
+    generado = np.empty(pasos + 1)
+    x = np.float64(x0)  # Con numpy, como en la ventana: inf o nan en lugar de excepciones
+    try:
+        for n in range(pasos + 1):
+            referencia[n] = x
+            x = paso(f, t0 + h * n, x, h)
+        nucleo.bucle(t0, h, 0, float(x0), generado, pasos)
+    except ERRORES:
+        return None
+    with np.errstate(invalid="ignore"):
+        diferencia = np.abs(generado - referencia) / np.maximum(1.0, np.abs(referencia))
+    iguales = (generado == referencia) | (np.isnan(generado) & np.isnan(referencia))
+    return float(np.max(np.where(iguales, 0.0, diferencia)))
+
+
+@lru_cache(maxsize=64)
+def _nucleo(expr, metodo, variable, parametros):
+    fuente, entorno = generar_fuente(expr, metodo, variable, dict(parametros))
+    disponibles = {**_FUNCIONES_MATH, **CONSTANTES_PERMITIDAS}
+    espacio = {"__builtins__": {"range": range, "len": len, "min": min}}
+    exec(compile(fuente, f"<núcleo {metodo}: {expr}>", "exec"), espacio)
+    nucleo = Nucleo(metodo, fuente, *espacio["_fabrica"](*(disponibles[n] for n in entorno)))
+
+    # Comprobación contra el paso de referencia en un tramo corto
+    f = motor_edo.compilar_rhs(expr, (variable,), dict(parametros))
+    with np.errstate(all="ignore"):
+        for t0, x0, h in ((0.0, 1.0, 0.01), (0.3, -0.7, 0.05)):
+            diferencia = diferencia_con_referencia(nucleo, f, t0, x0, h, pasos=8)
+            if diferencia is not None and not diferencia <= 1e-12:
+                return None
+    return nucleo
+
+
+def nucleo(expr, metodo, estados=("x",), parametros=None):
+    """Núcleo generado (en caché por expresión, método y parámetros), o None si no
+    hay núcleo para este caso: sistemas, métodos sin núcleo o expresiones inválidas."""
+    metodo = metodo.strip().lower()
+    estados = tuple(estados)
+    if metodo not in _CUERPOS or len(estados) != 1 or expr.strip().startswith("["):
+        return None
+    try:
+        return _nucleo(expr.strip(), metodo, estados[0], tuple(sorted((parametros or {}).items())))
+    except (ValueError, SyntaxError):
+        return None
@@ -0,0 +1,230 @@
+from math import factorial
+
+import numpy as np
+
+# Ecuación característica de una EDO lineal homogénea de coeficientes constantes
+#     a_n x^(n) + ... + a_1 x' + a_0 x = 0   <->   a_n m^n + ... + a_1 m + a_0 = 0
+# de cualquier grado. Todas las raíces salen de una vez como autovalores de la
+# matriz compañera (una llamada de álgebra lineal), se agrupan en raíces
+# repetidas y pares complejos conjugados y las simples se pulen con unos pasos
+# de Newton. Con eso
+# se arma la solución general y se evalúa x(t) sobre arreglos de t.
+#
+# Las raíces agrupadas se representan como una lista de (raiz, multiplicidad);
+# de cada par conjugado se guarda solo la raíz con parte imaginaria positiva.
+
+
+def coeficientes(expr, variable="x"):
+    """Coeficientes (del grado mayor al menor) de un polinomio escrito como texto."""
+    import sympy as sp
+    from expresiones import expresion_sympy
+    # Se arma desde el árbol validado (acepta lo mismo que el resto de las expresiones: e, pi, np.sin, ...)
+    f, simbolos = expresion_sympy(expr, (variable,))
+    simbolo = simbolos[variable]
+    try:
+        polinomio = sp.Poly(sp.expand(f), simbolo)
+    except sp.PolynomialError:
+        raise ValueError(f"'{expr}' no es un polinomio en {variable}")
+    coefs = [float(c) for c in polinomio.all_coeffs()]
+    if len(coefs) < 2:
+        raise ValueError("La ecuación característica debe ser al menos de grado 1.")
+    return np.array(coefs)
+
+
+def _pulir(coefs, raices, pasos):
+    """Unos pasos de Newton sobre el polinomio; se conserva el paso solo si mejora el residuo."""
+    derivada = np.polyder(coefs)
+    for _ in range(pasos):
+        valor = np.polyval(coefs, raices)
+        pendiente = np.polyval(derivada, raices)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nuevas = raices - valor / pendiente
+        mejora = np.isfinite(nuevas) & (np.abs(np.polyval(coefs, nuevas)) < np.abs(valor))
+        raices = np.where(mejora, nuevas, raices)
+    return raices
+
+
+def raices_polinomio(coefs):
+    """Todas las raíces (complejas) del polinomio, como autovalores de su matriz compañera.
+
+    Se devuelven sin pulir: las raíces múltiples se pulen mejor promediando su
+    grupo (ver agrupar_raices) que con Newton, que ahí converge lento.
+    """
+    coefs = np.trim_zeros(np.asarray(coefs, dtype=float), "f")
+    if len(coefs) < 2:
+        raise ValueError("El polinomio debe ser al menos de grado 1.")
+    grado = len(coefs) - 1
+    compania = np.zeros((grado, grado))
+    compania[0, :] = -coefs[1:] / coefs[0]
+    compania[1:, :-1] = np.eye(grado - 1)
+    return np.linalg.eigvals(compania).astype(complex)
+
+
+RUIDO = 100.0  # Margen sobre el error de redondeo esperado de los autovalores
+
+
+def _cadenas(raices, tol):
+    """Junta (en cadena) los autovalores que quedan a menos de tol·(1 + |r|)."""
+    pendientes = list(raices)
+    cadenas = []
+    while pendientes:
+        cercanas = [pendientes.pop(0)]
+        agregadas = True
+        while agregadas:
+            agregadas = [s for s in pendientes
+                         if any(abs(s - r) <= tol * (1 + abs(r)) for r in cercanas)]
+            pendientes = [s for s in pendientes if not any(s is a for a in agregadas)]
+            cercanas += agregadas
+        cadenas.append(cercanas)
+    return cadenas
+
+
+def es_raiz_multiple(coefs, grupo):
+    """True si los m autovalores del grupo pueden ser una sola raíz de multiplicidad m.
+
+    Cerca de su promedio c el polinomio es ≈ a_m (z - c)^m con a_m = p^(m)(c)/m!,
+    y el redondeo (eps relativo en los coeficientes) separa la raíz en m puntos
+    a una distancia ~(eps·Σ|a_j||c|^j / |a_m|)^(1/m). Si el grupo está más
+    disperso que eso son raíces distintas (p. ej. 1 y 1.0005, o 1 ± 0.001i).
+    """
+    m = len(grupo)
+    if m == 1:
+        return True
+    centro = np.mean(grupo)
+    local = abs(np.polyval(np.polyder(coefs, m), centro)) / factorial(m)
+    if local == 0:
+        return False
+    escala = np.polyval(np.abs(coefs), abs(centro))
+    radio = (RUIDO * np.finfo(float).eps * escala / local) ** (1 / m)
+    return np.max(np.abs(np.asarray(grupo) - centro)) <= radio
+
+
+def _separar(coefs, raices, tol):
+    """Grupos de autovalores confirmados con es_raiz_multiple; un grupo que no
+    se confirma se vuelve a separar con una tolerancia diez veces menor."""
+    grupos = []
+    for grupo in _cadenas(raices, tol):
+        if es_raiz_multiple(coefs, grupo):
+            grupos.append(grupo)
+        elif tol > 1e-12:
+            grupos += _separar(coefs, grupo, tol / 10)
+        else:
+            grupos += [[r] for r in grupo]
+    return grupos
+
+
+def agrupar_raices(coefs, raices, tol=0.1, pasos_newton=3):
+    """Agrupa raíces repetidas y pares conjugados. Devuelve [(raiz, multiplicidad), ...].
+
+    Una raíz de multiplicidad m sale de los autovalores como m puntos a una
+    distancia ~eps^(1/m) (con m grande, hasta centésimas); se juntan (en
+    cadena) los que quedan a menos de tol·(1 + |r|), y el grupo se acepta como una raíz múltiple solo si su
+    dispersión es la del redondeo (es_raiz_multiple). Entonces vale su
+    promedio, que es mucho más preciso que cada uno. Las simples se pulen
+    con Newton.
+    """
+    coefs = np.asarray(coefs, dtype=float)
+    grupos = [(np.mean(grupo), len(grupo))
+              for grupo in _separar(coefs, list(np.asarray(raices, dtype=complex)), tol)]
+
+    resultado = []
+    for r, m in grupos:
+        if m == 1:
+            r = _pulir(coefs, np.array([r]), pasos_newton)[0]
+        # Partes real o imaginaria que solo son ruido de redondeo se vuelven cero.
+        # Los grupos son cerrados por conjugación: una raíz real múltiple que salió
+        # como r ± δi queda en un grupo con promedio real.
+        real = 0.0 if abs(r.real) <= 1e-12 * (1 + abs(r)) else r.real
+        if abs(r.imag) <= 1e-12 * (1 + abs(r)):
+            resultado.append((complex(real, 0.0), m))
+        elif r.imag > 0:
+            resultado.append((complex(real, r.imag), m))  # El conjugado (imag < 0) queda implícito
+    # Reales primero (de menor a mayor), después los complejos
+    resultado.sort(key=lambda g: (g[0].imag != 0, g[0].real, g[0].imag))
+    return resultado
+
+
+def resolver_caracteristica(coefs, pasos_newton=3, tol=0.1):
+    """Raíces agrupadas de la ecuación característica con esos coeficientes."""
+    coefs = np.trim_zeros(np.asarray(coefs, dtype=float), "f")
+    return agrupar_raices(coefs, raices_polinomio(coefs), tol, pasos_newton)
+
+
+def _terminos(grupos):
+    """Funciones base (real, raiz, j): t^j·e^(αt)·cos(βt) si real, t^j·e^(αt)·sin(βt) si no."""
+    terminos = []
+    for r, m in grupos:
+        for j in range(m):
+            terminos.append((True, r, j))
+            if r.imag != 0:
+                terminos.append((False, r, j))
+    return terminos
+
+
+def _formato(v):
+    return f"{v:.6g}"
+
+
+def solucion_general(grupos, variable="t"):
+    """La solución general como texto, con constantes k1, k2, ..."""
+    partes = []
+    for i, (es_real, r, j) in enumerate(_terminos(grupos), start=1):
+        potencia = "" if j == 0 else (variable if j == 1 else f"{variable}^{j}")
+        exponencial = f"e^({_formato(r.real)}·{variable})" if r.real != 0 else ""
+        trig = "" if r.imag == 0 else f"{'cos' if es_real else 'sin'}({_formato(r.imag)}·{variable})"
+        partes.append(" · ".join(p for p in (f"k{i}", potencia, exponencial, trig) if p))
+    return "x(" + variable + ") = " + "  +  ".join(partes)
+
+
+def evaluar_solucion(grupos, constantes, t):
+    """x(t) = Σ k_i · base_i(t), evaluada sobre un arreglo t de cualquier tamaño.
+
+    Se acumula término a término, así la memoria es la de t y no (len(t), n).
+    """
+    t = np.asarray(t, dtype=float)
+    terminos = _terminos(grupos)
+    if len(constantes) != len(terminos):
+        raise ValueError(f"Se esperaban {len(terminos)} constantes y se dieron {len(constantes)}")
+    x = np.zeros_like(t)
+    for k, (es_real, r, j) in zip(constantes, terminos):
+        if k == 0:
+            continue
+        base = np.exp(r.real * t)
+        if j:
+            base *= t ** j
+        if r.imag != 0:
+            base *= np.cos(r.imag * t) if es_real else np.sin(r.imag * t)
+        x += k * base
+    return x
+
+
+def constantes_iniciales(grupos, condiciones):
+    """Constantes k para x(0), x'(0), ..., x^(n-1)(0) dados.
+
+    La derivada p-ésima de t^j·e^(rt) en t = 0 es p!/(p-j)! · r^(p-j) (p >= j);
+    para los pares complejos se toman su parte real (cos) e imaginaria (sin).
+    """
+    terminos = _terminos(grupos)
+    n = len(terminos)
+    if len(condiciones) != n:
+        raise ValueError(f"Se necesitan {n} condiciones iniciales (x(0) hasta la derivada {n - 1})")
+    matriz = np.zeros((n, n))
+    for c, (es_real, r, j) in enumerate(terminos):
+        for p in range(j, n):
+            valor = factorial(p) / factorial(p - j) * r ** (p - j)
+            matriz[p, c] = valor.real if es_real else valor.imag
+    return np.linalg.solve(matriz, np.asarray(condiciones, dtype=float))
+
+
+def ecuacion_diferencial(coefs):
+    """La EDO a_n x^(n) + ... + a_0 x = 0 como texto."""
+    grado = len(coefs) - 1
+    texto = ""
+    for i, a in enumerate(coefs):
+        orden = grado - i
+        if a == 0:
+            continue
+        derivada = "x" + ("'" * orden if orden <= 3 else f"^({orden})")
+        signo = ("-" if a < 0 else "") if not texto else (" - " if a < 0 else " + ")
+        texto += f"{signo}{_formato(abs(a))}{derivada}"
+    return texto + " = 0"
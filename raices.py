@@ -0,0 +1,108 @@
+import numpy as np
+
+# Búsqueda de todas las raíces reales de f en un intervalo [a, b]. En lugar de
+# adivinar semillas una por una, se siembra Newton en una malla densa y se
+# iteran todas las semillas a la vez como arreglos de numpy; las que ya
+# convergieron o se escaparon quedan fuera con una máscara. Al final se
+# agrupan las raíces repetidas y se estima la multiplicidad de cada una.
+#
+# 'fdf(x)' devuelve (f(x), f'(x)) para un arreglo x.
+
+
+def _evaluar(fdf, x):
+    fx, dfx = fdf(x)
+    return np.broadcast_to(np.asarray(fx, dtype=float), x.shape), \
+        np.broadcast_to(np.asarray(dfx, dtype=float), x.shape)
+
+
+def newton_vectorizado(fdf, semillas, tol=1e-12, max_iter=100, limite=None):
+    """Itera Newton desde todas las semillas a la vez.
+
+    Devuelve (x, convergio, iteraciones): la última aproximación de cada semilla,
+    una máscara con las que convergieron (paso relativo < tol) y la cantidad de
+    pasadas. Una semilla se descarta si la derivada se anula, si aparece un valor
+    no finito o si sale de 'limite' = (a, b).
+    """
+    x = np.array(semillas, dtype=float)
+    activas = np.ones(len(x), dtype=bool)
+    convergio = np.zeros(len(x), dtype=bool)
+    iteraciones = 0
+    for iteraciones in range(1, max_iter + 1):
+        indices = np.flatnonzero(activas)
+        if len(indices) == 0:
+            break
+        xa = x[indices]
+        fx, dfx = _evaluar(fdf, xa)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            paso = fx / dfx
+        x_nuevo = xa - paso
+        validas = np.isfinite(x_nuevo) & (dfx != 0)
+        if limite is not None:
+            validas &= (x_nuevo >= limite[0]) & (x_nuevo <= limite[1])
+        listas = validas & ((np.abs(paso) <= tol * (1 + np.abs(x_nuevo))) | (fx == 0))
+        x[indices[validas]] = x_nuevo[validas]
+        convergio[indices[listas]] = True
+        activas[indices[~validas | listas]] = False
+    return x, convergio, iteraciones
+
+
+def _multiplicidad(fdf, r, distancia=np.inf):
+    """Multiplicidad aproximada: cerca de una raíz de orden m, f/f' ≈ (x - r)/m.
+
+    'distancia' es la separación a la raíz hallada más cercana: la prueba se
+    hace bastante más cerca de r que eso, porque junto a otra raíz f/f' ya no
+    se parece a (x - r)/m (dos raíces simples próximas parecerían dobles).
+    """
+    delta = min(1e-3 * (1 + abs(r)), 0.1 * distancia)
+    x = np.array([r - delta, r + delta])
+    fx, dfx = _evaluar(fdf, x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimaciones = np.abs(delta * dfx / fx)
+    estimaciones = estimaciones[np.isfinite(estimaciones)]
+    if len(estimaciones) == 0:
+        return 1
+    return max(1, int(round(np.mean(estimaciones))))
+
+
+def todas_las_raices(fdf, a, b, n_semillas=2000, tol=1e-12, max_iter=100, tol_raiz=1e-6):
+    """Devuelve (raices, multiplicidades) con todas las raíces reales distintas en [a, b].
+
+    Dos raíces a menos de tol_raiz·(1 + |r|) se consideran la misma. Las
+    raíces múltiples (donde Newton converge lento) se pulen con Newton
+    modificado x - m·f/f' una vez estimada su multiplicidad m.
+    """
+    a, b = float(a), float(b)
+    if b <= a:
+        raise ValueError("El intervalo debe cumplir a < b.")
+    margen = 1e-9 * (b - a)
+    semillas = np.linspace(a, b, int(n_semillas))
+    x, convergio, _ = newton_vectorizado(fdf, semillas, tol, max_iter, (a - margen, b + margen))
+    candidatas = np.sort(x[convergio])
+    if len(candidatas) == 0:
+        return np.empty(0), np.empty(0, dtype=int)
+
+    # Descartar falsas convergencias (pasos chicos lejos de una raíz)
+    fx, _ = _evaluar(fdf, candidatas)
+    f_malla, _ = _evaluar(fdf, semillas)
+    escala_f = np.nanmax(np.abs(f_malla[np.isfinite(f_malla)]), initial=1.0)
+    candidatas = candidatas[np.abs(fx) <= 1e-8 * max(1.0, escala_f)]
+    if len(candidatas) == 0:
+        return np.empty(0), np.empty(0, dtype=int)
+
+    # Agrupar las raíces repetidas: un corte donde el salto supera la tolerancia
+    cortes = np.flatnonzero(np.diff(candidatas) > tol_raiz * (1 + np.abs(candidatas[1:]))) + 1
+    raices = np.array([np.median(grupo) for grupo in np.split(candidatas, cortes)])
+
+    separacion = np.diff(raices)
+    distancias = np.minimum(np.append(separacion, np.inf), np.insert(separacion, 0, np.inf))
+    multiplicidades = np.array([_multiplicidad(fdf, r, d) for r, d in zip(raices, distancias)], dtype=int)
+    for i in np.flatnonzero(multiplicidades > 1):
+        # Newton modificado: converge rápido aun con raíces múltiples
+        r = raices[i]
+        for _ in range(5):
+            fx, dfx = _evaluar(fdf, np.array([r]))
+            if dfx[0] == 0 or fx[0] == 0:
+                break
+            r = r - multiplicidades[i] * fx[0] / dfx[0]
+        raices[i] = r
+    return raices, multiplicidades
@@ -0,0 +1,116 @@
+import numpy as np
+
+# Soluciones continuas ("salida densa") de los integradores: en lugar de tener
+# x solo en los puntos de la malla, se puede evaluar en cualquier arreglo de
+# tiempos sin volver a integrar ni evaluar f.
+#
+#   Hermite           cúbica por tramos con x y la pendiente f(t, x) en cada
+#                     punto; sirve para cualquier método (Euler, Heun, RK4 y
+#                     los implícitos). Error O(h^4) dentro de cada tramo.
+#   DensaDormandPrince  polinomio de grado 4 por paso con las 7 etapas de
+#                     Dormand–Prince (la extensión continua de Hairer y Wanner).
+#
+# Ambas se llaman como una función: sol(t) con t escalar o arreglo (M,)
+# devuelve x con la misma forma que los estados de la malla: (M,) para una
+# ecuación escalar y (M, n) para un sistema de n estados.
+
+# Coeficientes de la salida densa de Dormand–Prince: fila i = etapa k_i,
+# columna j = coeficiente de sigma^(j+1), con sigma = (t - t_n) / h.
+_DP_DENSA = np.array([
+    [1.0, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0.0, 0.0, 0.0, 0.0],
+    [0.0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0.0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0.0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0.0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0.0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+
+class _SolucionContinua:
+    """Parte común: la malla (ts, xs), la búsqueda del tramo y el muestreo."""
+
+    def __init__(self, ts, xs):
+        self.ts = np.asarray(ts, dtype=float)
+        self.xs = np.asarray(xs, dtype=float)
+        if len(self.ts) < 2:
+            raise ValueError("Se necesitan al menos dos puntos para interpolar")
+        self.estadisticas = {}
+
+    @property
+    def t0(self):
+        return self.ts[0]
+
+    @property
+    def tf(self):
+        return self.ts[-1]
+
+    def _tramos(self, t):
+        """Índice del tramo de cada tiempo, el ancho h del tramo y sigma = (t - t_i)/h."""
+        margen = 1e-9 * max(1.0, abs(self.tf))
+        if np.any(t < self.t0 - margen) or np.any(t > self.tf + margen):
+            raise ValueError(f"Solo se puede evaluar entre t = {self.t0:g} y t = {self.tf:g}")
+        i = np.clip(np.searchsorted(self.ts, t, side="right") - 1, 0, len(self.ts) - 2)
+        h = self.ts[i + 1] - self.ts[i]
+        return i, h, (t - self.ts[i]) / h
+
+    def _columna(self, v):
+        """(M,) -> (M, 1, ...) para combinarlo con estados de forma (M, n)."""
+        return v.reshape(v.shape + (1,) * (self.xs.ndim - 1))
+
+    def __call__(self, t):
+        t_arr = np.asarray(t, dtype=float)
+        x = self._evaluar(t_arr.reshape(-1))
+        return x.reshape(t_arr.shape + self.xs.shape[1:])
+
+    def muestrear(self, n):
+        """n tiempos equiespaciados de t0 a tf y la solución en ellos (para graficar)."""
+        ts = np.linspace(self.t0, self.tf, n)
+        return ts, self(ts)
+
+
+class Hermite(_SolucionContinua):
+    """Interpolación cúbica de Hermite con los valores xs y las pendientes dxs de la malla."""
+
+    def __init__(self, ts, xs, dxs):
+        super().__init__(ts, xs)
+        self.dxs = np.broadcast_to(np.asarray(dxs, dtype=float), self.xs.shape)
+
+    def _evaluar(self, t):
+        i, h, s = self._tramos(t)
+        s2 = s * s
+        s3 = s2 * s
+        col = self._columna
+        return (col(2 * s3 - 3 * s2 + 1) * self.xs[i]
+                + col((s3 - 2 * s2 + s) * h) * self.dxs[i]
+                + col(-2 * s3 + 3 * s2) * self.xs[i + 1]
+                + col((s3 - s2) * h) * self.dxs[i + 1])
+
+
+def hermite_desde_puntos(f, ts, xs):
+    """Hermite para una malla ya calculada (p. ej. de un método implícito).
+
+    Las pendientes se obtienen con una sola evaluación vectorizada de f sobre
+    todos los puntos (f(t, X) con X de forma (n, M) en los sistemas).
+    """
+    ts = np.asarray(ts, dtype=float)
+    xs = np.asarray(xs, dtype=float)
+    dxs = f(ts, xs) if xs.ndim == 1 else np.asarray(f(ts, xs.T)).T
+    return Hermite(ts, xs, dxs)
+
+
+class DensaDormandPrince(_SolucionContinua):
+    """Salida densa de orden 4 de Dormand–Prince, sin evaluaciones extra de f.
+
+    'etapas' tiene, por cada paso aceptado, las 7 pendientes k_i del paso (forma
+    (N, 7) o (N, 7, n)). Con ellas x(t_n + sigma·h) = x_n + h·Σ_j Q_j·sigma^(j+1).
+    """
+
+    def __init__(self, ts, xs, etapas):
+        super().__init__(ts, xs)
+        self.coefs = np.einsum("ij,ni...->nj...", _DP_DENSA, np.asarray(etapas, dtype=float))
+
+    def _evaluar(self, t):
+        i, h, s = self._tramos(t)
+        potencias = s[:, None] ** np.arange(1, 5)
+        return self.xs[i] + self._columna(h) * np.einsum("mj,mj...->m...", potencias, self.coefs[i])
@@ -0,0 +1,124 @@
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+
+# Tabla de iteraciones "virtual": en lugar de insertar una fila del Treeview por
+# cada paso, guarda referencias a los arreglos del resultado y solo rellena las
+# filas visibles. Formatear y desplazarse cuesta lo mismo con 10 o 10^7 pasos.
+# La usan EULER.py, eulermejorado.py y RK4.py.
+
+
+class TablaVirtual:
+    def __init__(self, master, columnas, alto=20):
+        """columnas: lista de (id, encabezado, ancho, formato), p. ej. ("t", "t (tiempo)", 80, "{:.4f}")."""
+        self.columnas_base = list(columnas)
+        self.tree = ttk.Treeview(master, show="headings", height=alto, selectmode="none")
+        self.configurar_columnas(columnas)
+
+        # La barra de desplazamiento se mueve sobre los datos, no sobre las filas del Treeview
+        self.scrollbar = ttk.Scrollbar(master, orient="vertical", command=self._desplazar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._datos = []
+        self._total = 0
+        self._inicio = 0
+        self._filas = []  # Items del Treeview que se reutilizan al desplazarse
+        self._alto_fila = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+        self.tree.bind("<Configure>", self._al_redimensionar)
+        self.tree.bind("<MouseWheel>", lambda e: self._mover(-3 if e.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda e: self._mover(-3))  # Rueda en Linux
+        self.tree.bind("<Button-5>", lambda e: self._mover(3))
+        self.tree.bind("<Prior>", lambda e: self._mover(-len(self._filas)))
+        self.tree.bind("<Next>", lambda e: self._mover(len(self._filas)))
+        self.tree.bind("<Home>", lambda e: self._mover(-self._total))
+        self.tree.bind("<End>", lambda e: self._mover(self._total))
+        self._ajustar_filas(alto)
+
+    def configurar_columnas(self, columnas):
+        self.columnas = list(columnas)
+        self.formatos = [c[3] for c in columnas]
+        self.tree.configure(columns=[c[0] for c in columnas])
+        for id_col, encabezado, ancho, _ in columnas:
+            self.tree.heading(id_col, text=encabezado)
+            self.tree.column(id_col, width=ancho, anchor="center")
+
+    def mostrar_estados(self, ts, xs, estados, mantener=False):
+        """Muestra una trayectoria: con estado escalar usa las columnas originales,
+        con estado vectorial (xs de forma (M, n)) una columna por variable de estado."""
+        if np.ndim(xs) == 1:
+            if self.columnas != self.columnas_base:
+                self.configurar_columnas(self.columnas_base)
+            self.mostrar(None, ts, xs, mantener=mantener)
+            return
+        n, t = self.columnas_base[:2]
+        ancho = max(60, self.columnas_base[2][2] * 2 // len(estados))
+        columnas = [n, t] + [(f"estado_{i}", nombre, ancho, "{:.6f}") for i, nombre in enumerate(estados)]
+        if self.columnas != columnas:
+            self.configurar_columnas(columnas)
+        self.mostrar(None, ts, *(xs[:, i] for i in range(len(estados))), mantener=mantener)
+
+    def mostrar(self, *columnas, mantener=False):
+        """Muestra los arreglos dados (uno por columna). None en una columna = número de fila.
+
+        Con mantener=True se conserva la posición de desplazamiento (útil cuando
+        los datos van creciendo mientras se calculan).
+        """
+        self._datos = columnas
+        self._total = max((len(c) for c in columnas if c is not None), default=0)
+        if not mantener:
+            self._inicio = 0
+        self._renderizar()
+
+    def limpiar(self):
+        """Vacía la tabla sin borrar fila por fila."""
+        self.mostrar()
+
+    def _valor(self, columna, k):
+        datos = self._datos[columna]
+        return k if datos is None else datos[k]
+
+    def _renderizar(self):
+        for i, item in enumerate(self._filas):
+            k = self._inicio + i
+            if k < self._total:
+                valores = [fmt.format(self._valor(c, k)) for c, fmt in enumerate(self.formatos)]
+            else:
+                valores = ()
+            self.tree.item(item, values=valores)
+
+        if self._total:
+            primero = self._inicio / self._total
+            ultimo = min(1.0, (self._inicio + len(self._filas)) / self._total)
+        else:
+            primero, ultimo = 0.0, 1.0
+        self.scrollbar.set(primero, ultimo)
+
+    def _ajustar_filas(self, cantidad):
+        cantidad = max(1, cantidad)
+        while len(self._filas) < cantidad:
+            self._filas.append(self.tree.insert("", "end", values=()))
+        while len(self._filas) > cantidad:
+            self.tree.delete(self._filas.pop())
+        self._mover(0)
+
+    def _al_redimensionar(self, evento):
+        # Encabezado ~1 fila; se agrega una fila extra para cubrir el borde inferior
+        self._ajustar_filas(evento.height // self._alto_fila)
+
+    def _mover(self, delta):
+        maximo = max(0, self._total - len(self._filas) + 1)
+        self._inicio = min(max(0, self._inicio + delta), maximo)
+        self._renderizar()
+        return "break"
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Callback de la barra: ("moveto", fracción) o ("scroll", n, "units"/"pages")."""
+        if accion == tk.MOVETO:
+            self._mover(int(float(cantidad) * self._total) - self._inicio)
+        elif accion == tk.SCROLL:
+            pasos = int(cantidad)
+            if unidad == tk.PAGES:
+                pasos *= len(self._filas)
+            self._mover(pasos)
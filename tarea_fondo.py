@@ -0,0 +1,129 @@
+import queue
+import threading
+from tkinter import ttk
+
+# Cálculos largos fuera del hilo de Tk. El trabajo corre en un hilo aparte y
+# entrega sus resultados por bloques a través de una cola; la ventana los
+# recoge con root.after(), así sigue respondiendo, muestra el avance y se
+# puede cancelar. Solo el hilo principal toca widgets.
+
+
+class Cancelado(Exception):
+    """Se lanza dentro del trabajo cuando el usuario pulsa Cancelar."""
+
+
+class TareaEnFondo:
+    def __init__(self, widget, trabajo, al_recibir=None, al_terminar=None, al_fallar=None,
+                 al_progreso=None, intervalo_ms=15):
+        """'trabajo(tarea)' es un generador que corre en otro hilo. Cada valor que produce
+        se entrega a al_recibir(valor) en el hilo de Tk. Al final se llama a
+        al_terminar(cancelada) o, si hubo una excepción, a al_fallar(error)."""
+        self.widget = widget
+        self.trabajo = trabajo
+        self.al_recibir = al_recibir
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.al_progreso = al_progreso
+        self.intervalo_ms = intervalo_ms
+        self.fraccion = 0.0
+        self.activa = False
+        self._cola = queue.Queue()
+        self._cancelar = threading.Event()
+
+    # --- Lado del hilo de trabajo ---
+
+    def avanzar(self, fraccion):
+        """Informa el avance (0 a 1) y corta el trabajo si se pidió cancelar."""
+        self.fraccion = fraccion
+        if self._cancelar.is_set():
+            raise Cancelado()
+
+    def _ejecutar(self):
+        try:
+            for valor in self.trabajo(self):
+                self._cola.put(("dato", valor))
+                if self._cancelar.is_set():
+                    raise Cancelado()
+            self._cola.put(("fin", False))
+        except Cancelado:
+            self._cola.put(("fin", True))
+        except Exception as e:
+            self._cola.put(("error", e))
+
+    # --- Lado del hilo de Tk ---
+
+    def iniciar(self):
+        self.activa = True
+        threading.Thread(target=self._ejecutar, daemon=True).start()
+        self.widget.after(1, self._revisar)
+        return self
+
+    def cancelar(self):
+        self._cancelar.set()
+
+    def _revisar(self):
+        if self.al_progreso is not None:
+            self.al_progreso(self.fraccion)
+        try:
+            while True:
+                tipo, valor = self._cola.get_nowait()
+                if tipo == "dato":
+                    if self.al_recibir is not None:
+                        self.al_recibir(valor)
+                    continue
+                self.activa = False
+                if tipo == "fin":
+                    if self.al_progreso is not None and not valor:
+                        self.al_progreso(1.0)
+                    if self.al_terminar is not None:
+                        self.al_terminar(valor)
+                elif self.al_fallar is not None:
+                    self.al_fallar(valor)
+                return
+        except queue.Empty:
+            pass
+        self.widget.after(self.intervalo_ms, self._revisar)
+
+
+class PanelProgreso:
+    """Barra de progreso + botón Cancelar para una TareaEnFondo."""
+
+    def __init__(self, master, largo=120):
+        self.tarea = None
+        self.barra = ttk.Progressbar(master, orient="horizontal", length=largo, mode="determinate", maximum=1.0)
+        self.boton = ttk.Button(master, text="Cancelar", command=self.cancelar, state="disabled")
+
+    def vincular(self, tarea):
+        """Conecta la tarea con la barra y habilita Cancelar mientras corre."""
+        self.tarea = tarea
+        self.barra["value"] = 0.0
+        self.boton.configure(state="normal")
+        progreso, terminar, fallar = tarea.al_progreso, tarea.al_terminar, tarea.al_fallar
+
+        def al_progreso(fraccion):
+            self.barra["value"] = fraccion
+            if progreso is not None:
+                progreso(fraccion)
+
+        def al_terminar(cancelada):
+            self.terminar()
+            if terminar is not None:
+                terminar(cancelada)
+
+        def al_fallar(error):
+            self.terminar()
+            if fallar is not None:
+                fallar(error)
+
+        tarea.al_progreso, tarea.al_terminar, tarea.al_fallar = al_progreso, al_terminar, al_fallar
+        return tarea
+
+    def terminar(self):
+        self.boton.configure(state="disabled")
+
+    def cancelar(self):
+        if self.tarea is not None and self.tarea.activa:
+            self.tarea.cancelar()
+
+    def ocupado(self):
+        return self.tarea is not None and self.tarea.activa
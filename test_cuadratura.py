@@ -0,0 +1,35 @@
+import threading
+
+import numpy as np
+
+import cuadratura
+
+
+def test_integraciones_con_hilos_simultaneas():
+    # Como dos ventanas del lanzador a la vez: cada una debe usar su propia f
+    casos = {"x**2": 9.0, "cos(x)": np.sin(3.0), "exp(-x)": 1 - np.exp(-3.0)}
+    resultados = {}
+    barrera = threading.Barrier(len(casos))
+
+    def calcular(expr):
+        barrera.wait()
+        for trabajadores in (1, 4):
+            valor, _ = cuadratura.integrar_paralelo(expr, 0.0, 3.0, "gauss_kronrod", 1e-10, partes=8,
+                                                     trabajadores=trabajadores)
+            resultados[expr, trabajadores] = valor
+
+    hilos = [threading.Thread(target=calcular, args=(expr,)) for expr in casos]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    for (expr, _), valor in resultados.items():
+        assert np.isclose(valor, casos[expr], rtol=1e-9, atol=1e-12)
+    assert len(resultados) == 2 * len(casos)
+
+
+def test_integracion_con_procesos():
+    valor, est = cuadratura.integrar_paralelo("x**2", 0.0, 3.0, "trapecio", n=3000, partes=4,
+                                              trabajadores=2, usar_procesos=True)
+    assert np.isclose(valor, 9.0, rtol=1e-6)
+    assert est["partes"] == 4
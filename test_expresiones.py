@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from expresiones import compilar_expresion, normalizar_expresion
+
+
+def test_circunflejo_es_potencia():
+    # Como sympify en las herramientas originales: x^2 es x**2, con la precedencia de **
+    f = compilar_expresion("2*x^2 + 1", ("x",))
+    assert np.allclose(f(np.array([0.0, 3.0])), [1.0, 19.0])
+    assert compilar_expresion("-2^2", ("x",))(0.0) == -4.0
+    assert normalizar_expresion("x^2") == normalizar_expresion("x**2")
+
+
+def test_rechaza_lo_que_no_es_aritmetica():
+    with pytest.raises(ValueError):
+        compilar_expresion("__import__('os')", ("x",))
+    with pytest.raises(ValueError):
+        compilar_expresion("x & 1", ("x",))
@@ -0,0 +1,48 @@
+import numpy as np
+
+from graficos import decimar_min_max
+
+
+def test_decimar_min_max_con_cola_nan():
+    # Como Euler explícito con un paso demasiado grande: diverge y deja nan al final
+    ts = np.linspace(0, 100, 10001)
+    xs = np.cos(ts)
+    xs[322:] = np.nan
+    xs[300:322] = np.inf
+
+    ts_r, xs_r = decimar_min_max(ts, xs, 100)
+    assert len(ts_r) < len(ts)
+    assert np.all(np.diff(ts_r) > 0)
+    # Los extremos de la parte finita se conservan
+    finitos = xs_r[np.isfinite(xs_r)]
+    assert finitos.min() == np.nanmin(xs[:300])
+    assert finitos.max() == np.nanmax(xs[:300])
+
+
+def test_decimar_min_max_todo_nan():
+    ts = np.linspace(0, 1, 5000)
+    ts_r, xs_r = decimar_min_max(ts, np.full(5000, np.nan), 50)
+    assert len(ts_r) < len(ts)
+    assert np.all(np.isnan(xs_r))
+
+
+def test_grafica_en_vivo_terminar_deja_las_lineas_visibles():
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from graficos import GraficaEnVivo
+
+    figura = Figure()
+    canvas = FigureCanvasAgg(figura)
+    ax = figura.add_subplot()
+    vivo = GraficaEnVivo(ax, canvas, 0.0, 1.0, ["r"])
+    ts = np.linspace(0, 0.5, 100)
+    vivo.agregar(ts, np.sin(ts))
+    linea = ax.lines[0]
+    assert linea.get_animated() and len(linea.get_xdata()) > 0
+
+    vivo.terminar()
+    canvas.draw()
+    assert not linea.get_animated()
+    assert linea in ax.lines
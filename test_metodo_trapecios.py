@@ -0,0 +1,21 @@
+import numpy as np
+
+from Metodo_Trapecios import MAX_PUNTOS_GRAFICA, integral_trapecios
+
+
+def _f_contada():
+    puntos = [0]
+
+    def f(x):
+        puntos[0] += np.size(x)
+        return x ** 2
+    return f, puntos
+
+
+def test_evaluaciones_incluyen_los_puntos_de_la_grafica():
+    for n, hilos in ((1000, 1), (3 * MAX_PUNTOS_GRAFICA, 1), (3 * MAX_PUNTOS_GRAFICA, 2)):
+        f, puntos = _f_contada()
+        area, x_vals, y_vals, evaluaciones = integral_trapecios(f, 0.0, 3.0, n, hilos=hilos)
+        assert np.isclose(area, 9.0, rtol=1e-5)
+        assert len(x_vals) == len(y_vals) == min(n, MAX_PUNTOS_GRAFICA) + 1
+        assert evaluaciones == puntos[0]
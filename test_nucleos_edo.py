@@ -0,0 +1,35 @@
+import numpy as np
+
+import flujo_edo
+import motor_edo
+import nucleos_edo
+
+
+def _trayectoria(f, nucleo):
+    ts, xs, llenar = flujo_edo.trayectoria_por_bloques(f, motor_edo.paso_rk4, 0.0, 1.0, 0.1, 2.0, nucleo=nucleo)
+    for _ in llenar:
+        pass
+    return xs
+
+
+def test_potencia_de_base_negativa_da_nan():
+    # x**0.5 - 2 lleva x por debajo de cero: con numpy da nan, no un complejo
+    expr = "x**0.5 - 2"
+    f = motor_edo.compilar_rhs(expr)
+    with np.errstate(invalid="ignore"):
+        ts, xs = motor_edo.integrar(f, motor_edo.paso_rk4, 0.0, 1.0, 0.1, 2.0)
+        _, _, x_final = motor_edo.integrar_final(f, motor_edo.paso_rk4, 0.0, 1.0, 0.1, 2.0)
+        con_nucleo = _trayectoria(f, nucleos_edo.nucleo(expr, "rk4"))
+        sin_nucleo = _trayectoria(f, None)
+    assert np.isnan(xs[-1]) and np.isnan(x_final)
+    assert np.all(np.isfinite(xs[:5]))
+    # El núcleo da un complejo, lanza TypeError al guardarlo y el bloque se rehace con los pasos de referencia
+    np.testing.assert_array_equal(con_nucleo, xs)
+    np.testing.assert_array_equal(sin_nucleo, xs)
+
+
+def test_nucleo_coincide_con_los_pasos_de_referencia():
+    f = motor_edo.compilar_rhs("-x + sin(t)")
+    nucleo = nucleos_edo.nucleo("-x + sin(t)", "rk4")
+    assert nucleo is not None
+    assert nucleos_edo.diferencia_con_referencia(nucleo, f, 0.5, 2.0, 0.01, pasos=500) <= 1e-12
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import polinomios
+
+
+def test_coeficientes_con_constante_e():
+    assert np.allclose(polinomios.coeficientes("e*x**2 - 1"), [np.e, 0.0, -1.0])
+
+
+def test_coeficientes_con_prefijo_np():
+    assert np.allclose(polinomios.coeficientes("np.sqrt(4)*x**2 + np.exp(0)*x - 2"), [2.0, 1.0, -2.0])
+
+
+def test_coeficientes_rechaza_lo_que_no_es_polinomio():
+    with pytest.raises(ValueError):
+        polinomios.coeficientes("sin(x)")
+    with pytest.raises(ValueError):
+        polinomios.coeficientes("y**2 - 1")
+
+
+def test_raices_simples_cercanas_no_se_juntan():
+    grupos = polinomios.resolver_caracteristica(polinomios.coeficientes("(x - 1)*(x - 1.0005)"))
+    assert [m for _, m in grupos] == [1, 1]
+    assert np.allclose([r.real for r, _ in grupos], [1.0, 1.0005], rtol=1e-10)
+
+
+def test_par_conjugado_cercano_no_es_raiz_doble():
+    # Raíces 1 ± 0.001i: la solución oscila, no es t·e^t
+    grupos = polinomios.resolver_caracteristica(polinomios.coeficientes("x**2 - 2*x + 1.000001"))
+    assert len(grupos) == 1
+    r, m = grupos[0]
+    assert m == 1
+    assert np.isclose(r, 1 + 0.001j, rtol=1e-9)
+
+
+def test_raices_multiples():
+    grupos = polinomios.resolver_caracteristica(polinomios.coeficientes("(x - 1)**3 * (x - 1.01)**2 * (x**2 + 1)**2"))
+    assert [m for _, m in grupos] == [3, 2, 2]
+    assert np.allclose([r for r, _ in grupos], [1.0, 1.01, 1j], atol=1e-6)
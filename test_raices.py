@@ -0,0 +1,16 @@
+import numpy as np
+
+from expresiones import compilar_con_derivada
+from raices import todas_las_raices
+
+
+def test_raices_simples_muy_cercanas():
+    raices, multiplicidades = todas_las_raices(compilar_con_derivada("x**2 - 1e-8"), -1, 1)
+    assert np.allclose(raices, [-1e-4, 1e-4], rtol=1e-8, atol=0)
+    assert list(multiplicidades) == [1, 1]
+
+
+def test_raiz_doble_y_simple():
+    raices, multiplicidades = todas_las_raices(compilar_con_derivada("(x - 1)**2 * (x + 2)"), -3, 3)
+    assert np.allclose(raices, [-2.0, 1.0], atol=1e-6)
+    assert list(multiplicidades) == [1, 2]